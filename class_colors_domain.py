@@ -0,0 +1,132 @@
+############################################
+# My version of the famous Mastermind game #
+# class_colors_domain.py                   #
+# Colors domain of every peg position      #
+#           Piotr Loos (c) 2019-2021, 2023 #
+############################################
+
+from operator import getitem
+
+
+class ColorsDomain:
+    """ Keeps 3-state matrix (can't be, can be, must be) of every color for every peg position of the solution,
+    updated by constraint propagation after every guess - patterns with a color which can't be at its position
+    are rejected by a cheap lookup before calculating responses """
+
+    CANT_BE = 0  # (int) the color can't be at this position
+    CAN_BE = 1  # (int) the color can be at this position
+    MUST_BE = 2  # (int) the color must be at this position (no other color can be there)
+
+    def __init__(
+            self,
+            peg_colors,
+            pegs_in_pattern,
+            allow_duplicates=True,
+    ):
+        """ Initializes `ColorsDomain` class object (every color can be at every position) """
+
+        self.peg_colors = peg_colors
+        self.pegs_in_pattern = pegs_in_pattern
+        self.allow_duplicates = allow_duplicates  # (bool) flag whether colors can be duplicated in pattern
+
+        # (list) states of every peg color for every peg position - blank peg (0) can't be in the solution
+        # (bytearrays are changed in place, so references taken by Solvers stay valid after next guesses)
+        self.states_matrix = [
+            bytearray([self.CANT_BE] + [self.CAN_BE] * peg_colors)
+            for _ in range(pegs_in_pattern)
+        ]
+
+    def reset(self, guesses_list=()):
+        """ Makes every color possible at every position again (in place) and adds given guesses - e.g. the guesses
+        remaining after undoing turns """
+
+        for states in self.states_matrix:
+            states[1:] = bytes([self.CAN_BE] * self.peg_colors)
+
+        for guess in guesses_list:
+            self.add_guess(guess.pattern, guess.response.black_pegs, guess.response.black_white_pegs)
+
+    def add_guess(self, guess_pattern, black_pegs, black_white_pegs):
+        """ Removes colors excluded by the guess pattern (tuple of peg colors) and its response, then propagates
+        the changes """
+
+        colors_pegs = [peg for peg in guess_pattern if peg]  # blank pegs are not colors
+
+        if not black_white_pegs:
+            # none of guessed colors is in the solution
+            for peg in colors_pegs:
+                self._remove_everywhere(peg)
+
+        if not black_pegs:
+            # no guessed color is at its position
+            for peg_index, peg in enumerate(guess_pattern):
+                if peg:
+                    self._remove(peg_index, peg)
+
+        if black_pegs == len(colors_pegs):
+            # every guessed color is at its position
+            for peg_index, peg in enumerate(guess_pattern):
+                if peg:
+                    self._set_must_be(peg_index, peg)
+
+        if black_white_pegs == self.pegs_in_pattern:
+            # the solution is made only of guessed colors
+            for peg in set(range(1, self.peg_colors + 1)) - set(colors_pegs):
+                self._remove_everywhere(peg)
+
+        self._propagate()
+
+    def check_pattern(self, pattern):
+        """ Checks if every color of the pattern (tuple of peg colors) can be at its position """
+
+        return all(map(getitem, self.states_matrix, pattern))  # lookups without Python-level loop
+
+    def _remove(self, peg_index, peg):
+        """ Marks that the color can't be at given position """
+
+        self.states_matrix[peg_index][peg] = self.CANT_BE
+
+    def _remove_everywhere(self, peg):
+        """ Marks that the color can't be at any position """
+
+        for states in self.states_matrix:
+            states[peg] = self.CANT_BE
+
+    def _set_must_be(self, peg_index, peg):
+        """ Marks that the color must be at given position (so no other color can be there) """
+
+        states = self.states_matrix[peg_index]
+        is_possible = states[peg]
+
+        for other_peg in range(1, self.peg_colors + 1):
+            states[other_peg] = self.CANT_BE
+
+        # contradiction (the color was already removed) means no pattern satisfies all guesses - the position is left
+        # empty, so every pattern is rejected at once
+        if is_possible:
+            states[peg] = self.MUST_BE
+
+    def _propagate(self):
+        """ Propagates changes until nothing changes: the only possible color of a position must be there
+        and (without duplicates) it can't be anywhere else """
+
+        changed = True
+        while changed:
+            changed = False
+
+            for peg_index, states in enumerate(self.states_matrix):
+
+                possible_pegs = [peg for peg in range(1, self.peg_colors + 1) if states[peg]]
+                if len(possible_pegs) != 1:
+                    continue
+
+                peg = possible_pegs[0]
+                if states[peg] != self.MUST_BE:
+                    states[peg] = self.MUST_BE
+                    changed = True
+
+                if not self.allow_duplicates:
+                    for other_index, other_states in enumerate(self.states_matrix):
+                        if other_index != peg_index and other_states[peg]:
+                            other_states[peg] = self.CANT_BE
+                            changed = True
@@ -7,6 +7,7 @@
 
 from class_progress import Progress
 from class_shuffle import shuffle
+from array import array
 import itertools
 from random import randrange
 
@@ -32,7 +33,6 @@ def peg_class(settings):
         def __init__(self, peg_color):
             """ Checks if just created peg has valid color """
 
-            # TODO: include `allow_blanks` setting
             if peg_color not in range(0, settings.peg_colors + 1):  # with blank peg
                 raise RuntimeError(
                     f"{settings.style.error_on}"
@@ -87,7 +87,6 @@ def peg_class(settings):
         def decode_peg(cls, peg_char):
             """ Returns Peg object converted from entered `peg_char` by the user """
 
-            # TODO: include `allow_blanks` setting
             if len(peg_char) == 1:  # just one char
                 try:
                     # find given char on the list
@@ -133,21 +132,31 @@ def pattern_class(settings):
                 )
 
         @classmethod
-        def validate_pattern(cls, pattern_tuple):
-            """ Checks if given `pattern_tuple` is formally correct """
+        def validate_pattern(cls, pattern_tuple, is_solution=False):
+            """ Checks if given `pattern_tuple` is formally correct (blank pegs are allowed only in guesses) """
+
+            # blank peg is the first one on the list
+            allowed_pegs_list = settings.Peg.all_pegs_list[(0 if settings.allow_blanks and not is_solution else 1):]
 
-            # TODO: include `allow_blanks` setting
             return (
                 isinstance(pattern_tuple, tuple)
                 and len(pattern_tuple) == settings.pegs_in_pattern
                 and all(
-                    pattern_peg in settings.Peg.all_pegs_list[1:]  # without blank peg
+                    pattern_peg in allowed_pegs_list
                     for pattern_peg in pattern_tuple
                 )
+                and (
+                    settings.allow_duplicates
+                    or all(  # blank pegs are not colors - they can be repeated
+                        pattern_tuple.count(pattern_peg) == 1
+                        for pattern_peg in pattern_tuple
+                        if pattern_peg
+                    )
+                )
             )
 
         @classmethod
-        def decode_pattern(cls, user_pattern):
+        def decode_pattern(cls, user_pattern, is_solution=False):
             """ Returns Pattern object converted from formatted `user_pattern` """
 
             try:
@@ -159,7 +168,7 @@ def pattern_class(settings):
             except (TypeError, ValueError, IndexError):  # possible exceptions during decoding
                 raise ValueError
 
-            if cls.validate_pattern(pattern_tuple):
+            if cls.validate_pattern(pattern_tuple, is_solution):
                 return Pattern(pattern_tuple)
             else:
                 raise ValueError
@@ -168,18 +177,12 @@ def pattern_class(settings):
         def get_random_pattern():
             """ Returns random pattern for generating the solution or giving a demo pattern """
 
-            # TODO: include `allow_blanks` setting
-            return Pattern(
-                tuple(
-                    settings.Peg.all_pegs_list[randrange(1, settings.peg_colors + 1)]  # without blank peg
-                    for _ in range(settings.pegs_in_pattern)
-                )
-            )
+            return Pattern.decode_index(randrange(settings.patterns_number))  # without blank peg
 
         def calculate_black_pegs(self, other_pattern):
             """ Returns `black_pegs` number (how many pegs are in proper color and in proper location) """
 
-            # TODO: include `allow_blanks` setting
+            # blank peg never matches a solution peg (solution pattern has no blank pegs)
             return sum(
                 int(this_pattern_peg == other_pattern_peg)  # 0 (different pegs) or 1 (same peg)
                 for this_pattern_peg, other_pattern_peg in zip(self, other_pattern)  # compare peg by peg
@@ -188,7 +191,6 @@ def pattern_class(settings):
         def calculate_black_white_pegs(self, other_pattern):
             """ Returns `black_white_pegs` number (how many pegs are in proper color regardless to location) """
 
-            # TODO: include `allow_blanks` setting
             return sum(
                 min(self.count(color), other_pattern.count(color))  # common number (minimum) of current color
                 for color in settings.Peg.all_pegs_list[1:]  # without blank peg
@@ -204,43 +206,201 @@ def pattern_class(settings):
             # to calculate `white_pegs` just subtract `black_pegs` from `black_white_pegs`
             return settings.Response((black_pegs, black_white_pegs - black_pegs))
 
+        def calculate_response_code(self, other_pattern):
+            """ Returns packed response code (see `Response.code`) for given pattern related to other pattern """
+
+            black_pegs = self.calculate_black_pegs(other_pattern)
+            black_white_pegs = self.calculate_black_white_pegs(other_pattern)
+
+            return black_white_pegs * (black_white_pegs + 1) // 2 + black_pegs
+
+        @property
+        def has_blank_pegs(self):
+            """ Returns True if current pattern is a guess with blank pegs (it can't be the solution) """
+
+            return 0 in self
+
+        @property
+        def index(self):
+            """ Returns `index` of current pattern (base-`peg_colors` integer encoding, rank in the space without
+            duplicated colors, or rank after all patterns for guesses with blank pegs) """
+
+            if self.has_blank_pegs:
+                return settings.patterns_number + settings.blank_guesses_enumerator.rank(
+                    tuple(peg - 1 for peg in self)
+                )
+
+            if not settings.allow_duplicates:
+                return settings.patterns_enumerator.rank(tuple(peg - 1 for peg in self))
+
+            index = 0
+            for peg in self:
+                index = index * settings.peg_colors + peg - 1  # shift previous pegs and add current peg digit
+            return index
+
         @staticmethod
-        def build_patterns():
-            """ Builds and returns a list of all possible patterns
-            (when `pre_build_patterns` == True) """
+        def decode_index(index):
+            """ Returns Pattern object decoded from given pattern `index` """
 
-            # copy `pegs_list` without blank peg to be saved (and shuffled if enabled)
-            pegs_list = settings.Peg.all_pegs_list[1:]
+            if not positional_index or index >= patterns_number:
+                if index >= patterns_number:
+                    digits = settings.blank_guesses_enumerator.unrank(index - patterns_number)
+                else:
+                    digits = settings.patterns_enumerator.unrank(index)
+                return Pattern(settings.Peg.all_pegs_list[digit + 1] for digit in digits)
+
+            pattern_tuple = ()
+            for _ in range(chunks_number - 1):
+                index, chunk_index = divmod(index, chunk_base)  # cut off the least significant chunk
+                pattern_tuple = chunk_table[chunk_index] + pattern_tuple
+            return Pattern(chunk_table[index][first_chunk_offset:] + pattern_tuple)
+
+        @staticmethod
+        def prepare_digits_matrix():
+            """ Prepares, saves and returns matrix of peg color digits lists (shuffled if enabled) for every peg
+            position, which defines the order of patterns in the patterns list/generator """
 
-            # shuffle `pegs_list` to build patterns from (before build) - if enabled
+            # list of peg color digits (peg color - 1) to be saved (and shuffled if enabled)
+            digits_list = list(range(settings.peg_colors))
+
+            # shuffle `digits_list` to build patterns from (before build) - if enabled
             if settings.shuffle_colors_before_build:
                 shuffle(
-                    pegs_list,  # small list
+                    digits_list,  # small list
                     progress=None,  # without progress shown (quick operation)
                 )
 
-            if settings.use_itertools_for_build:  # choose imported itertools function
+            # create 2-dimensional matrix (list of lists) to keep `digits_list` for every peg position in pattern
+            digits_matrix = []
+
+            for peg_index in range(0, settings.pegs_in_pattern):  # `peg_index` from 0 to `pegs_in_pattern` - 1
+                digits_matrix.append(digits_list.copy())  # copy and save `digits_list` for current `peg_index`
+
+                # shuffle `digits_list` for current peg (during build) - if enabled
+                # when using itertools it is impossible to use `shuffle_colors_during_build` setting
+                if settings.shuffle_colors_during_build and not settings.use_itertools_for_build:
+                    shuffle(
+                        digits_matrix[peg_index],  # small list
+                        progress=None,  # without progress shown (quick operation)
+                    )
+
+            Pattern.set_digits_matrix(digits_matrix)  # save the matrix of currently built/generated patterns
+            return digits_matrix
+
+        @staticmethod
+        def set_digits_matrix(digits_matrix):
+            """ Saves matrix of currently built/generated patterns (e.g. loaded from cache, None = unknown order) """
+
+            Pattern.digits_matrix = digits_matrix
+            if digits_matrix is None:
+                Pattern.positions_matrix = None
+            else:
+                # inverted matrix (digit -> its position in the digits list) for every peg position
+                Pattern.positions_matrix = [
+                    [digits_list.index(digit) for digit in range(settings.peg_colors)]
+                    for digits_list in digits_matrix
+                ]
+
+        @staticmethod
+        def _check_digits_matrix():
+            """ Checks if the order of currently built/generated patterns is described by the digits matrix """
+
+            if Pattern.digits_matrix is None:
+                raise RuntimeError(
+                    f"{settings.style.error_on}"
+                    f"[Pattern] Patterns order is unknown (not built/generated yet or shuffled after build)!"
+                    f"{settings.style.error_off}"
+                )
+
+        @staticmethod
+        def unrank_index(position):
+            """ Returns pattern index at given `position` of the currently built/generated patterns (in O(pegs),
+            O(pegs * colors) without duplicated colors) """
+
+            Pattern._check_digits_matrix()
+
+            if not positional_index:
+                enumerator = settings.patterns_enumerator
+                return enumerator.rank(enumerator.unrank(position, Pattern.digits_matrix))
+
+            index = 0
+            for digits_list, weight in zip(reversed(Pattern.digits_matrix), reversed(index_weights)):
+                position, odo_value = divmod(position, settings.peg_colors)  # like odometer value of current peg
+                index += digits_list[odo_value] * weight
+            return index
+
+        @staticmethod
+        def unrank(position):
+            """ Returns Pattern object at given `position` of the currently built/generated patterns """
+
+            return Pattern.decode_index(Pattern.unrank_index(position))
+
+        @staticmethod
+        def rank_index(index):
+            """ Returns position of given pattern `index` in the currently built/generated patterns (in O(pegs),
+            O(pegs * colors) without duplicated colors) """
+
+            Pattern._check_digits_matrix()
+
+            if not positional_index:
+                enumerator = settings.patterns_enumerator
+                return enumerator.rank(enumerator.unrank(index), Pattern.positions_matrix)
+
+            position = 0
+            for positions_list, weight in zip(reversed(Pattern.positions_matrix), reversed(index_weights)):
+                position += positions_list[index // weight % settings.peg_colors] * weight
+            return position
+
+        def rank(self):
+            """ Returns position of current pattern in the currently built/generated patterns """
+
+            return Pattern.rank_index(self.index)
+
+        @staticmethod
+        def build_patterns():
+            """ Builds and returns an array of indexes of all possible patterns
+            (when `pre_build_patterns` == True) """
+
+            digits_matrix = Pattern.prepare_digits_matrix()
+
+            if not positional_index:  # patterns without duplicated colors are built straight from the generator
 
                 with Progress(
                     items_number=settings.patterns_number,
                     style=settings.style,
-                    title="[Pattern] Building patterns list (using itertools)...",
+                    title=(
+                        f"[Pattern] Building patterns list without duplicated colors "
+                        f"(using {'itertools' if settings.use_itertools_for_build else 'my own function'})..."
+                    ),
                     timing=settings.progress_timing,
                 ) as progress:
 
-                    # when using itertools it is impossible to use `shuffle_colors_during_build` setting
+                    all_patterns_list = array(Pattern.index_typecode)
+                    for block in progress.blocks(Pattern.patterns_generator()(digits_matrix)):
+                        all_patterns_list.extend(block)  # progress is checked once for every block
 
-                    all_patterns_list = list(  # build the list from map generator
-                        map(  # map function to create Pattern objects from tuples generated by itertools
-                            lambda pattern_tuple: progress.item(  # wrapped to check the progress
-                                settings.Pattern(pattern_tuple)
+            elif settings.use_itertools_for_build:  # choose imported itertools function
+
+                with Progress(
+                    items_number=settings.patterns_number,
+                    style=settings.style,
+                    title="[Pattern] Building patterns list (using itertools)...",
+                    timing=settings.progress_timing,
+                ) as progress:
+
+                    all_patterns_list = array(Pattern.index_typecode)  # build the compact array of indexes
+                    for block in progress.blocks(
+                        map(  # sum weighted digits of every peg into pattern index
+                            sum,
+                            itertools.product(  # returns Cartesian product of weighted digits lists
+                                *(
+                                    [digit * weight for digit in digits_list]
+                                    for digits_list, weight in zip(digits_matrix, index_weights)
+                                )
                             ),
-                            itertools.product(  # returns Cartesian product of pegs_list repeated n times
-                                pegs_list,
-                                repeat=settings.pegs_in_pattern,  # repeat for length of the pattern
-                            )
-                        )
-                    )
+                        ),
+                    ):
+                        all_patterns_list.extend(block)  # progress is checked once for every block
 
             else:  # choose my own function
 
@@ -252,36 +412,22 @@ def pattern_class(settings):
                     timing=settings.progress_timing,
                 ) as progress:
 
-                    all_patterns_list = [()]  # initialize temporary list to be built (containing empty pattern tuple)
+                    all_patterns_list = [0]  # initialize temporary list to be built (containing empty pattern index)
 
-                    for _ in range(settings.pegs_in_pattern - 1):  # iterate for `pegs_in_pattern`-1 times
+                    for digits_list in digits_matrix:  # iterate for `pegs_in_pattern` times
 
-                        all_patterns_list = [  # make temporary list of pattern tuples
-                            progress.item(  # wrapped to check the progress
-                                (*pattern_tuple, new_peg)  # unpack old tuple, add new peg and pack to new pattern tuple
-                            )
-                            for pattern_tuple in all_patterns_list
-                            for new_peg in pegs_list
-                        ]
-                        # new pattern is tuple a one peg bigger (unpacked old pegs + new one)
-
-                        # shuffle `pegs_list` to build pattern from (during build)
-                        if settings.shuffle_colors_during_build:
-                            shuffle(
-                                pegs_list,  # small list
-                                progress=None,  # without progress shown (quick operation)
+                        new_patterns_list = []  # make temporary list of pattern indexes
+                        for block in progress.blocks(all_patterns_list, weight=len(digits_list)):
+                            new_patterns_list.extend(
+                                index * settings.peg_colors + digit  # shift old index and add new peg digit
+                                for index in block
+                                for digit in digits_list
                             )
+                        all_patterns_list = new_patterns_list
+                        # new pattern index is one peg (digit) bigger than the old one
 
-                    all_patterns_list = [  # make final list of Pattern objects
-                        progress.item(  # wrapped to check the progress
-                            settings.Pattern(  # create final Pattern objects
-                                (*pattern_tuple, new_peg)  # unpack old tuple, add new peg and pack to new pattern tuple
-                            )
-                        )
-                        for pattern_tuple in all_patterns_list
-                        for new_peg in pegs_list
-                    ]
-                    # new pattern is Pattern object a one peg bigger (unpacked old pegs + new one)
+                    # make final compact array of pattern indexes
+                    all_patterns_list = array(Pattern.index_typecode, all_patterns_list)
 
             # shuffle generated patterns list (whole list at once) - regardless of the chosen method
             if settings.shuffle_patterns_after_build:
@@ -292,15 +438,16 @@ def pattern_class(settings):
                     timing=settings.progress_timing,
                 ) as progress:
                     shuffle(
-                        all_patterns_list,  # big list
+                        all_patterns_list,  # big array
                         progress=progress,  # with progress shown (potentially slow operation)
                     )
+                Pattern.set_digits_matrix(None)  # order of patterns cannot be described by the matrix anymore
 
             return all_patterns_list
 
         @classmethod
         def patterns_generator(cls):
-            """ Returns generator for all possible patterns in the game
+            """ Returns generator for all possible patterns indexes in the game
             (when `pre_build_patterns` == False) """
 
             if settings.use_itertools_for_build:
@@ -311,71 +458,78 @@ def pattern_class(settings):
                 return cls._patterns_generator_my_function
 
         @staticmethod
-        def _patterns_generator_itertools():
-            """ Returns generator for all possible patterns in the game using itertools function
+        def _patterns_generator_itertools(digits_matrix=None, start_position=0):
+            """ Returns generator for all possible patterns indexes in the game using itertools function
             (when `pre_build_patterns` == False and `use_itertools_for_build` == True) """
 
-            pegs_list = settings.Peg.all_pegs_list[1:]  # copy `pegs_list` without blank peg to be shuffled
-
-            # shuffle `pegs_list` to build patterns from (before build)
-            if settings.shuffle_colors_before_build:
-                shuffle(
-                    pegs_list,  # small list
-                    progress=None,  # without progress shown (quick operation)
-                )
+            if digits_matrix is None:
+                digits_matrix = Pattern.prepare_digits_matrix()
 
-            # when using itertools it is impossible to use `shuffle_colors_during_build` setting
+            if start_position:
+                # itertools product can't be started in the middle - turn the odometer in the same order
+                return Pattern._patterns_generator_my_function(digits_matrix, start_position)
 
-            return map(  # map function to create Pattern objects from tuples generated by itertools
-                lambda pattern_tuple: settings.Pattern(pattern_tuple),
-                itertools.product(  # returns Cartesian product of pegs_list repeated n times
-                    pegs_list,
-                    repeat=settings.pegs_in_pattern,  # repeat for length of the pattern
+            if not positional_index:
+                # every peg has the same digits list (colors are not shuffled during build when using itertools),
+                # so permutations are in the same order as the patterns list
+                return map(
+                    settings.patterns_enumerator.rank,  # rank of the permutation is pattern index
+                    itertools.permutations(digits_matrix[0], settings.pegs_in_pattern),
                 )
+
+            return map(  # sum weighted digits of every peg into pattern index
+                sum,
+                itertools.product(  # returns Cartesian product of weighted digits lists
+                    *(
+                        [digit * weight for digit in digits_list]
+                        for digits_list, weight in zip(digits_matrix, index_weights)
+                    )
+                ),
             )
 
             # when using patterns generator it is impossible to use `shuffle_patterns_after_build` setting
 
         @staticmethod
-        def _patterns_generator_my_function():
-            """ Returns generator for all possible patterns in the game using my own function
+        def _patterns_generator_my_function(digits_matrix=None, start_position=0):
+            """ Returns generator for all possible patterns indexes in the game using my own function
             (when `pre_build_patterns` == False and `use_itertools_for_build` == False) """
 
-            # copy `pegs_list` without blank peg to be saved (and shuffled if enabled)
-            pegs_list = settings.Peg.all_pegs_list[1:]
+            if digits_matrix is None:
+                digits_matrix = Pattern.prepare_digits_matrix()
 
-            # shuffle `pegs_list` to build patterns from (before build) - if enabled
-            if settings.shuffle_colors_before_build:
-                shuffle(
-                    pegs_list,  # small list
-                    progress=None,  # without progress shown (quick operation)
-                )
+            if not positional_index:
+                # without duplicated colors the pegs are turned recursively skipping colors used in the prefix
+                return settings.patterns_enumerator.generate(digits_matrix, start_position)
 
-            # create 2-dimensional matrix (dict values are lists) to keep `pegs_list` for every peg position in pattern
-            pegs_lists_matrix = {}
+            # create 2-dimensional matrix (dict values are lists) to keep weighted digits for every peg position
+            digits_lists_matrix = {}
 
             for peg_index in range(0, settings.pegs_in_pattern):  # `peg_index` from 0 to `pegs_in_pattern` - 1
-                pegs_lists_matrix[peg_index] = pegs_list.copy()  # copy and save `pegs_list` for current `peg_index`
-
-                # shuffle `pegs_list` for current peg (during build) - if enabled
-                if settings.shuffle_colors_during_build:
-                    shuffle(
-                        pegs_lists_matrix[peg_index],  # small list
-                        progress=None,  # without progress shown (quick operation)
-                    )
+                # save digits list for current `peg_index` multiplied by the weight of this peg in pattern index
+                digits_lists_matrix[peg_index] = [digit * index_weights[peg_index] for digit in digits_matrix[peg_index]]
 
-            # to run faster the list like odometer with int values is used, instead of Pattern objects with Peg objects
-            # conversion into mastermind objects and translation to shuffled value will occur during yielding a result
+            # to run faster the list like odometer with int values is used
+            # translation to shuffled weighted digits will occur during yielding a result
             # length of the odometer is `pegs_in_pattern` (indexed from 0), values are from 0 to `pegs_colors` - 1
             odometer = [0] * settings.pegs_in_pattern
 
-            # yield the first pattern
-            yield Pattern(  # create Pattern object
-                tuple(  # from pattern tuple
-                    map(  # where int values are converted into stored Peg objects from `pegs_list`
-                        lambda odo_tuple: pegs_lists_matrix[odo_tuple[0]][odo_tuple[1]],  # matrix[index][value]
-                        enumerate(odometer, 0),  # iterates and returns `odo_tuple` (index, value) from odometer
-                    )
+            # set the odometer to given `start_position` (big jump without generating previous patterns)
+            for odo_index in reversed(range(settings.pegs_in_pattern)):
+                start_position, odometer[odo_index] = divmod(start_position, settings.peg_colors)
+            if start_position:
+                return iter(())  # `start_position` is beyond the last pattern
+
+            return Pattern._odometer_generator(odometer, digits_lists_matrix)
+
+        @staticmethod
+        def _odometer_generator(odometer, digits_lists_matrix):
+            """ Yields patterns indexes turning the `odometer` from its current state to the end """
+
+            # yield the first pattern index
+            yield sum(  # pattern index is the sum of weighted digits
+                map(  # where int values are translated into stored weighted digits
+                    lambda odo_tuple: digits_lists_matrix[odo_tuple[0]][odo_tuple[1]],  # matrix[index][value]
+                    enumerate(odometer, 0),  # iterates and returns `odo_tuple` (index, value) from odometer
                 )
             )
 
@@ -392,13 +546,11 @@ def pattern_class(settings):
                     odometer[odo_index] += 1  # increment current peg
                     odo_index = settings.pegs_in_pattern - 1  # reset `odo_index` to the least significant peg
 
-                    # yield current pattern after one increment
-                    yield Pattern(  # create Pattern object
-                        tuple(  # from pattern tuple
-                            map(  # where int values are converted into stored Peg objects from `pegs_list`
-                                lambda odo_tuple: pegs_lists_matrix[odo_tuple[0]][odo_tuple[1]],  # matrix[index][value]
-                                enumerate(odometer, 0),  # iterates and returns `odo_tuple` (index, value) from odometer
-                            )
+                    # yield current pattern index after one increment
+                    yield sum(  # pattern index is the sum of weighted digits
+                        map(  # where int values are translated into stored weighted digits
+                            lambda odo_tuple: digits_lists_matrix[odo_tuple[0]][odo_tuple[1]],  # matrix[index][value]
+                            enumerate(odometer, 0),  # iterates and returns `odo_tuple` (index, value) from odometer
                         )
                     )
 
@@ -412,6 +564,45 @@ def pattern_class(settings):
 
             # when using patterns generator it is impossible to use `shuffle_patterns_after_build` setting
 
+    # pattern index is a base-`peg_colors` integer, where every peg is one digit (peg color - 1)
+    # and the first peg in the pattern is the most significant digit
+    # without duplicated colors pattern index is its rank in lexicographic order (see `PatternsEnumerator`)
+    # and guesses with blank pegs are numbered after all patterns
+    positional_index = settings.allow_duplicates
+    patterns_number = settings.patterns_number
+    index_weights = [
+        settings.peg_colors ** (settings.pegs_in_pattern - 1 - peg_index)
+        for peg_index in range(settings.pegs_in_pattern)
+    ]
+
+    # for fast decoding the index is divided into chunks of pegs, every chunk is translated by the lookup table
+    chunk_pegs = 1
+    while chunk_pegs < settings.pegs_in_pattern and settings.peg_colors ** (chunk_pegs + 1) <= 4096:
+        chunk_pegs += 1
+    chunk_base = settings.peg_colors ** chunk_pegs
+    chunks_number = -(-settings.pegs_in_pattern // chunk_pegs)  # ceil division
+    first_chunk_offset = chunks_number * chunk_pegs - settings.pegs_in_pattern  # pegs to omit in the first chunk
+    chunk_table = list(  # tuples of Peg objects for every possible chunk value
+        itertools.product(
+            settings.Peg.all_pegs_list[1:],  # without blank peg
+            repeat=chunk_pegs,
+        )
+    )
+
+    Pattern.digits_matrix = None  # (list) matrix of digits lists of currently built/generated patterns
+    Pattern.positions_matrix = None  # (list) inverted `digits_matrix` (positions of digits) for every peg
+
+    # choose the smallest array type code which can hold every pattern index (None if even 64-bit is too small -
+    # such patterns can be only generated, never kept in arrays)
+    Pattern.index_typecode = next(
+        (
+            typecode
+            for typecode in ('H', 'I', 'L', 'Q')
+            if settings.patterns_number <= 1 << (8 * array(typecode).itemsize)
+        ),
+        None,
+    )
+
     return Pattern
 
 
@@ -457,6 +648,13 @@ def response_class(settings):
 
             return self[0] + self[1]
 
+        @property
+        def code(self):
+            """ Returns `code` of the response packed into one byte (used by response tables) """
+
+            # responses are numbered by `black_white_pegs` and then by `black_pegs` (max 152 for 16 pegs)
+            return self.black_white_pegs * (self.black_white_pegs + 1) // 2 + self.black_pegs
+
         @classmethod
         def validate_response(cls, response_tuple):
             """ Checks if given `response_tuple` is formally correct """
@@ -519,6 +717,13 @@ def response_class(settings):
                     settings.Response.decode_response(user_response),
                 )
 
+    # list of all responses (also impossible ones) ordered by `code`, to decode responses from response tables
+    Response.all_responses_list = [
+        Response((black_pegs, black_white_pegs - black_pegs))
+        for black_white_pegs in range(0, settings.pegs_in_pattern + 1)
+        for black_pegs in range(0, black_white_pegs + 1)
+    ]
+
     return Response
 
 
@@ -579,6 +784,12 @@ def guesses_list_class(settings):
             self.append(guess)
             return guess
 
+        def rewind(self, guesses_number):
+            """ Removes guesses after given number of guesses from `GuessesList` (undoes turns) """
+
+            del self[guesses_number:]
+            self._guess_index = guesses_number
+
         def print_guesses_list(self):
             """ Prints list of all guesses """
 
@@ -97,10 +97,12 @@ class Consts(metaclass=ABCMeta):
 
     class ChosenSolver(metaclass=ABCMeta):
         name = "chosen_solver"
-        desc = "choose Solver: #1 = patterns checking generator Solver, #2 = patterns list filtering Solver"
+        desc = "choose Solver: #1 = patterns checking generator Solver, #2 = patterns list filtering Solver, " \
+               "#3 = Knuth's minimax Solver, #4 = sampling expected size / entropy Solver, " \
+               "#5 = decision tree playback Solver"
         type = int
         min_value = 1
-        max_value = 2
+        max_value = 5
         default_value = 1
         ask_if_not_given = True
 
@@ -139,6 +141,43 @@ class Consts(metaclass=ABCMeta):
         default_value = False
         ask_if_not_given = False
 
+    class CacheBuiltPatterns(metaclass=ABCMeta):
+        name = "cache_built_patterns"
+        desc = "enable keeping built patterns list in cache file (memory-mapped on later starts instead of building)"
+        type = bool
+        default_value = False
+        ask_if_not_given = False
+
+    class UseResponseTable(metaclass=ABCMeta):
+        name = "use_response_table"
+        desc = "enable response lookup table (Solvers take responses from the table instead of calculating them)"
+        type = bool
+        default_value = False
+        ask_if_not_given = False
+
+    class ResponseTableMemoryLimit(metaclass=ABCMeta):
+        name = "response_table_memory_limit"
+        desc = "set memory limit in MB for response table (full table if it fits, otherwise cached rows)"
+        type = int
+        min_value = 1
+        max_value = 4096
+        default_value = 64
+        ask_if_not_given = False
+
+    class ResponseTableFile(metaclass=ABCMeta):
+        name = "response_table_file"
+        desc = "enable keeping full response table in memory-mapped file if it doesn't fit in memory limit"
+        type = bool
+        default_value = False
+        ask_if_not_given = False
+
+    class UseOpeningBook(metaclass=ABCMeta):
+        name = "use_opening_book"
+        desc = "enable taking the first and the second guess from the opening book (calculated once per configuration)"
+        type = bool
+        default_value = False
+        ask_if_not_given = False
+
     # SOLVER #1 SETTINGS
 
     class Solver1Calc2ndSolution(metaclass=ABCMeta):
@@ -148,6 +187,39 @@ class Consts(metaclass=ABCMeta):
         default_value = True
         ask_if_not_given = False
 
+    class Solver1Processes(metaclass=ABCMeta):
+        name = "solver1_processes"
+        desc = "set number of worker processes scanning patterns in parallel for Solver1 (0 or 1 = serial scan)"
+        type = int
+        min_value = 0
+        max_value = 64
+        default_value = 0
+        ask_if_not_given = False
+
+    class Solver1PrunePatterns(metaclass=ABCMeta):
+        name = "solver1_prune_patterns"
+        desc = "enable skipping whole subtrees of patterns which cannot be a solution for Solver1"
+        type = bool
+        default_value = True
+        ask_if_not_given = False
+
+    class Solver1CountPossibleSolutions(metaclass=ABCMeta):
+        name = "solver1_count_possible_solutions"
+        desc = "enable counting possible solutions after every guess in Solver1 (without scanning patterns)"
+        type = bool
+        default_value = False
+        ask_if_not_given = False
+
+    class Solver1EstimateRelativeError(metaclass=ABCMeta):
+        name = "solver1_estimate_relative_error"
+        desc = "set relative error (in %) of estimated number of possible solutions printed after every guess " \
+               "in Solver1 (0 = disabled)"
+        type = int
+        min_value = 0
+        max_value = 100
+        default_value = 0
+        ask_if_not_given = False
+
     # SOLVER #2 SETTINGS
 
     class Solver2TakeRandomPattern(metaclass=ABCMeta):
@@ -165,3 +237,86 @@ class Consts(metaclass=ABCMeta):
         max_value = 100
         default_value = 10
         ask_if_not_given = False
+
+    class Solver2UseNumpy(metaclass=ABCMeta):
+        name = "solver2_use_numpy"
+        desc = "enable vectorized NumPy backend for Solver2 (NumPy module is required)"
+        type = bool
+        default_value = False
+        ask_if_not_given = False
+
+    class Solver2UseBitset(metaclass=ABCMeta):
+        name = "solver2_use_bitset"
+        desc = "enable keeping possible solutions of Solver2 as a bitset (filtered with response table masks)"
+        type = bool
+        default_value = False
+        ask_if_not_given = False
+
+    class Solver2StreamMemoryLimit(metaclass=ABCMeta):
+        name = "solver2_stream_memory_limit"
+        desc = "set memory limit in MB for possible solutions list of Solver2 filtering patterns generator on the " \
+               "fly, the list is built only when it fits (0 = disabled, always build the list)"
+        type = int
+        min_value = 0
+        max_value = 4096
+        default_value = 0
+        ask_if_not_given = False
+
+    # SOLVER #3 SETTINGS
+
+    class Solver3SymmetryReduction(metaclass=ABCMeta):
+        name = "solver3_symmetry_reduction"
+        desc = "enable evaluating only one guess of every class of guesses symmetric under colors and pegs " \
+               "permutations preserving previous guesses (Solver3 and Solver4)"
+        type = bool
+        default_value = True
+        ask_if_not_given = False
+
+    # SOLVER #4 SETTINGS
+
+    class Solver4Strategy(metaclass=ABCMeta):
+        name = "solver4_strategy"
+        desc = "choose Solver4 guess scoring: 1 = expected size of remaining part, 2 = entropy of responses"
+        type = int
+        min_value = 1
+        max_value = 2
+        default_value = 1
+        ask_if_not_given = False
+
+    class Solver4GuessesSample(metaclass=ABCMeta):
+        name = "solver4_guesses_sample"
+        desc = "set number of sampled guesses evaluated by Solver4 in every turn (0 = all patterns)"
+        type = int
+        min_value = 0
+        max_value = 1000000
+        default_value = 2000
+        ask_if_not_given = False
+
+    class Solver4SolutionsSample(metaclass=ABCMeta):
+        name = "solver4_solutions_sample"
+        desc = "set number of sampled possible solutions to evaluate guesses against in Solver4 (0 = all)"
+        type = int
+        min_value = 0
+        max_value = 1000000
+        default_value = 2000
+        ask_if_not_given = False
+
+    class Solver4TimeBudget(metaclass=ABCMeta):
+        name = "solver4_time_budget"
+        desc = "set time budget in milliseconds for choosing one guess in Solver4 (0 = unlimited)"
+        type = int
+        min_value = 0
+        max_value = 3600000
+        default_value = 0
+        ask_if_not_given = False
+
+    # SOLVER #5 SETTINGS
+
+    class Solver5TreeSolver(metaclass=ABCMeta):
+        name = "solver5_tree_solver"
+        desc = "choose Solver which exported decision tree is played back by Solver5"
+        type = int
+        min_value = 1
+        max_value = 4
+        default_value = 3
+        ask_if_not_given = False
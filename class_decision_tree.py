@@ -0,0 +1,236 @@
+############################################
+# My version of the famous Mastermind game #
+# class_decision_tree.py                   #
+# Decision tree of Mastermind Solver       #
+#           Piotr Loos (c) 2019-2021, 2023 #
+############################################
+
+from array import array
+import os
+import struct
+import sys
+
+
+class DecisionTree:
+    """ Whole solving strategy of deterministic Solver - guess for every sequence of responses """
+
+    _magic = b"MMTREE03"  # (bytes) file format signature
+    # (str) magic, colors, pegs, duplicates, Solver, strategy, guess index item size, nodes, edges
+    _header_format = "<8sHH?B32sBII"
+
+    def __init__(
+            self,
+            peg_colors,
+            pegs_in_pattern,
+            chosen_solver,
+            allow_duplicates=True,
+            strategy="",
+    ):
+        """ Initializes empty `DecisionTree` class object """
+
+        self.peg_colors = peg_colors  # (int) configuration of the game the tree was built for
+        self.pegs_in_pattern = pegs_in_pattern
+        self.allow_duplicates = allow_duplicates
+        self.chosen_solver = chosen_solver  # (int) Solver which strategy is saved in the tree
+        self.strategy = strategy  # (str) settings changing guesses of the Solver (see `strategy_key`)
+
+        # node is the state of the game before a guess, node 0 is the root (before the first guess)
+        self._guesses_list = array('Q')  # (array) guess pattern index for every node
+        self._solutions_list = array('I')  # (array) number of solutions reaching every node
+        self._children_dict = {}  # (dict) (node, response code) -> child node
+
+    @staticmethod
+    def strategy_key(settings, chosen_solver):
+        """ Returns key of the settings changing guesses of given Solver (the same configuration played with other
+        values of these settings needs its own tree) """
+
+        if chosen_solver == 1:
+            return (
+                f"book{settings.use_opening_book:d}"
+                f"_2nd{settings.solver1_calc_2nd_solution:d}"
+            )
+        elif chosen_solver == 2:
+            return (
+                f"book{settings.use_opening_book:d}"
+                f"_random{settings.solver2_take_random_pattern:d}"
+            )
+        elif chosen_solver == 3:
+            return (
+                f"book{settings.use_opening_book:d}"
+            )
+        else:
+            # Solver4 doesn't use the opening book (deterministic Solver4 evaluates all guesses and solutions)
+            return (
+                f"strategy{settings.solver4_strategy}"
+            )
+
+    @staticmethod
+    def file_path(peg_colors, pegs_in_pattern, chosen_solver, allow_duplicates=True, strategy=""):
+        """ Returns path of the tree file for given configuration, Solver and its strategy key """
+
+        return os.path.join(
+            os.path.dirname(os.path.abspath(__file__)),
+            "decision_trees",
+            f"tree_{peg_colors}x{pegs_in_pattern}{'' if allow_duplicates else '_unique'}_solver{chosen_solver}"
+            f"{'_' if strategy else ''}{strategy}.bin",
+        )
+
+    @property
+    def nodes_number(self):
+        """ Returns number of nodes (guesses) in the tree """
+
+        return len(self._guesses_list)
+
+    def guess_index(self, node):
+        """ Returns pattern index of the guess in given `node` """
+
+        return self._guesses_list[node]
+
+    def solutions_number(self, node):
+        """ Returns number of solutions (possible solutions) reaching given `node` """
+
+        return self._solutions_list[node]
+
+    def child(self, node, response_code):
+        """ Returns the next node after given response in `node` (or None if there is no such response) """
+
+        return self._children_dict.get((node, response_code))
+
+    def add_game(self, guesses_list):
+        """ Adds path of one played game (list of guesses with responses) to the tree """
+
+        node = 0
+        response_code = None
+
+        for guess in guesses_list:
+
+            if response_code is not None:
+                child = self._children_dict.get((node, response_code))
+                if child is None:
+                    child = self._add_node(guess.pattern.index)
+                    self._children_dict[(node, response_code)] = child
+                node = child
+            elif not self._guesses_list:
+                self._add_node(guess.pattern.index)  # the root
+
+            if self._guesses_list[node] != guess.pattern.index:
+                raise RuntimeError(
+                    f"[DecisionTree] Solver gave different guesses for the same responses - it is not deterministic!"
+                )
+
+            self._solutions_list[node] += 1
+            response_code = guess.response.code
+
+    def _add_node(self, guess_index):
+        """ Adds new node with given guess and returns its number """
+
+        self._guesses_list.append(guess_index)
+        self._solutions_list.append(0)
+        return len(self._guesses_list) - 1
+
+    def save(self, path=None):
+        """ Saves the tree to compact binary file (all numbers are little-endian) """
+
+        if path is None:
+            path = self.file_path(
+                self.peg_colors,
+                self.pegs_in_pattern,
+                self.chosen_solver,
+                self.allow_duplicates,
+                self.strategy,
+            )
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # guesses indexes are saved with the smallest sufficient item size
+        guesses_list = array(
+            next(
+                typecode
+                for typecode in ('H', 'I', 'Q')
+                if max(self._guesses_list, default=0) < 1 << (8 * array(typecode).itemsize)
+            ),
+            self._guesses_list,
+        )
+
+        edges_list = sorted(self._children_dict.items())
+        parents_list = array('I', (parent for (parent, _), _ in edges_list))
+        codes_list = array('B', (code for (_, code), _ in edges_list))
+        children_list = array('I', (child for _, child in edges_list))
+
+        arrays_list = [guesses_list, self._solutions_list, parents_list, codes_list, children_list]
+        if sys.byteorder == "big":
+            arrays_list = [array(item.typecode, item) for item in arrays_list]
+            for item in arrays_list:
+                item.byteswap()
+
+        with open(path, "wb") as file:
+            file.write(
+                struct.pack(
+                    self._header_format,
+                    self._magic,
+                    self.peg_colors,
+                    self.pegs_in_pattern,
+                    self.allow_duplicates,
+                    self.chosen_solver,
+                    self.strategy.encode(),
+                    guesses_list.itemsize,
+                    len(guesses_list),
+                    len(edges_list),
+                )
+            )
+            for item in arrays_list:
+                item.tofile(file)
+
+        return path
+
+    @classmethod
+    def load(cls, path, peg_colors, pegs_in_pattern, chosen_solver, allow_duplicates=True, strategy=""):
+        """ Returns the tree loaded from binary file (it must be built for given configuration, Solver and its
+        strategy key) """
+
+        with open(path, "rb") as file:
+            data = file.read()
+
+        if len(data) < struct.calcsize(cls._header_format) or not data.startswith(cls._magic):
+            raise RuntimeError(
+                f"[DecisionTree] File `{path}` is not a decision tree file (or it was saved by other version)!"
+            )
+
+        (
+            _, tree_peg_colors, tree_pegs_in_pattern, tree_allow_duplicates, tree_chosen_solver, tree_strategy,
+            itemsize, nodes_number, edges_number,
+        ) = struct.unpack_from(
+            cls._header_format,
+            data,
+        )
+        if (
+                tree_peg_colors, tree_pegs_in_pattern, tree_allow_duplicates, tree_chosen_solver,
+                tree_strategy.rstrip(b"\0").decode(),
+        ) != (peg_colors, pegs_in_pattern, allow_duplicates, chosen_solver, strategy):
+            raise RuntimeError(
+                f"[DecisionTree] File `{path}` keeps decision tree built for other settings!"
+            )
+
+        offset = struct.calcsize(cls._header_format)
+        arrays_list = []
+        for typecode, items_number in (
+                ({2: 'H', 4: 'I', 8: 'Q'}[itemsize], nodes_number),
+                ('I', nodes_number),
+                ('I', edges_number),
+                ('B', edges_number),
+                ('I', edges_number),
+        ):
+            item = array(typecode)
+            item.frombytes(data[offset:offset + items_number * item.itemsize])
+            if sys.byteorder == "big":
+                item.byteswap()
+            offset += items_number * item.itemsize
+            arrays_list.append(item)
+
+        guesses_list, solutions_list, parents_list, codes_list, children_list = arrays_list
+
+        tree = cls(peg_colors, pegs_in_pattern, chosen_solver, allow_duplicates, strategy)
+        tree._guesses_list = array('Q', guesses_list)
+        tree._solutions_list = solutions_list
+        tree._children_dict = dict(zip(zip(parents_list, codes_list), children_list))
+
+        return tree
@@ -90,7 +90,9 @@ class Mastermind(metaclass=ABCMeta):
             f"{self._settings.style.number_on}"
             f"{self._settings.patterns_number:,}"  # divide number by comma every 3 digits
             f"{self._settings.style.number_off}"
-            f" possible patterns in this game. "
+            f" possible patterns in this game"
+            f"{'' if self._settings.allow_duplicates else ' (without duplicated colors)'}"
+            f"{self._guesses_with_blanks_string}. "
             f"Example pattern is {self._settings.Pattern.get_random_pattern()}."
         )
         print()
@@ -104,10 +106,57 @@ class Mastermind(metaclass=ABCMeta):
 
         while not self._game_status:  # game_status == 0 means game is active
             try:
-                self._take_turn(user_input=input(self._prompt))  # ask the user for input and then take a turn
+                user_input = input(self._prompt)  # ask the user for input
+                if user_input == "!undo":
+                    self._rewind(self._guesses_list.guess_index - 1)  # undo the last turn
+                elif user_input == "!restart":
+                    self._rewind(0)  # restart the game with the same solution
+                else:
+                    self._take_turn(user_input=user_input)  # take a turn
             except ValueError as err:  # catch only wrong input by the user
                 print(err)
 
+    def _rewind(self, guesses_number):
+        """ Undoes turns after given number of guesses (the game continues with the same solution) """
+
+        if not self._guesses_list.guess_index:
+            raise ValueError(
+                f"{self._settings.style.error_on}"
+                f"[Mastermind] There is no turn to undo!"
+                f"{self._settings.style.error_off}"
+            )
+
+        self._guesses_list.rewind(guesses_number)
+        self._solver.rewind(guesses_number)  # Solver restores its state from saved deltas (without scanning again)
+
+        print(
+            f"[Mastermind] Game is rewound to turn "
+            f"{self._settings.style.number_on}"
+            f"{guesses_number + 1}"
+            f"{self._settings.style.number_off}"
+            f"."
+        )
+        print()
+
+    def _release(self):
+        """ Releases memory of the ended game (patterns shared by all games stay in Settings for the next game) """
+
+        self._solver.release()
+
+    @property
+    def _guesses_with_blanks_string(self):
+        """ Returns info about number of guesses with blank pegs (empty if disabled) """
+
+        if self._settings.blank_guesses_enumerator is None:
+            return ""
+        return (
+            f" and "
+            f"{self._settings.style.number_on}"
+            f"{self._settings.guesses_number - self._settings.patterns_number:,}"
+            f"{self._settings.style.number_off}"
+            f" more guesses with blank pegs"
+        )
+
     @property
     def _prompt(self):
         """ Returns styled prompt for `input` function """
@@ -0,0 +1,201 @@
+############################################
+# My version of the famous Mastermind game #
+# class_opening_book.py                    #
+# Opening book of the first two guesses    #
+#           Piotr Loos (c) 2019-2021, 2023 #
+############################################
+
+from class_progress import Progress
+from class_response_table import LazyResponseTable
+from class_symmetry import GuessesSymmetry
+from collections import Counter
+from operator import itemgetter
+import json
+import os
+
+
+class OpeningBook:
+    """ Keeps the best (minimax) first guess and the best second guess for every response to it - for every
+    configuration in one small JSON file shipped with the sources (it is only read) - missing configuration is
+    calculated once and added to the book file in `cache` directory """
+
+    _file_name = "opening_book.json"  # (str) name of the shipped book file and of the book file in cache
+
+    # (int) maximum number of patterns of configuration calculated on demand (bigger configurations are used only
+    # if they are already in the file)
+    _build_patterns_limit = 2 ** 15
+
+    def __init__(
+            self,
+            settings,
+    ):
+        """ Initializes `OpeningBook` class object for current configuration (loads or calculates its entry) """
+
+        self._settings = settings
+
+        self.path = os.path.join(  # shipped book (read-only)
+            os.path.dirname(os.path.abspath(__file__)),
+            self._file_name,
+        )
+        self.cache_path = os.path.join(  # entries calculated at runtime
+            os.path.dirname(os.path.abspath(__file__)),
+            "cache",
+            self._file_name,
+        )
+        self.key = (
+            f"{settings.peg_colors}x{settings.pegs_in_pattern}"
+            f"{'' if settings.allow_duplicates else '_unique'}"
+        )
+
+        self._first_index = None  # (int) index of the first guess (None if there is no entry for configuration)
+        self._second_dict = {}  # (dict) response code of the first guess -> index of the second guess
+
+        book_dict = self._load(self.cache_path)
+        book_dict.update(self._load(self.path))  # shipped entries take precedence
+        if self.key not in book_dict and settings.patterns_number <= self._build_patterns_limit:
+            book_dict[self.key] = self._build()
+            self._save(book_dict[self.key])
+
+        if self.key in book_dict:
+            # pattern indexes are kept as numbers, response codes (see `Response.code`) as strings (JSON keys)
+            self._first_index = book_dict[self.key]["first"]
+            self._second_dict = {
+                int(code): index
+                for code, index in book_dict[self.key]["second"].items()
+            }
+
+    def guess_index(self, guesses_list):
+        """ Returns index of the book guess after given previous guesses (None if they are out of the book) """
+
+        if not guesses_list:
+            return self._first_index
+
+        if len(guesses_list) == 1 and guesses_list[0].pattern.index == self._first_index:
+            return self._second_dict.get(guesses_list[0].response.code)
+
+        return None
+
+    @staticmethod
+    def _load(path):
+        """ Returns dict of all configurations saved in given book file (empty if there is no valid file) """
+
+        try:
+            with open(path) as file:
+                book_dict = json.load(file)
+        except (OSError, ValueError):  # no file (or invalid file) - it will be created again
+            return {}
+
+        return book_dict if isinstance(book_dict, dict) else {}
+
+    def _save(self, entry_dict):
+        """ Adds calculated entry of current configuration to the book file in cache (shipped book is never changed) """
+
+        # read the cache file again just before writing, so entries added meanwhile by other processes are kept
+        book_dict = self._load(self.cache_path)
+        book_dict[self.key] = entry_dict
+
+        # write temporary file first, so other process never reads partially written book
+        temporary_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(temporary_path, "w") as file:
+                json.dump(book_dict, file, indent=4)
+                file.write("\n")
+            os.replace(temporary_path, self.cache_path)
+        except OSError:  # book is optional - the game can be played without it
+            try:
+                os.remove(temporary_path)
+            except OSError:
+                pass
+
+    def _build(self):
+        """ Returns calculated book entry (first guess and second guesses) for current configuration """
+
+        # response table rows (calculated one by one if the table is disabled)
+        response_table = self._settings.response_table
+        if response_table is None:
+            response_table = LazyResponseTable(self._settings, rows_limit=1)
+
+        all_patterns = range(self._settings.patterns_number)
+
+        first_index = self._find_best_guesses(
+            response_table,
+            [],
+            [all_patterns],
+            f"[OpeningBook] Choosing the first guess (only once for these settings)...",
+        )[0]
+
+        # parts of all patterns for every response to the first guess (in patterns indexes order)
+        first_row = response_table.row(first_index)
+        parts_dict = {}
+        for index in all_patterns:
+            parts_dict.setdefault(first_row[index], []).append(index)
+        codes_list = sorted(parts_dict)
+
+        second_list = self._find_best_guesses(
+            response_table,
+            [self._digits(first_index)],
+            [parts_dict[code] for code in codes_list],
+            f"[OpeningBook] Choosing the second guesses (only once for these settings)...",
+        )
+
+        print()
+        return {
+            "first": first_index,
+            "second": {
+                str(code): index
+                for code, index in zip(codes_list, second_list)
+            },
+        }
+
+    def _digits(self, index):
+        """ Returns digits tuple (peg color - 1) of the pattern with given index """
+
+        return tuple(peg - 1 for peg in self._settings.Pattern.decode_index(index))
+
+    def _find_best_guesses(self, response_table, guesses_digits_list, parts_list, progress_title):
+        """ Returns index of the best guess for every part of possible solutions after given previous guesses - the same
+        guess as Solver3 chooses: minimal worst case, then possible solution, then the lowest index """
+
+        # the only (or one of two) possible solutions is always the best guess
+        best_list = [part[0] if len(part) <= 2 else None for part in parts_list]
+        keys_list = [None] * len(parts_list)
+        evaluated_list = [
+            (part_index, itemgetter(*part), set(part))  # gets responses of all possible solutions at once
+            for part_index, part in enumerate(parts_list)
+            if len(part) > 2
+        ]
+
+        # every part is preserved by the symmetries of previous guesses, so one guess of every class is enough
+        symmetry = GuessesSymmetry(
+            self._settings.peg_colors,
+            self._settings.pegs_in_pattern,
+            guesses_digits_list,
+        )
+        keys_set = set()  # keys of already evaluated classes
+
+        with Progress(
+            items_number=self._settings.patterns_number,
+            style=self._settings.style,
+            title=progress_title,
+            timing=self._settings.progress_timing,
+        ) as progress:
+
+            for guess_index in range(self._settings.patterns_number):
+
+                symmetry_key = progress.item(symmetry.key(self._digits(guess_index)))
+                if symmetry_key in keys_set:
+                    continue  # symmetric to already evaluated guess with lower index
+                keys_set.add(symmetry_key)
+
+                row = response_table.row(guess_index)
+                for part_index, getter, part_set in evaluated_list:
+                    key = (
+                        max(Counter(getter(row)).values()),
+                        guess_index not in part_set,
+                    )
+                    if keys_list[part_index] is None or key < keys_list[part_index]:
+                        keys_list[part_index] = key
+                        best_list[part_index] = guess_index
+
+        return best_list
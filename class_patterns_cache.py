@@ -0,0 +1,140 @@
+############################################
+# My version of the famous Mastermind game #
+# class_patterns_cache.py                  #
+# On-disk cache of built patterns lists    #
+#           Piotr Loos (c) 2019-2021, 2023 #
+############################################
+
+from array import array
+import mmap
+import os
+import struct
+import sys
+
+
+class PatternsCache:
+    """ Keeps built (and shuffled) patterns list in a binary file to be memory-mapped on later starts """
+
+    _magic = b"MMPAT001"  # (bytes) file format signature (change it when the format changes)
+    _header_format = "=8sHHQc?"  # (str) magic, colors, pegs, patterns number, typecode, flag of the digits matrix
+    _data_alignment = 8  # (int) patterns array starts at multiple of this offset (for memory-mapped reading)
+
+    def __init__(
+            self,
+            settings,
+    ):
+        """ Initializes `PatternsCache` class object for current settings (file is not opened yet) """
+
+        self._settings = settings
+        self._file = None  # (file) opened cache file (kept open as long as the patterns list is used)
+        self._mmap = None  # (mmap) memory-mapped cache file
+
+        # every setting affecting the patterns list is a part of the file name (other settings use other files)
+        # `shuffle_colors_during_build` is ignored by itertools build
+        key = (
+            f"{settings.peg_colors}x{settings.pegs_in_pattern}"
+            f"{'' if settings.allow_duplicates else '_unique'}"
+            f"_b{int(settings.shuffle_colors_before_build)}"
+            f"_d{int(settings.shuffle_colors_during_build and not settings.use_itertools_for_build)}"
+            f"_a{int(settings.shuffle_patterns_after_build)}"
+            f"_{sys.byteorder}"
+        )
+        self.path = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)),
+            "cache",
+            f"patterns_{key}.bin",
+        )
+
+    def load(self):
+        """ Returns memory-mapped patterns list (zero-copy memoryview) and saved digits matrix, or None if there is
+        no valid cache file for current settings """
+
+        try:
+            self._file = open(self.path, "rb")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):  # no file (or empty file)
+            self.close()
+            return None
+
+        try:
+            magic, peg_colors, pegs_in_pattern, patterns_number, typecode, has_matrix = struct.unpack_from(
+                self._header_format,
+                self._mmap,
+            )
+            typecode = typecode.decode()
+            if (
+                    magic != self._magic
+                    or peg_colors != self._settings.peg_colors
+                    or pegs_in_pattern != self._settings.pegs_in_pattern
+                    or patterns_number != self._settings.patterns_number
+                    or typecode != self._settings.Pattern.index_typecode
+            ):
+                raise ValueError
+
+            offset = struct.calcsize(self._header_format)
+            if has_matrix:
+                matrix_size = pegs_in_pattern * peg_colors
+                digits = self._mmap[offset:offset + matrix_size]
+                digits_matrix = [
+                    list(digits[peg_index * peg_colors:(peg_index + 1) * peg_colors])
+                    for peg_index in range(pegs_in_pattern)
+                ]
+                offset += matrix_size
+            else:
+                digits_matrix = None
+
+            offset = -(-offset // self._data_alignment) * self._data_alignment
+            patterns_list = memoryview(self._mmap)[offset:].cast(typecode)
+            if len(patterns_list) != patterns_number:
+                patterns_list.release()
+                raise ValueError
+
+        except (struct.error, ValueError, TypeError):  # invalid or truncated file - it will be built again
+            self.close()
+            return None
+
+        return patterns_list, digits_matrix
+
+    def save(self, patterns_list, digits_matrix):
+        """ Saves built patterns list and its digits matrix (or None if shuffled after build) to the cache file """
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        header = struct.pack(
+            self._header_format,
+            self._magic,
+            self._settings.peg_colors,
+            self._settings.pegs_in_pattern,
+            len(patterns_list),
+            patterns_list.typecode.encode(),
+            digits_matrix is not None,
+        )
+        if digits_matrix is not None:
+            header += bytes(digit for digits_list in digits_matrix for digit in digits_list)
+        header += bytes(-len(header) % self._data_alignment)  # padding
+
+        # write temporary file first, so other process never reads partially written cache
+        temporary_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary_path, "wb") as file:
+                file.write(header)
+                patterns_list.tofile(file)
+            os.replace(temporary_path, self.path)
+        except OSError:  # cache is optional - the game can be played without it
+            try:
+                os.remove(temporary_path)
+            except OSError:
+                pass
+
+    def close(self):
+        """ Closes memory-mapped cache file """
+
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:  # patterns list is still used - it will be closed with the last reference
+                pass
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,169 @@
+############################################
+# My version of the famous Mastermind game #
+# class_patterns_enumerator.py             #
+# Ranking and unranking of patterns spaces #
+#           Piotr Loos (c) 2019-2021, 2023 #
+############################################
+
+
+class PatternsEnumerator:
+    """ Numbers patterns of one patterns space (with or without duplicated colors, or guesses with at least one
+    blank peg) in lexicographic order, patterns are given as tuples of digits (peg color - 1, blank peg is -1) """
+
+    def __init__(
+            self,
+            peg_colors,
+            pegs_in_pattern,
+            allow_duplicates=True,
+            blank_pegs=False,
+    ):
+        """ Initializes `PatternsEnumerator` class object for given patterns space """
+
+        self.peg_colors = peg_colors
+        self.pegs_in_pattern = pegs_in_pattern
+        self.allow_duplicates = allow_duplicates  # (bool) flag whether colors can be duplicated in pattern
+        self.blank_pegs = blank_pegs  # (bool) flag whether the space contains only patterns with blank pegs
+
+        self._numbers_dict = {}  # (dict) (free pegs, free colors, needs blank) -> number of completions
+
+        self.patterns_number = self.completions_number(pegs_in_pattern, peg_colors, blank_pegs)
+
+        # number of patterns in the subtree of every peg (for spaces without blank pegs) - it is also the weight
+        # of every next (not used) color of this peg in the pattern rank
+        self.weights = [
+            self.completions_number(
+                pegs_in_pattern - 1 - peg_index,
+                peg_colors - (0 if allow_duplicates else peg_index + 1),
+                False,
+            )
+            for peg_index in range(pegs_in_pattern)
+        ]
+
+    def completions_number(self, free_pegs, free_colors, needs_blank):
+        """ Returns number of ways to fill `free_pegs` pegs with `free_colors` colors (not used yet if duplicates
+        are disallowed), with at least one blank peg if `needs_blank` """
+
+        key = (free_pegs, free_colors, needs_blank)
+        if key not in self._numbers_dict:
+
+            if not free_pegs:
+                number = int(not needs_blank)
+            else:
+                next_colors = free_colors if self.allow_duplicates else free_colors - 1
+
+                # blank peg goes first, then colors
+                number = self.completions_number(free_pegs - 1, free_colors, False) if self.blank_pegs else 0
+                if free_colors:
+                    number += free_colors * self.completions_number(free_pegs - 1, next_colors, needs_blank)
+
+            self._numbers_dict[key] = number
+
+        return self._numbers_dict[key]
+
+    def rank(self, digits, positions_matrix=None):
+        """ Returns position of the pattern given as `digits` tuple (colors of every peg are ordered by
+        `positions_matrix`, natural order if None) """
+
+        position = 0
+        used_digits = []  # colors already used in the prefix (only if duplicates are disallowed)
+        free_colors = self.peg_colors
+        needs_blank = self.blank_pegs
+
+        for peg_index, digit in enumerate(digits):
+
+            free_pegs = self.pegs_in_pattern - 1 - peg_index
+
+            if digit < 0:  # blank peg is the first one - no patterns before it
+                needs_blank = False
+                continue
+
+            if self.blank_pegs:
+                position += self.completions_number(free_pegs, free_colors, False)  # skip blank peg subtree
+
+            if positions_matrix is None:
+                digit_position = digit
+                earlier_used = sum(used_digit < digit for used_digit in used_digits)
+            else:
+                positions_list = positions_matrix[peg_index]
+                digit_position = positions_list[digit]
+                earlier_used = sum(positions_list[used_digit] < digit_position for used_digit in used_digits)
+
+            if not self.allow_duplicates:
+                free_colors -= 1
+                used_digits.append(digit)
+
+            position += (digit_position - earlier_used) * self.completions_number(free_pegs, free_colors, needs_blank)
+
+        return position
+
+    def unrank(self, position, digits_matrix=None):
+        """ Returns digits tuple of the pattern at given `position` (colors of every peg are ordered by
+        `digits_matrix`, natural order if None) """
+
+        digits = []
+        free_colors = self.peg_colors
+        needs_blank = self.blank_pegs
+
+        for peg_index in range(self.pegs_in_pattern):
+
+            free_pegs = self.pegs_in_pattern - 1 - peg_index
+
+            if self.blank_pegs:
+                number = self.completions_number(free_pegs, free_colors, False)
+                if position < number:
+                    digits.append(-1)
+                    needs_blank = False
+                    continue
+                position -= number
+
+            if not self.allow_duplicates:
+                free_colors -= 1
+
+            digit_number, position = divmod(position, self.completions_number(free_pegs, free_colors, needs_blank))
+
+            digits_list = range(self.peg_colors) if digits_matrix is None else digits_matrix[peg_index]
+            if not self.allow_duplicates:
+                digits_list = [digit for digit in digits_list if digit not in digits]
+            digits.append(digits_list[digit_number])
+
+        return tuple(digits)
+
+    def generate(self, digits_matrix, start_position=0):
+        """ Yields patterns ranks (in natural order) of the space without blank pegs in the order given
+        by `digits_matrix` (starting from given `start_position`) """
+
+        if start_position >= self.patterns_number:
+            return iter(())
+
+        start_digits = self.unrank(start_position, digits_matrix) if start_position else None
+        return self._generate_subtree(digits_matrix, 0, 0, [], start_digits)
+
+    def _generate_subtree(self, digits_matrix, peg_index, prefix_rank, used_digits, start_digits):
+        """ Yields ranks of patterns with given prefix (its rank and used colors), turning the pegs from
+        `start_digits` (only in the first subtree) """
+
+        digits_list = digits_matrix[peg_index]
+        if start_digits is not None:
+            digits_list = digits_list[digits_list.index(start_digits[peg_index]):]
+
+        weight = self.weights[peg_index]
+        last_peg = peg_index == self.pegs_in_pattern - 1
+
+        for digit in digits_list:
+
+            if used_digits and digit in used_digits:
+                continue
+
+            # natural rank counts only colors not used in the prefix
+            rank = prefix_rank + (digit - sum(used_digit < digit for used_digit in used_digits)) * weight
+
+            if last_peg:
+                yield rank
+            else:
+                if not self.allow_duplicates:
+                    used_digits.append(digit)
+                yield from self._generate_subtree(digits_matrix, peg_index + 1, rank, used_digits, start_digits)
+                if not self.allow_duplicates:
+                    used_digits.pop()
+
+            start_digits = None  # next subtrees are generated from the beginning
@@ -5,11 +5,17 @@
 #           Piotr Loos (c) 2019-2021, 2023 #
 ############################################
 
+from itertools import islice
+from threading import Event, Thread
 from time import time
 
 
 class Progress:
-    """ Displays progress (percentage) during long-taking operations """
+    """ Displays progress (percentage) during long-taking operations - the value is refreshed by a timer thread,
+    so work loops only count done operations (best once for every block of items) """
+
+    _refresh_interval = 0.1  # (float) time in seconds between refreshes of the printed value
+    _block_size = 4096  # (int) default number of items in one block (see `blocks`)
 
     def __init__(
             self,
@@ -51,10 +57,11 @@ class Progress:
             )
 
         self._index = 0  # (int) index of current operation
-        self._portion = items_number / 100  # (float) 1% of progress to be added to threshold
-        self._inv = 100 / items_number  # (float) inversion of portion (to be * instead of /) to get the progress value
-        self._threshold = self._portion  # (float) current threshold (start with 1%)
-        self._threshold_int = int(round(self._threshold))  # (int) round the threshold to be compared with index
+        self._inv = 100 / items_number  # (float) inversion of 1% of progress (to be * instead of /) to get the value
+        self._printed_value = None  # (int) last printed Progress process value
+
+        self._stop_event = None  # (Event) event stopping the refresh thread
+        self._refresh_thread = None  # (Thread) thread printing new Progress process value while running
 
         self._timing = bool(timing)  # (bool) flag whether Progress process should be timed
         self._total_time = 0  # (float) total time in seconds
@@ -89,24 +96,36 @@ class Progress:
     def _print_title_value(self):
         """ Prints `title` and `value` """
 
+        self._printed_value = int(round(self._index * self._inv))
         self._print(
             f"\r"  # start from the beginning of line
             f"{self._title} "
             f"{self._style.progress_value_on}"
-            f"{int(round(self._index * self._inv)):3d}%"
+            f"{self._printed_value:3d}%"
             f"{self._style.progress_value_off}"
         )
 
     def _print_value(self):
-        """ Prints `value` """
+        """ Prints `value` (only if it has changed) """
 
+        value = int(round(self._index * self._inv))
+        if value == self._printed_value:
+            return
+
+        self._printed_value = value
         self._print(
             f"\b\b\b\b"  # 4 backspaces and the new value (in the same place)
             f"{self._style.progress_value_on}"
-            f"{int(round(self._index * self._inv)):3d}%"
+            f"{value:3d}%"
             f"{self._style.progress_value_off}"
         )
 
+    def _refresh(self):
+        """ Prints new `value` every `_refresh_interval` seconds until Progress process is stopped (refresh thread) """
+
+        while not self._stop_event.wait(self._refresh_interval):
+            self._print_value()
+
     def _print_summary(self):
         """ Prints `summary` in place of `value` """
 
@@ -154,12 +173,20 @@ class Progress:
 
         self._print_title_value()
 
+        # the value is printed independently of the work loop
+        self._stop_event = Event()
+        self._refresh_thread = Thread(target=self._refresh, daemon=True)
+        self._refresh_thread.start()
+
     def stop(self, finish=False, summary=None):
         """ Stops/pauses printing Progress process and changes `summary` text if given """
 
         self._check_state(should_be_running=True)
         self._running = False
 
+        self._stop_event.set()
+        self._refresh_thread.join()  # nothing is printed by the refresh thread from now on
+
         if finish:
             self._finished = True
 
@@ -213,16 +240,36 @@ class Progress:
         self._print_summary()
 
     def item(self, wrapped_value=None):
-        """ Wraps value - checks if next Progress process value should be printed """
+        """ Wraps value - counts one done operation (for loops with expensive items) """
 
         self._index += 1
 
-        if self._index >= self._threshold_int:
+        return wrapped_value
 
-            self._check_state(should_be_running=True)
+    def advance(self, items_number):
+        """ Adds `items_number` done operations at once (e.g. one processed block or skipped ones) """
 
-            self._print_value()  # calc the new Progress process value and print it
-            self._threshold += self._portion  # (float) set the new threshold
-            self._threshold_int = int(round(self._threshold))  # (int) round the threshold to be compared with index
+        self._index += items_number
 
-        return wrapped_value
+    def set_index(self, index):
+        """ Sets number of all done operations (for loops counting them on their own) """
+
+        self._index = index
+
+    def blocks(self, items, block_size=None, weight=1):
+        """ Yields consecutive blocks (slices of sequence or lists taken from iterator) of given `items` - every
+        processed block advances Progress process at once by its length multiplied by `weight` """
+
+        if block_size is None:
+            block_size = self._block_size
+
+        if hasattr(items, "__getitem__"):
+            blocks = (items[block_start:block_start + block_size] for block_start in range(0, len(items), block_size))
+        else:
+            iterator = iter(items)
+            blocks = iter(lambda: list(islice(iterator, block_size)), [])
+
+        for block in blocks:
+            block_index = self._index
+            yield block
+            self._index = block_index + len(block) * weight  # the same, even if `set_index` was called for the block
@@ -0,0 +1,323 @@
+############################################
+# My version of the famous Mastermind game #
+# class_response_table.py                  #
+# Response lookup tables for Mastermind    #
+#           Piotr Loos (c) 2019-2021, 2023 #
+############################################
+
+from class_progress import Progress
+from array import array
+import mmap
+import os
+import struct
+
+
+class LazyResponseTable:
+    """ Response table with rows calculated on demand and cached (for games where full table doesn't fit) """
+
+    def __init__(
+            self,
+            settings,
+            rows_limit=None,
+    ):
+        """ Initializes `LazyResponseTable` class object """
+
+        self._settings = settings
+        self.precomputed = False  # (bool) flag whether all rows are already in memory
+        self._rows_limit = rows_limit  # (int) maximum number of cached rows (None = unlimited)
+        self._rows_dict = {}  # (dict) cached rows (bytes) for patterns indexes, the least recently used are first
+
+        self._multisets_list = None  # (array) multiset id (colors counts) for every pattern index
+        self._multisets_counts = None  # (list) tuple of colors counts for every multiset id
+        self._next_digits = None  # (list) digits which can be added to every multiset id (without duplicates)
+        self._prefixes_multisets = None  # (list) multiset id of every prefix for every peg (without duplicates)
+
+    def _prepare_multisets(self):
+        """ Prepares multiset ids (white pegs depend only on colors counts of the pattern) for every pattern index """
+
+        peg_colors = self._settings.peg_colors
+
+        multisets_dict = {(0,) * peg_colors: 0}  # (dict) colors counts tuple -> multiset id
+        self._multisets_counts = [(0,) * peg_colors]
+        next_multisets = {}  # (dict) multiset id -> list of multiset ids after adding every color
+
+        multisets_list = [0]  # start with empty pattern
+        self._prefixes_multisets = []
+
+        for _ in range(self._settings.pegs_in_pattern):
+
+            self._prefixes_multisets.append(multisets_list)
+
+            for multiset in set(multisets_list):
+                if multiset not in next_multisets:
+                    next_multisets[multiset] = []
+                    for digit in range(peg_colors):
+                        counts = list(self._multisets_counts[multiset])
+                        if counts[digit] and not self._settings.allow_duplicates:
+                            continue  # color is already used
+                        counts[digit] += 1
+                        counts = tuple(counts)
+                        if counts not in multisets_dict:
+                            multisets_dict[counts] = len(self._multisets_counts)
+                            self._multisets_counts.append(counts)
+                        next_multisets[multiset].append(multisets_dict[counts])
+
+            # add one peg (digit) to every pattern - the same order as in pattern index
+            multisets_list = [
+                next_multiset
+                for multiset in multisets_list
+                for next_multiset in next_multisets[multiset]
+            ]
+
+        self._multisets_list = array('I', multisets_list)  # compact array (one multiset id per pattern index)
+
+        if self._settings.allow_duplicates:
+            self._prefixes_multisets = None  # black pegs are counted without prefixes
+        else:
+            self._next_digits = [
+                [digit for digit in range(peg_colors) if not counts[digit]]
+                for counts in self._multisets_counts
+            ]
+
+    def _calculate_row(self, pattern):
+        """ Returns calculated responses codes (bytes) of given `pattern` against every pattern index """
+
+        if self._multisets_list is None:
+            self._prepare_multisets()
+
+        digits = [peg - 1 for peg in pattern]  # blank peg gives digit -1 (never matches)
+        counts = [digits.count(digit) for digit in range(self._settings.peg_colors)]
+
+        # black pegs are counted peg by peg in the same order as in pattern index
+        black_pegs_list = [0]
+        if self._settings.allow_duplicates:
+            for digit in digits:
+                hits = [int(other_digit == digit) for other_digit in range(self._settings.peg_colors)]
+                black_pegs_list = [
+                    black_pegs + hit
+                    for black_pegs in black_pegs_list
+                    for hit in hits
+                ]
+        else:
+            # only colors not used in the prefix are added (prefixes with the same colors have the same hits)
+            for digit, prefixes_multisets in zip(digits, self._prefixes_multisets):
+                hits_dict = {
+                    multiset: [int(other_digit == digit) for other_digit in self._next_digits[multiset]]
+                    for multiset in set(prefixes_multisets)
+                }
+                black_pegs_list = [
+                    black_pegs + hit
+                    for black_pegs, multiset in zip(black_pegs_list, prefixes_multisets)
+                    for hit in hits_dict[multiset]
+                ]
+
+        # `black_white_pegs` depends only on colors counts, so it is calculated once for every multiset
+        multisets_codes = []
+        for other_counts in self._multisets_counts:
+            black_white_pegs = sum(map(min, counts, other_counts))
+            multisets_codes.append(black_white_pegs * (black_white_pegs + 1) // 2)  # see `Response.code`
+
+        return bytes(
+            multisets_codes[multiset] + black_pegs
+            for multiset, black_pegs in zip(self._multisets_list, black_pegs_list)
+        )
+
+    def row(self, index):
+        """ Returns responses codes row (bytes-like) for given pattern `index` against every pattern index """
+
+        try:
+            row = self._rows_dict[index]
+        except KeyError:
+            pass
+        else:
+            if self._rows_limit is not None:
+                self._rows_dict[index] = self._rows_dict.pop(index)  # move the used row to the end
+            return row
+
+        row = self._calculate_row(self._settings.Pattern.decode_index(index))
+
+        if self._rows_limit is not None and len(self._rows_dict) >= self._rows_limit:
+            del self._rows_dict[next(iter(self._rows_dict))]  # remove the least recently used cached row
+        self._rows_dict[index] = row
+
+        return row
+
+    def response_code(self, index, other_index):
+        """ Returns response code for given pair of patterns indexes """
+
+        return self.row(index)[other_index]
+
+
+class ResponseTable(LazyResponseTable):
+    """ Fully precomputed response table (for games where it fits in memory) """
+
+    def __init__(
+            self,
+            settings,
+    ):
+        """ Initializes `ResponseTable` class object and builds the whole table """
+
+        super().__init__(settings)
+
+        patterns_number = self._settings.patterns_number
+        self._table = bytearray(patterns_number * patterns_number)  # (bytearray) rows one by one (row-major)
+
+        with Progress(
+            items_number=patterns_number,
+            style=self._settings.style,
+            title="[ResponseTable] Building response table...",
+            timing=self._settings.progress_timing,
+        ) as progress:
+
+            for index in range(patterns_number):
+                self._table[index * patterns_number:(index + 1) * patterns_number] = progress.item(
+                    self._calculate_row(self._settings.Pattern.decode_index(index))
+                )
+
+        self._multisets_list = None  # not needed anymore - release the memory
+        self._multisets_counts = None
+        self._next_digits = None
+        self._prefixes_multisets = None
+
+        self._view = memoryview(self._table)
+        self.precomputed = True
+
+    def row(self, index):
+        """ Returns responses codes row (zero-copy memoryview) for given pattern `index` """
+
+        patterns_number = self._settings.patterns_number
+        if index >= patterns_number:
+            return super().row(index)  # guess with blank pegs is not in the table - calculate its row
+        return self._view[index * patterns_number:(index + 1) * patterns_number]
+
+
+class MappedResponseTable(LazyResponseTable):
+    """ Fully precomputed response table kept in a file and memory-mapped (for games where it doesn't fit in memory,
+    all processes share one page-cached copy) """
+
+    _magic = b"MMRTAB01"  # (bytes) file format signature (change it when the format changes)
+    _header_format = "<8sHHI"  # (str) magic, colors, pegs, patterns number (header is 16 bytes - aligned rows)
+
+    def __init__(
+            self,
+            settings,
+    ):
+        """ Initializes `MappedResponseTable` class object - builds the table file (only once) and maps it """
+
+        super().__init__(settings)
+
+        self.path = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)),
+            "cache",
+            f"response_table_{self._settings.peg_colors}x{self._settings.pegs_in_pattern}"
+            f"{'' if self._settings.allow_duplicates else '_unique'}.bin",
+        )
+
+        self._file = None  # (file) opened table file
+        self._mmap = None  # (mmap) memory-mapped table file
+        self._view = None  # (memoryview) zero-copy view of all rows
+
+        if not self._open():
+            self._build()
+            if not self._open():
+                raise RuntimeError(
+                    f"{self._settings.style.error_on}"
+                    f"[ResponseTable] Can't open response table file `{self.path}`!"
+                    f"{self._settings.style.error_off}"
+                )
+
+        self._multisets_list = None  # not needed anymore - release the memory
+        self._multisets_counts = None
+        self._next_digits = None
+        self._prefixes_multisets = None
+
+        self.precomputed = True
+
+    def _open(self):
+        """ Maps the table file and checks its header, returns True if the file is valid """
+
+        patterns_number = self._settings.patterns_number
+        header_size = struct.calcsize(self._header_format)
+
+        try:
+            self._file = open(self.path, "rb")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            header = struct.unpack_from(self._header_format, self._mmap)
+        except (OSError, ValueError, struct.error):  # no file, empty or truncated file
+            self.close()
+            return False
+
+        if (
+                header != (self._magic, self._settings.peg_colors, self._settings.pegs_in_pattern, patterns_number)
+                or len(self._mmap) != header_size + patterns_number * patterns_number
+        ):
+            self.close()
+            return False
+
+        self._view = memoryview(self._mmap)[header_size:]
+        return True
+
+    def _build(self):
+        """ Writes the table file row by row (row-major, only one row in memory at once) """
+
+        patterns_number = self._settings.patterns_number
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        # write temporary file first, so other process never maps partially written table
+        temporary_path = f"{self.path}.{os.getpid()}.tmp"
+
+        with Progress(
+            items_number=patterns_number,
+            style=self._settings.style,
+            title="[ResponseTable] Building response table file (only once for these settings)...",
+            timing=self._settings.progress_timing,
+        ) as progress:
+
+            try:
+                with open(temporary_path, "wb") as file:
+
+                    file.write(
+                        struct.pack(
+                            self._header_format,
+                            self._magic,
+                            self._settings.peg_colors,
+                            self._settings.pegs_in_pattern,
+                            patterns_number,
+                        )
+                    )
+                    for index in range(patterns_number):
+                        file.write(
+                            progress.item(
+                                self._calculate_row(self._settings.Pattern.decode_index(index))
+                            )
+                        )
+
+                os.replace(temporary_path, self.path)
+            finally:
+                # remove partially written file if building failed (e.g. no disk space or interrupted)
+                if os.path.exists(temporary_path):
+                    os.remove(temporary_path)
+
+    def row(self, index):
+        """ Returns responses codes row (zero-copy memoryview of the mapped file) for given pattern `index` """
+
+        patterns_number = self._settings.patterns_number
+        if index >= patterns_number:
+            return super().row(index)  # guess with blank pegs is not in the table - calculate its row
+        return self._view[index * patterns_number:(index + 1) * patterns_number]
+
+    def close(self):
+        """ Closes memory-mapped table file """
+
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:  # some rows are still used - it will be closed with the last reference
+                pass
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
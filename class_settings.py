@@ -7,9 +7,21 @@
 
 from class_components import peg_class, pattern_class, response_class, guess_class, guesses_list_class
 from class_consts import Consts
+from class_opening_book import OpeningBook
+from class_patterns_cache import PatternsCache
+from class_patterns_enumerator import PatternsEnumerator
+from class_progress import Progress
+from class_response_table import ResponseTable, LazyResponseTable, MappedResponseTable
 from class_styles import Color, NoColor
 from class_solver1 import MastermindSolver1
 from class_solver2 import MastermindSolver2
+from class_solver2_numpy import MastermindSolver2Numpy
+from class_solver2_bitset import MastermindSolver2Bitset
+from class_solver2_stream import MastermindSolver2Stream
+from class_solver3 import MastermindSolver3
+from class_solver4 import MastermindSolver4
+from class_solver5 import MastermindSolver5
+from array import array
 
 
 class Settings:
@@ -37,11 +49,32 @@ class Settings:
             shuffle_colors_before_build=None,
             shuffle_colors_during_build=None,
             shuffle_patterns_after_build=None,
+            cache_built_patterns=None,
+            use_response_table=None,
+            response_table_memory_limit=None,
+            response_table_file=None,
+            use_opening_book=None,
 
             solver1_calc_2nd_solution=None,
+            solver1_processes=None,
+            solver1_prune_patterns=None,
+            solver1_count_possible_solutions=None,
+            solver1_estimate_relative_error=None,
 
             solver2_take_random_pattern=None,
             solver2_print_possible_solutions_threshold=None,
+            solver2_use_numpy=None,
+            solver2_use_bitset=None,
+            solver2_stream_memory_limit=None,
+
+            solver3_symmetry_reduction=None,
+
+            solver4_strategy=None,
+            solver4_guesses_sample=None,
+            solver4_solutions_sample=None,
+            solver4_time_budget=None,
+
+            solver5_tree_solver=None,
 
             **kwargs,
     ):
@@ -119,6 +152,26 @@ class Settings:
             Consts.ShufflePatternsAfterBuild,
             shuffle_patterns_after_build,
         )
+        self._cache_built_patterns = self._get_setting(
+            Consts.CacheBuiltPatterns,
+            cache_built_patterns,
+        )
+        self._use_response_table = self._get_setting(
+            Consts.UseResponseTable,
+            use_response_table,
+        )
+        self._response_table_memory_limit = self._get_setting(
+            Consts.ResponseTableMemoryLimit,
+            response_table_memory_limit,
+        )
+        self._response_table_file = self._get_setting(
+            Consts.ResponseTableFile,
+            response_table_file,
+        )
+        self._use_opening_book = self._get_setting(
+            Consts.UseOpeningBook,
+            use_opening_book,
+        )
 
         # SOLVER #1 SETTINGS
 
@@ -126,6 +179,22 @@ class Settings:
             Consts.Solver1Calc2ndSolution,
             solver1_calc_2nd_solution,
         )
+        self._solver1_processes = self._get_setting(
+            Consts.Solver1Processes,
+            solver1_processes,
+        )
+        self._solver1_prune_patterns = self._get_setting(
+            Consts.Solver1PrunePatterns,
+            solver1_prune_patterns,
+        )
+        self._solver1_count_possible_solutions = self._get_setting(
+            Consts.Solver1CountPossibleSolutions,
+            solver1_count_possible_solutions,
+        )
+        self._solver1_estimate_relative_error = self._get_setting(
+            Consts.Solver1EstimateRelativeError,
+            solver1_estimate_relative_error,
+        )
 
         # SOLVER #2 SETTINGS
 
@@ -137,6 +206,51 @@ class Settings:
             Consts.Solver2PrintPossibleSolutionsThreshold,
             solver2_print_possible_solutions_threshold,
         )
+        self._solver2_use_numpy = self._get_setting(
+            Consts.Solver2UseNumpy,
+            solver2_use_numpy,
+        )
+        self._solver2_use_bitset = self._get_setting(
+            Consts.Solver2UseBitset,
+            solver2_use_bitset,
+        )
+        self._solver2_stream_memory_limit = self._get_setting(
+            Consts.Solver2StreamMemoryLimit,
+            solver2_stream_memory_limit,
+        )
+
+        # SOLVER #3 SETTINGS
+
+        self._solver3_symmetry_reduction = self._get_setting(
+            Consts.Solver3SymmetryReduction,
+            solver3_symmetry_reduction,
+        )
+
+        # SOLVER #4 SETTINGS
+
+        self._solver4_strategy = self._get_setting(
+            Consts.Solver4Strategy,
+            solver4_strategy,
+        )
+        self._solver4_guesses_sample = self._get_setting(
+            Consts.Solver4GuessesSample,
+            solver4_guesses_sample,
+        )
+        self._solver4_solutions_sample = self._get_setting(
+            Consts.Solver4SolutionsSample,
+            solver4_solutions_sample,
+        )
+        self._solver4_time_budget = self._get_setting(
+            Consts.Solver4TimeBudget,
+            solver4_time_budget,
+        )
+
+        # SOLVER #5 SETTINGS
+
+        self._solver5_tree_solver = self._get_setting(
+            Consts.Solver5TreeSolver,
+            solver5_tree_solver,
+        )
 
         # settings interpretation
 
@@ -148,6 +262,9 @@ class Settings:
         self._solvers_dict = {
             1: MastermindSolver1,  # patterns checking generator Solver
             2: MastermindSolver2,  # patterns list filtering Solver
+            3: MastermindSolver3,  # Knuth's minimax Solver (needs response table)
+            4: MastermindSolver4,  # sampling expected size / entropy Solver (needs response table)
+            5: MastermindSolver5,  # decision tree playback Solver (needs exported decision tree)
         }
 
         # print unrecognized settings
@@ -178,6 +295,30 @@ class Settings:
             )
         print()
 
+        # prepare enumerators of all patterns and guesses with blank pegs (if enabled)
+
+        if not self._allow_duplicates and self._peg_colors < self._pegs_in_pattern:
+            raise RuntimeError(
+                f"{self.style.error_on}"
+                f"[Settings] Without duplicates number of colors can't be less than number of pegs in pattern!"
+                f"{self.style.error_off}"
+            )
+
+        self._patterns_enumerator = PatternsEnumerator(
+            self._peg_colors,
+            self._pegs_in_pattern,
+            allow_duplicates=self._allow_duplicates,
+        )
+        if self._allow_blanks:
+            self._blank_guesses_enumerator = PatternsEnumerator(
+                self._peg_colors,
+                self._pegs_in_pattern,
+                allow_duplicates=self._allow_duplicates,
+                blank_pegs=True,
+            )
+        else:
+            self._blank_guesses_enumerator = None
+
         # pin Classes to Settings instance
 
         self.Peg = peg_class(self)
@@ -186,17 +327,67 @@ class Settings:
         self.Guess = guess_class(self)
         self.GuessesList = guesses_list_class(self)
 
+        if self.Pattern.index_typecode is None and (self._pre_build_patterns or self._chosen_solver in {2, 3, 4}):
+            raise RuntimeError(
+                f"{self.style.error_on}"
+                f"[Settings] Patterns indexes don't fit in 64 bits - choose Solver #1 without pre-building patterns "
+                f"for such a big game!"
+                f"{self.style.error_off}"
+            )
+
         # prepare all patterns list/generator
 
+        self._patterns_cache = None
+
         if self._pre_build_patterns:
-            # build (additionally shuffle if enabled) and save all patterns list - once for several games
-            self._all_patterns_list = self.Pattern.build_patterns()
+            cached = None
+            if self._cache_built_patterns:
+                # try to map patterns list (and its shuffled digits matrix) built on previous start
+                self._patterns_cache = PatternsCache(self)
+                cached = self._patterns_cache.load()
+
+            if cached is not None:
+                self._all_patterns_list, digits_matrix = cached
+                self.Pattern.set_digits_matrix(digits_matrix)
+            else:
+                # build (additionally shuffle if enabled) and save all patterns indexes array - once for several games
+                self._all_patterns_list = self.Pattern.build_patterns()
+                if self._patterns_cache is not None:
+                    self._patterns_cache.save(self._all_patterns_list, self.Pattern.digits_matrix)
             self._all_patterns_gen = None
         else:
-            # get all patterns generator - once for several games
+            # get all patterns indexes generator - once for several games
             self._all_patterns_list = None
             self._all_patterns_gen = self.Pattern.patterns_generator()
 
+        self._patterns_universe = None  # (array) list of all patterns built from generator only when asked
+
+        # prepare response lookup table (if enabled) - once for several games
+
+        if (
+                self._use_response_table
+                or self._chosen_solver in {3, 4}  # Solver3 and Solver4 always need it
+                or (self._chosen_solver == 2 and self._solver2_use_bitset and not self._solver2_use_numpy)  # bitset too
+        ):
+            memory_limit = self._response_table_memory_limit * 2 ** 20  # in bytes, one byte for every response
+            if self.patterns_number ** 2 <= memory_limit:
+                # the whole table fits in memory - build all the rows now
+                self._response_table = ResponseTable(self)
+            elif self._response_table_file:
+                # the whole table is built once to a file and memory-mapped (pages are shared by all processes)
+                self._response_table = MappedResponseTable(self)
+            else:
+                # only some rows fit in memory - calculate rows on demand and keep the most recent ones
+                self._response_table = LazyResponseTable(
+                    self,
+                    rows_limit=max(1, memory_limit // self.patterns_number),
+                )
+        else:
+            self._response_table = None
+
+        # opening book is loaded (or calculated) only when the first Solver asks for it - once for several games
+        self._opening_book = None
+
         print()
 
     @classmethod
@@ -283,15 +474,53 @@ class Settings:
 
     @property
     def patterns_number(self):
-        """ Returns number of all possible patterns """
+        """ Returns number of all possible patterns (possible solutions) """
+
+        # `peg_colors` to the power of `pegs_in_pattern`, or number of permutations P(`peg_colors`, `pegs_in_pattern`)
+        # without duplicates
+        return self._patterns_enumerator.patterns_number
+
+    @property
+    def guesses_number(self):
+        """ Returns number of all possible guesses (patterns and guesses with blank pegs if enabled) """
 
-        # TODO: implement `allow_blanks` and `allow_duplicates` - patterns number will be different
-        return self._peg_colors ** self._pegs_in_pattern  # `peg_colors` to the power of `pegs_in_pattern`
+        if self._blank_guesses_enumerator is None:
+            return self.patterns_number
+        return self.patterns_number + self._blank_guesses_enumerator.patterns_number
+
+    @property
+    def patterns_enumerator(self):
+        """ Returns enumerator of all possible patterns (ranks are patterns indexes) """
+
+        return self._patterns_enumerator
+
+    @property
+    def blank_guesses_enumerator(self):
+        """ Returns enumerator of guesses with blank pegs (None if disabled) """
+
+        return self._blank_guesses_enumerator
+
+    @property
+    def settings_dict(self):
+        """ Returns dict of all settings values (to create the same Settings object again, e.g. in other process) """
+
+        return {
+            setting.name: getattr(self, setting.name)
+            for setting in vars(Consts).values()
+            if isinstance(setting, type) and hasattr(setting, "name")
+        }
 
     @property
     def solver_class(self):
         """ Returns chosen Solver class (to be called) """
 
+        if self._chosen_solver == 2 and self._solver2_use_numpy:
+            return MastermindSolver2Numpy  # vectorized backend of patterns list filtering Solver
+        if self._chosen_solver == 2 and self._solver2_use_bitset:
+            return MastermindSolver2Bitset  # bitset backend of patterns list filtering Solver
+        if self._chosen_solver == 2 and self._solver2_stream_memory_limit and not self._pre_build_patterns:
+            return MastermindSolver2Stream  # patterns list filtering Solver building the list only when it fits
+
         return self._solvers_dict[self._chosen_solver]
 
     @property
@@ -306,7 +535,7 @@ class Settings:
 
     @property
     def all_patterns_list(self):
-        """ Returns reference to a list of all possible patterns """
+        """ Returns reference to an array of all possible patterns indexes """
 
         if self._all_patterns_list is None:
             raise RuntimeError(
@@ -317,9 +546,36 @@ class Settings:
         else:
             return self._all_patterns_list
 
+    @property
+    def patterns_universe(self):
+        """ Returns array of all patterns indexes shared by all games (built only once for several games) - it is never
+        changed, every game filters it into its own arrays (None if patterns order is shuffled for every game) """
+
+        if self._pre_build_patterns:
+            return self._all_patterns_list
+
+        if self._shuffle_colors_before_build or (
+                self._shuffle_colors_during_build and not self._use_itertools_for_build
+        ):
+            return None  # every launched generator has its own order of colors
+
+        if self._patterns_universe is None:
+            with Progress(
+                items_number=self.patterns_number,
+                style=self.style,
+                title="[Settings] Building list of all patterns (only once for several games)...",
+                timing=self._progress_timing,
+            ) as progress:
+
+                self._patterns_universe = array(self.Pattern.index_typecode)
+                for block in progress.blocks(self._all_patterns_gen()):
+                    self._patterns_universe.extend(block)  # progress is checked once for every block
+
+        return self._patterns_universe
+
     @property
     def all_patterns_gen(self):
-        """ Returns reference to a generator of all possible patterns """
+        """ Returns reference to a generator of all possible patterns indexes """
 
         if self._all_patterns_gen is None:
             raise RuntimeError(
@@ -330,6 +586,27 @@ class Settings:
         else:
             return self._all_patterns_gen
 
+    @property
+    def response_table(self):
+        """ Returns reference to the response lookup table (None if disabled) """
+
+        return self._response_table
+
+    @property
+    def opening_book(self):
+        """ Returns reference to the opening book of current configuration (None if disabled or not used by chosen
+        Solver - Solver4 has its own scoring and Solver5 plays its decision tree) """
+
+        return self.prepare_opening_book()
+
+    def prepare_opening_book(self):
+        """ Loads the opening book of current configuration (missing entry is calculated and saved) only once and
+        returns it - e.g. before starting other processes which just load it from the file """
+
+        if self._use_opening_book and self._chosen_solver not in {4, 5} and self._opening_book is None:
+            self._opening_book = OpeningBook(self)
+        return self._opening_book
+
     def print_settings(self):
         """ Prints list of all settings """
 
@@ -444,6 +721,36 @@ class Settings:
                 f"{self._shuffle_patterns_after_build}"
                 f"{self.style.setting_value_off}"
             )
+            print(
+                f"cache_built_patterns = "
+                f"{self.style.setting_value_on}"
+                f"{self._cache_built_patterns}"
+                f"{self.style.setting_value_off}"
+            )
+            print(
+                f"use_response_table = "
+                f"{self.style.setting_value_on}"
+                f"{self._use_response_table}"
+                f"{self.style.setting_value_off}"
+            )
+            print(
+                f"response_table_memory_limit = "
+                f"{self.style.setting_value_on}"
+                f"{self._response_table_memory_limit}"
+                f"{self.style.setting_value_off}"
+            )
+            print(
+                f"response_table_file = "
+                f"{self.style.setting_value_on}"
+                f"{self._response_table_file}"
+                f"{self.style.setting_value_off}"
+            )
+            print(
+                f"use_opening_book = "
+                f"{self.style.setting_value_on}"
+                f"{self._use_opening_book}"
+                f"{self.style.setting_value_off}"
+            )
             print()
 
             print(
@@ -455,6 +762,30 @@ class Settings:
                 f"{self._solver1_calc_2nd_solution}"
                 f"{self.style.setting_value_off}"
             )
+            print(
+                f"solver1_processes = "
+                f"{self.style.setting_value_on}"
+                f"{self._solver1_processes}"
+                f"{self.style.setting_value_off}"
+            )
+            print(
+                f"solver1_prune_patterns = "
+                f"{self.style.setting_value_on}"
+                f"{self._solver1_prune_patterns}"
+                f"{self.style.setting_value_off}"
+            )
+            print(
+                f"solver1_count_possible_solutions = "
+                f"{self.style.setting_value_on}"
+                f"{self._solver1_count_possible_solutions}"
+                f"{self.style.setting_value_off}"
+            )
+            print(
+                f"solver1_estimate_relative_error = "
+                f"{self.style.setting_value_on}"
+                f"{self._solver1_estimate_relative_error}"
+                f"{self.style.setting_value_off}"
+            )
             print()
 
             print(
@@ -472,4 +803,73 @@ class Settings:
                 f"{self._solver2_print_possible_solutions_threshold}"
                 f"{self.style.setting_value_off}"
             )
+            print(
+                f"solver2_use_numpy = "
+                f"{self.style.setting_value_on}"
+                f"{self._solver2_use_numpy}"
+                f"{self.style.setting_value_off}"
+            )
+            print(
+                f"solver2_use_bitset = "
+                f"{self.style.setting_value_on}"
+                f"{self._solver2_use_bitset}"
+                f"{self.style.setting_value_off}"
+            )
+            print(
+                f"solver2_stream_memory_limit = "
+                f"{self.style.setting_value_on}"
+                f"{self._solver2_stream_memory_limit}"
+                f"{self.style.setting_value_off}"
+            )
+            print()
+
+            print(
+                f"SOLVER #3 SETTINGS:"
+            )
+            print(
+                f"solver3_symmetry_reduction = "
+                f"{self.style.setting_value_on}"
+                f"{self._solver3_symmetry_reduction}"
+                f"{self.style.setting_value_off}"
+            )
+            print()
+
+            print(
+                f"SOLVER #4 SETTINGS:"
+            )
+            print(
+                f"solver4_strategy = "
+                f"{self.style.setting_value_on}"
+                f"{self._solver4_strategy}"
+                f"{self.style.setting_value_off}"
+            )
+            print(
+                f"solver4_guesses_sample = "
+                f"{self.style.setting_value_on}"
+                f"{self._solver4_guesses_sample}"
+                f"{self.style.setting_value_off}"
+            )
+            print(
+                f"solver4_solutions_sample = "
+                f"{self.style.setting_value_on}"
+                f"{self._solver4_solutions_sample}"
+                f"{self.style.setting_value_off}"
+            )
+            print(
+                f"solver4_time_budget = "
+                f"{self.style.setting_value_on}"
+                f"{self._solver4_time_budget}"
+                f"{self.style.setting_value_off}"
+            )
+            print()
+
+            print(
+                f"SOLVER #5 SETTINGS:"
+            )
+            print(
+                f"solver5_tree_solver = "
+                f"{self.style.setting_value_on}"
+                f"{self._solver5_tree_solver}"
+                f"{self.style.setting_value_off}"
+            )
             print()
@@ -7,15 +7,20 @@
 
 from random import randrange
 
+_block_size = 4096  # (int) number of swaps between Progress updates
+
 
 def shuffle(lst, progress=None):
     """ Shuffles iterable `lst` in place, handles Progress object if given """
 
     length = len(lst)
 
-    for i in range(length - 1):
-        j = randrange(i, length)
-        lst[i], lst[j] = lst[j], lst[i]
+    for block_start in range(0, length - 1, _block_size):
+        block_end = min(block_start + _block_size, length - 1)
+
+        for i in range(block_start, block_end):
+            j = randrange(i, length)
+            lst[i], lst[j] = lst[j], lst[i]
 
         if progress is not None:
-            progress.item()
+            progress.advance(block_end - block_start)  # once for every block of swaps
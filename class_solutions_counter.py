@@ -0,0 +1,124 @@
+############################################
+# My version of the famous Mastermind game #
+# class_solutions_counter.py               #
+# Counting of consistent patterns          #
+#           Piotr Loos (c) 2019-2021, 2023 #
+############################################
+
+
+class SolutionsCounter:
+    """ Counts patterns consistent with previous guesses without visiting them - patterns are built peg by peg
+    (dynamic programming) and all prefixes with the same black pegs and colors counts are merged into one state """
+
+    def __init__(
+            self,
+            peg_colors,
+            pegs_in_pattern,
+            allow_duplicates=True,
+    ):
+        """ Initializes `SolutionsCounter` class object for given patterns space """
+
+        self.peg_colors = peg_colors
+        self.pegs_in_pattern = pegs_in_pattern
+        self.allow_duplicates = allow_duplicates  # (bool) flag whether colors can be duplicated in pattern
+
+    def count(self, guesses, progress=None):
+        """ Returns number of patterns consistent with all `guesses` given as tuples of digits (-1 = blank peg),
+        colors counts, black pegs and black and white pegs (advances Progress object once for every peg if given) """
+
+        # colors of no guess never change black pegs or common colors - all of them are counted as one color
+        used_colors = sorted({digit for guess in guesses for digit in guess[0] if digit >= 0})
+        unused_colors_number = self.peg_colors - len(used_colors)
+
+        # numbers of every used color in every guess - bigger colors counts in the prefix don't matter
+        guesses_counts = [tuple(guess[1][digit] for guess in guesses) for digit in used_colors]
+        counts_limits = [max(color_counts) for color_counts in guesses_counts]
+
+        black_pegs_list = tuple(guess[2] for guess in guesses)
+        black_white_pegs_list = tuple(guess[3] for guess in guesses)
+
+        # state: black pegs and common colors (for every guess), limited used colors counts and number of unused
+        # colors taken (only without duplicates) -> number of prefixes in this state
+        states_dict = {((0,) * len(guesses), (0,) * len(guesses), (0,) * len(used_colors), 0): 1}
+
+        for peg_index in range(self.pegs_in_pattern):
+
+            remaining_pegs = self.pegs_in_pattern - 1 - peg_index
+            new_states_dict = {}
+
+            # black pegs added by every used color at this peg (for every guess)
+            added_blacks_list = [
+                tuple(int(guess[0][peg_index] == digit) for guess in guesses)
+                for digit in used_colors
+            ]
+
+            for (blacks, commons, counts, unused_taken), prefixes_number in states_dict.items():
+
+                for color_position, color_count in enumerate(counts):
+
+                    if color_count and not self.allow_duplicates:
+                        continue  # color is already used in the prefix
+
+                    new_blacks = tuple(map(int.__add__, blacks, added_blacks_list[color_position]))
+                    new_commons = tuple(
+                        common_colors + (color_count < guess_count)
+                        for common_colors, guess_count in zip(commons, guesses_counts[color_position])
+                    )
+
+                    # the response of every guess must still be reachable by the remaining pegs
+                    if not self._is_reachable(
+                            new_blacks,
+                            new_commons,
+                            black_pegs_list,
+                            black_white_pegs_list,
+                            remaining_pegs,
+                    ):
+                        continue
+
+                    new_counts = counts
+                    if color_count < counts_limits[color_position]:
+                        new_counts = counts[:color_position] + (color_count + 1,) + counts[color_position + 1:]
+
+                    key = (new_blacks, new_commons, new_counts, unused_taken)
+                    new_states_dict[key] = new_states_dict.get(key, 0) + prefixes_number
+
+                # any unused color (black pegs and common colors don't change)
+                if self.allow_duplicates:
+                    unused_choices, new_unused_taken = unused_colors_number, unused_taken
+                else:
+                    unused_choices, new_unused_taken = unused_colors_number - unused_taken, unused_taken + 1
+
+                if unused_choices > 0 and self._is_reachable(
+                        blacks,
+                        commons,
+                        black_pegs_list,
+                        black_white_pegs_list,
+                        remaining_pegs,
+                ):
+                    key = (blacks, commons, counts, new_unused_taken)
+                    new_states_dict[key] = new_states_dict.get(key, 0) + prefixes_number * unused_choices
+
+            states_dict = new_states_dict
+
+            if progress is not None:
+                progress.item()
+
+        # without remaining pegs only states with exact responses of all guesses are reachable
+        return sum(states_dict.values())
+
+    @staticmethod
+    def _is_reachable(blacks, commons, black_pegs_list, black_white_pegs_list, remaining_pegs):
+        """ Checks if responses of all guesses can still be reached by the prefix with given black pegs and common
+        colors when `remaining_pegs` pegs are added """
+
+        return all(
+            black_pegs <= black_pegs_target <= black_pegs + remaining_pegs
+            and
+            common_colors <= black_white_pegs_target <= common_colors + remaining_pegs
+            for black_pegs, common_colors, black_pegs_target, black_white_pegs_target in zip(
+                blacks,
+                commons,
+                black_pegs_list,
+                black_white_pegs_list,
+            )
+        )
@@ -0,0 +1,85 @@
+############################################
+# My version of the famous Mastermind game #
+# class_solutions_estimator.py             #
+# Estimation of consistent patterns number #
+#           Piotr Loos (c) 2019-2021, 2023 #
+############################################
+
+from math import sqrt
+from random import randrange
+
+
+class SolutionsEstimator:
+    """ Estimates number of patterns consistent with previous guesses from uniformly sampled patterns (random
+    indexes decoded into pegs) with confidence interval - sampling stops as soon as requested precision is reached """
+
+    _z = 1.96  # (float) standard normal quantile of 95% confidence level
+    _batch_size = 1000  # (int) number of sampled patterns between precision checks
+    _max_samples = 100000  # (int) maximum number of sampled patterns (for very rare possible solutions)
+
+    confidence_level = 95  # (int) confidence level of the interval (in %)
+
+    def __init__(
+            self,
+            patterns_number,
+            relative_error,
+    ):
+        """ Initializes `SolutionsEstimator` class object for given number of all patterns and relative error
+        (half-width of the confidence interval, in % of the estimated number) """
+
+        self._patterns_number = patterns_number
+        self._relative_error = relative_error / 100
+
+    @property
+    def max_samples(self):
+        """ Returns maximum number of sampled patterns (e.g. for Progress) """
+
+        return self._max_samples
+
+    def estimate(self, check_index_func, progress=None):
+        """ Returns estimated number of possible solutions, bounds of its confidence interval and number of sampled
+        patterns - `check_index_func` checks if pattern with given index can be a solution (Progress object is
+        advanced after every batch if given) """
+
+        samples_number = 0
+        hits_number = 0
+
+        while True:
+
+            for _ in range(self._batch_size):
+                hits_number += bool(check_index_func(randrange(self._patterns_number)))
+            samples_number += self._batch_size
+
+            if progress is not None:
+                progress.advance(self._batch_size)
+
+            lower_bound, upper_bound = self._wilson_interval(hits_number, samples_number)
+            half_width = (upper_bound - lower_bound) / 2
+
+            if (
+                    (hits_number and half_width <= self._relative_error * hits_number / samples_number)
+                    or samples_number >= self._max_samples
+            ):
+                break
+
+        return (
+            self._patterns_number * hits_number / samples_number,
+            self._patterns_number * lower_bound,
+            self._patterns_number * upper_bound,
+            samples_number,
+        )
+
+    def _wilson_interval(self, hits_number, samples_number):
+        """ Returns Wilson score confidence interval of the fraction of possible solutions (it stays sensible even
+        for a few or no hits) """
+
+        fraction = hits_number / samples_number
+        z_squared = self._z * self._z
+
+        denominator = 1 + z_squared / samples_number
+        center = (fraction + z_squared / (2 * samples_number)) / denominator
+        half_width = self._z * sqrt(
+            fraction * (1 - fraction) / samples_number + z_squared / (4 * samples_number * samples_number)
+        ) / denominator
+
+        return max(0.0, center - half_width), min(1.0, center + half_width)
@@ -0,0 +1,76 @@
+############################################
+# My version of the famous Mastermind game #
+# class_solutions_history.py               #
+# History of removed possible solutions    #
+#           Piotr Loos (c) 2019-2021, 2023 #
+############################################
+
+from array import array
+from itertools import compress, count
+from operator import not_
+
+
+class SolutionsHistory:
+    """ Stack of deltas (patterns removed from possible solutions by every guess) for undoing turns - for arrays
+    of patterns indexes only removed indexes and their positions in the previous array are kept, so undoing a turn
+    costs time proportional to the number of removed patterns and all deltas together are never bigger than
+    the patterns space """
+
+    def __init__(
+            self,
+            typecode,
+    ):
+        """ Initializes `SolutionsHistory` class object for arrays of patterns indexes with given type code """
+
+        self._typecode = typecode  # (str) type code of patterns indexes arrays (positions fit in it too)
+        self._deltas_list = []  # (list) delta of every filtering guess (the last one on the top)
+
+    def __len__(self):
+        """ Returns number of saved deltas (number of undoable turns) """
+
+        return len(self._deltas_list)
+
+    def add_delta(self, delta):
+        """ Saves delta of the next guess (any object restoring previous possible solutions, e.g. bitset diff) """
+
+        self._deltas_list.append(delta)
+
+    def pop_delta(self):
+        """ Returns delta of the last guess and removes it from the stack """
+
+        return self._deltas_list.pop()
+
+    def start_delta(self):
+        """ Starts empty delta (positions and indexes of removed patterns) of the next guess filtering an array """
+
+        self._deltas_list.append((array(self._typecode), array(self._typecode)))
+
+    def filter_block(self, block, flags, possible_solutions_list):
+        """ Extends new possible solutions array with patterns of the block flagged as possible and saves the other
+        ones (with their positions in the previous array) in the last delta """
+
+        removed_positions, removed_indexes = self._deltas_list[-1]
+        start_position = len(possible_solutions_list) + len(removed_indexes)  # position of the block in previous array
+
+        removed_flags = list(map(not_, flags))
+        possible_solutions_list.extend(compress(block, flags))
+        removed_indexes.extend(compress(block, removed_flags))
+        removed_positions.extend(compress(count(start_position), removed_flags))
+
+    def restore(self, possible_solutions_list):
+        """ Returns possible solutions array from before the last guess (removed patterns are inserted back at their
+        positions between runs of kept ones) and removes its delta from the stack """
+
+        removed_positions, removed_indexes = self._deltas_list.pop()
+
+        previous_list = array(self._typecode)
+        kept_position = 0  # position of the next kept pattern in given array
+        for position, index in zip(removed_positions, removed_indexes):
+            if position > len(previous_list):  # copy the run of kept patterns before removed one at once
+                next_kept_position = kept_position + position - len(previous_list)
+                previous_list.extend(possible_solutions_list[kept_position:next_kept_position])
+                kept_position = next_kept_position
+            previous_list.append(index)
+        previous_list.extend(possible_solutions_list[kept_position:])
+
+        return previous_list
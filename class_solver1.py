@@ -5,7 +5,120 @@
 #           Piotr Loos (c) 2019-2021, 2023 #
 ############################################
 
+from class_colors_domain import ColorsDomain
+from class_patterns_enumerator import PatternsEnumerator
 from class_progress import Progress
+from class_solutions_counter import SolutionsCounter
+from class_solutions_estimator import SolutionsEstimator
+from array import array
+from multiprocessing import Pool
+from operator import eq
+import itertools
+
+
+# data of the current game shared with Solver1 worker processes (saved once per worker by `_init_worker`)
+_worker_data = {}
+
+
+def _init_worker(peg_colors, pegs_in_pattern, allow_duplicates, chunk_pegs, digits_matrix, patterns_list):
+    """ (Solver1 worker) Saves data of the current game in the worker process """
+
+    _worker_data["peg_colors"] = peg_colors
+    _worker_data["pegs_in_pattern"] = pegs_in_pattern
+    _worker_data["allow_duplicates"] = allow_duplicates
+    _worker_data["chunk_pegs"] = chunk_pegs
+    _worker_data["digits_matrix"] = digits_matrix
+    _worker_data["patterns_list"] = patterns_list  # only if patterns order cannot be described by the matrix
+
+    # patterns are numbered as permutations ranks if colors can't be duplicated
+    _worker_data["enumerator"] = PatternsEnumerator(peg_colors, pegs_in_pattern, allow_duplicates=allow_duplicates)
+    _worker_data["chunk_size"] = ([_worker_data["enumerator"].patterns_number] + _worker_data["enumerator"].weights)[
+        pegs_in_pattern - chunk_pegs
+    ]
+
+    if digits_matrix is not None and allow_duplicates:
+        # digits of the least significant pegs (the same for every chunk) are built once
+        _worker_data["low_digits_list"] = list(
+            itertools.product(*digits_matrix[pegs_in_pattern - chunk_pegs:])
+        )
+
+
+def _check_digits_for_guesses(digits, guesses):
+    """ (Solver1 worker) Checks if pattern given as digits tuple can be a solution based on all given guesses """
+
+    return all(
+        sum(map(eq, digits, guess_digits)) == black_pegs
+        and
+        sum(min(guess_counts[digit], digits.count(digit)) for digit in set(digits)) == black_white_pegs
+        for guess_digits, guess_counts, black_pegs, black_white_pegs in guesses
+    )
+
+
+def _scan_chunk(task):
+    """ (Solver1 worker) Returns scan position and index of the first possible solution in given chunk (or None) """
+
+    chunk_number, start_offset, guesses = task
+
+    peg_colors = _worker_data["peg_colors"]
+    pegs_in_pattern = _worker_data["pegs_in_pattern"]
+    chunk_size = _worker_data["chunk_size"]
+    chunk_start = chunk_number * chunk_size
+
+    if _worker_data["digits_matrix"] is not None and not _worker_data["allow_duplicates"]:
+
+        # the most significant pegs of this chunk are the prefix of its first pattern, the least significant ones
+        # are turned in the same order (skipping colors already used in the pattern)
+        enumerator = _worker_data["enumerator"]
+        digits_matrix = _worker_data["digits_matrix"]
+        prefix_pegs = pegs_in_pattern - _worker_data["chunk_pegs"]
+        high_digits = enumerator.unrank(chunk_start, digits_matrix)[:prefix_pegs]
+
+        low_digits_gen = (
+            low_digits
+            for low_digits in itertools.product(*digits_matrix[prefix_pegs:])
+            if len(set(high_digits + low_digits)) == pegs_in_pattern
+        )
+        for offset, low_digits in enumerate(itertools.islice(low_digits_gen, start_offset, None), start_offset):
+            digits = high_digits + low_digits
+            if _check_digits_for_guesses(digits, guesses):
+                return chunk_start + offset, enumerator.rank(digits)
+
+    elif _worker_data["digits_matrix"] is not None:
+
+        # rebuild the most significant pegs of this chunk from chunk number (like an odometer)
+        high_digits = []
+        for digits_list in reversed(_worker_data["digits_matrix"][:pegs_in_pattern - len(
+                _worker_data["low_digits_list"][0])]):
+            chunk_number, odo_value = divmod(chunk_number, peg_colors)
+            high_digits.insert(0, digits_list[odo_value])
+        high_digits = tuple(high_digits)
+
+        for offset in range(start_offset, chunk_size):
+            digits = high_digits + _worker_data["low_digits_list"][offset]
+            if _check_digits_for_guesses(digits, guesses):
+                index = 0
+                for digit in digits:
+                    index = index * peg_colors + digit
+                return chunk_start + offset, index
+
+    else:
+
+        patterns_list = _worker_data["patterns_list"]
+
+        for position in range(chunk_start + start_offset, min(chunk_start + chunk_size, len(patterns_list))):
+            index = patterns_list[position]
+            if _worker_data["allow_duplicates"]:
+                digits = []
+                for _ in range(pegs_in_pattern):
+                    index, digit = divmod(index, peg_colors)
+                    digits.append(digit)
+                digits = tuple(reversed(digits))
+            else:
+                digits = _worker_data["enumerator"].unrank(index)  # permutation rank
+            if _check_digits_for_guesses(digits, guesses):
+                return position, patterns_list[position]
+
+    return None
 
 
 class MastermindSolver1:
@@ -25,11 +138,45 @@ class MastermindSolver1:
 
         # prepare `all_patterns` list/generator for iteration
         if self._settings.pre_build_patterns:
-            self._all_patterns = self._settings.all_patterns_list  # get already built list reference for searching
+            self._all_patterns = self._settings.all_patterns_list  # get already built array reference for searching
         else:
             self._all_patterns = self._settings.all_patterns_gen()  # launch new generator (for every new game)
 
-        self._generator = self._solution_generator()
+        self._guesses_rows_list = []  # response table rows and responses codes for previous guesses (if enabled)
+
+        # guesses are checked in order of their rejection rate, so `all()` can stop as soon as possible
+        self._rejections_list = []  # number of patterns rejected by every guess (or size of rejected part)
+        self._guesses_order = []  # numbers of guesses sorted by rejection rate (the most rejecting first)
+        self._ordered_rows_list = []  # response table rows and codes in the same order (if enabled)
+
+        # number of guesses already checked for found possible solutions (guesses are only added during a game)
+        self._validated_dict = {}
+
+        # colors which can (or can't) be at every peg position - cheap prefilter before calculating responses
+        self._colors_domain = ColorsDomain(
+            self._settings.peg_colors,
+            self._settings.pegs_in_pattern,
+            self._settings.allow_duplicates,
+        )
+
+        # numbers of possible solutions are counted without scanning patterns (only if asked)
+        self._solutions_counter = SolutionsCounter(
+            self._settings.peg_colors,
+            self._settings.pegs_in_pattern,
+            self._settings.allow_duplicates,
+        )
+        self._possible_solutions_numbers = {}  # (dict) number of guesses -> number of possible solutions
+
+        # for the biggest boards numbers of possible solutions can be estimated from sampled patterns (only if asked)
+        self._solutions_estimator = SolutionsEstimator(
+            self._settings.patterns_number,
+            self._settings.solver1_estimate_relative_error,
+        )
+
+        # order of scanned patterns (None if patterns list was shuffled after build)
+        self._digits_matrix = self._settings.Pattern.digits_matrix
+
+        self._generator = self._get_generator()
         self._current_possible_solution = None
         self._2nd_possible_solution = None
 
@@ -37,18 +184,37 @@ class MastermindSolver1:
 
         self._progress_title = ""
 
+        self._scan_position = 0  # number of already scanned patterns (position to resume the scan from)
+
+        # scan position and found possible solutions after every turn - to undo turns without scanning from the start
+        self._turns_list = []
+
         # TODO: move it to be displayed after starting a game, not during Solver1 creation
         self.calculate_possible_solution()  # get 1st possible solution
 
     @property
     def possible_solutions_number(self):
-        """ (Solver1) Returns number of possible solutions """
+        """ (Solver1) Returns number of possible solutions (counted once for every number of guesses) """
+
+        guesses_number = len(self._guesses_list)
+
+        if not guesses_number:
+            return self._settings.patterns_number
+
+        if guesses_number not in self._possible_solutions_numbers:
+            self._update_guesses_order()
+            with Progress(
+                items_number=self._settings.pegs_in_pattern,
+                style=self._settings.style,
+                title="[Solver1] Counting possible solutions...",
+                timing=self._settings.progress_timing,
+            ) as progress:
+                self._possible_solutions_numbers[guesses_number] = self._solutions_counter.count(
+                    self._get_guesses_digits(),
+                    progress=progress,
+                )
 
-        raise RuntimeError(
-            f"{self._settings.style.error_on}"
-            f"It is impossible to calculate number of possible solutions in Solver1!"
-            f"{self._settings.style.error_off}"
-        )
+        return self._possible_solutions_numbers[guesses_number]
 
     @property
     def current_possible_solution(self):
@@ -56,6 +222,12 @@ class MastermindSolver1:
 
         return self._current_possible_solution
 
+    @property
+    def scan_position(self):
+        """ (Solver1) Returns position of the next pattern to be scanned (see `Pattern.unrank`) """
+
+        return self._scan_position
+
     @property
     def solving_time(self):
         """ (Solver1) Returns total solving time """
@@ -73,23 +245,113 @@ class MastermindSolver1:
         if possible_solution is None:
             return False
 
-        return self._check_possible_solution_for_guesses(possible_solution)
+        self._update_guesses_order()
 
-    def _check_possible_solution_for_guesses(self, possible_solution):
-        """ (Solver1) Checks if given possible solution can be a solution based on all previous guesses """
+        # found possible solution is already checked against guesses given before it was found
+        first_guess = self._validated_dict.get(possible_solution.index, 0)
+
+        if self._settings.response_table is not None:
+            is_possible = all(
+                row[possible_solution.index] == code
+                for row, code in self._guesses_rows_list[first_guess:]
+            )
+        else:
+            is_possible = self._check_possible_solution_for_guesses(possible_solution, first_guess)
+
+        if is_possible:
+            self._validated_dict[possible_solution.index] = len(self._guesses_list)
+        return is_possible
+
+    def _update_guesses_order(self):
+        """ (Solver1) Adds new guesses (and their response table rows) and sorts guesses by rejection rate """
+
+        if len(self._rejections_list) == len(self._guesses_list):
+            return  # no new guesses
+
+        for guess in self._guesses_list[len(self._rejections_list):]:
+            self._colors_domain.add_guess(
+                guess.pattern,
+                guess.response.black_pegs,
+                guess.response.black_white_pegs,
+            )
+            if self._settings.response_table is not None:
+                row = self._settings.response_table.row(guess.pattern.index)
+                self._guesses_rows_list.append(
+                    (
+                        row,
+                        guess.response.code,
+                    )
+                )
+                # exact rejection rate - number of patterns giving other response
+                self._rejections_list.append(
+                    self._settings.patterns_number - bytes(row).count(guess.response.code)
+                )
+            else:
+                # rejection rate is counted during scanning, new guess is checked first (it has not rejected yet)
+                self._rejections_list.append(max(self._rejections_list, default=0) + 1)
+
+        self._sort_guesses_order()
+
+    def _sort_guesses_order(self):
+        """ (Solver1) Sorts numbers of known guesses by rejection rate """
+
+        self._guesses_order = sorted(
+            range(len(self._rejections_list)),
+            key=lambda guess_number: -self._rejections_list[guess_number],
+        )
+        if self._settings.response_table is not None:
+            self._ordered_rows_list = [self._guesses_rows_list[guess_number] for guess_number in self._guesses_order]
 
-        # TODO: try to speed up these calculations
+    def _check_index_for_guesses(self, index):
+        """ (Solver1) Checks if pattern with given `index` can be a solution based on all previous guesses """
+
+        if self._settings.response_table is None:
+            return self._check_possible_solution_for_guesses(self._settings.Pattern.decode_index(index))
+
+        # just lookup in response table rows
         return all(
-            possible_solution.calculate_black_pegs(guess.pattern) == guess.response.black_pegs
-            and
-            possible_solution.calculate_black_white_pegs(guess.pattern) == guess.response.black_white_pegs
-            for guess in self._guesses_list
+            row[index] == code
+            for row, code in self._ordered_rows_list
         )
 
+    def _check_possible_solution_for_guesses(self, possible_solution, first_guess=0):
+        """ (Solver1) Checks if given possible solution can be a solution based on all previous guesses
+        (or only on guesses starting from `first_guess` number) """
+
+        if not self._colors_domain.check_pattern(possible_solution):
+            return False  # some color can't be at its position (no need to calculate responses)
+
+        for guess_number in self._guesses_order:
+            if guess_number < first_guess:
+                continue
+            guess = self._guesses_list[guess_number]
+            if (
+                possible_solution.calculate_black_pegs(guess.pattern) != guess.response.black_pegs
+                or
+                possible_solution.calculate_black_white_pegs(guess.pattern) != guess.response.black_white_pegs
+            ):
+                self._rejections_list[guess_number] += 1  # count rejections to check this guess earlier next time
+                return False
+
+        return True
+
     def calculate_possible_solution(self, *_):
         """ (Solver1) Calculates the next possible solution after current guess """
 
-        if self.check_possible_solution(self._current_possible_solution):
+        if self._settings.solver1_count_possible_solutions and self._guesses_list:
+            self._print_possible_solutions_number()
+        if self._settings.solver1_estimate_relative_error and self._guesses_list:
+            self._print_possible_solutions_estimate()
+
+        book_solution = self._get_book_solution()
+        if book_solution is not None:
+            print(
+                f"[Solver1] Opening book guess {book_solution} can be a {self._1st_string}solution. Taken."
+            )
+            self._current_possible_solution = book_solution
+            if self._2nd_possible_solution == book_solution:
+                self._2nd_possible_solution = None
+        elif self.check_possible_solution(self._current_possible_solution):
             print(
                 f"[Solver1] Previously found {self._1st_string}possible solution {self._current_possible_solution} "
                 f"still can be a {self._1st_string}solution. Not changed."
@@ -113,6 +375,7 @@ class MastermindSolver1:
                 )
                 if self._current_possible_solution is None:  # no possible solution
                     self._2nd_possible_solution = None  # no 2nd possible solution also
+                    self._save_turn()
                     return None
 
         if self._settings.solver1_calc_2nd_solution:
@@ -125,26 +388,175 @@ class MastermindSolver1:
                 self._2nd_possible_solution = self._get_next(
                     f"[Solver1] Scanning all patterns for 2nd possible solution..."
                 )
+                if self._2nd_possible_solution == self._current_possible_solution:  # opening book guess was found
+                    self._2nd_possible_solution = self._get_next(
+                        f"[Solver1] Scanning all patterns for 2nd possible solution..."
+                    )
                 if self._2nd_possible_solution is None:  # no 2nd possible solution -> only one solution!
                     print(
                         f"[Solver1] Now I know that {self._current_possible_solution} is the only possible solution!"
                     )
 
+        self._save_turn()
+
         print()
         return self._current_possible_solution
 
+    def _save_turn(self):
+        """ (Solver1) Saves scan position and found possible solutions after current turn """
+
+        self._turns_list.append((
+            self._scan_position,
+            self._current_possible_solution,
+            self._2nd_possible_solution,
+        ))
+
+    def rewind(self, guesses_number):
+        """ (Solver1) Undoes turns after given number of guesses (they are already removed from the guesses list) """
+
+        # forget later guesses (their rejections counted for earlier guesses only change the order of checks)
+        del self._rejections_list[guesses_number:]
+        del self._guesses_rows_list[guesses_number:]
+        self._sort_guesses_order()
+        self._colors_domain.reset(self._guesses_list[:len(self._rejections_list)])
+
+        for number in [number for number in self._possible_solutions_numbers if number > guesses_number]:
+            del self._possible_solutions_numbers[number]
+        self._validated_dict = {
+            index: min(validated_number, guesses_number)
+            for index, validated_number in self._validated_dict.items()
+        }
+
+        if len(self._turns_list) > guesses_number + 1:  # there are no saved turns of guesses which were not calculated
+            del self._turns_list[guesses_number + 1:]
+            self._scan_position, self._current_possible_solution, self._2nd_possible_solution = self._turns_list[-1]
+
+            # patterns before the scan position of that turn are already checked against its guesses - continue from it
+            self._generator.close()
+            if not self._settings.pre_build_patterns:
+                # launch new generator turning the pegs in the same order (big jump to the scan position)
+                self._all_patterns = self._settings.all_patterns_gen(self._digits_matrix, self._scan_position)
+            self._generator = self._get_generator(self._scan_position)
+
+    def release(self):
+        """ (Solver1) Releases memory of the ended game (stops the scan - also worker processes if used) """
+
+        self._generator.close()
+        self._turns_list = []
+        self._validated_dict = {}
+
+    def _print_possible_solutions_number(self):
+        """ (Solver1) Prints number of possible solutions after current guess (and before it) """
+
+        patterns_number = self.possible_solutions_number
+        patterns_old_number = self._possible_solutions_numbers.get(
+            len(self._guesses_list) - 1,
+            self._settings.patterns_number,  # before the first guess (or not counted before)
+        )
+
+        print(
+            f"[Solver1] Number of possible solutions is now "
+            f"{self._settings.style.number_on}"
+            f"{patterns_number:,}"
+            f"{self._settings.style.number_off}"
+            f" of "
+            f"{self._settings.style.number_on}"
+            f"{patterns_old_number:,}"
+            f"{self._settings.style.number_off}"
+            f" (rejected "
+            f"{self._settings.style.number_on}"
+            f"{100 * (1 - patterns_number / patterns_old_number):.2f}%"
+            f"{self._settings.style.number_off}"
+            f" of patterns)."
+        )
+
+    def _print_possible_solutions_estimate(self):
+        """ (Solver1) Prints estimated number of possible solutions (with confidence interval) after current guess """
+
+        self._update_guesses_order()
+
+        with Progress(
+            items_number=self._solutions_estimator.max_samples,
+            style=self._settings.style,
+            title="[Solver1] Sampling patterns to estimate number of possible solutions...",
+            timing=self._settings.progress_timing,
+        ) as progress:
+            estimate, lower_bound, upper_bound, samples_number = self._solutions_estimator.estimate(
+                self._check_index_for_guesses,  # random patterns indexes are decoded (or looked up in response table)
+                progress=progress,
+            )
+
+        print(
+            f"[Solver1] Estimated number of possible solutions is "
+            f"{self._settings.style.number_on}"
+            f"{estimate:,.0f}"
+            f"{self._settings.style.number_off}"
+            f" ({self._solutions_estimator.confidence_level}% confidence interval: "
+            f"{self._settings.style.number_on}"
+            f"{lower_bound:,.0f}"
+            f"{self._settings.style.number_off}"
+            f" - "
+            f"{self._settings.style.number_on}"
+            f"{upper_bound:,.0f}"
+            f"{self._settings.style.number_off}"
+            f", from "
+            f"{self._settings.style.number_on}"
+            f"{samples_number:,}"
+            f"{self._settings.style.number_off}"
+            f" sampled patterns)."
+        )
+
+    def _get_book_solution(self):
+        """ (Solver1) Returns the opening book guess if it is a new possible solution (None if out of the book) """
+
+        if self._settings.opening_book is None:
+            return None
+
+        book_index = self._settings.opening_book.guess_index(self._guesses_list)
+        if book_index is None:
+            return None
+
+        book_solution = self._settings.Pattern.decode_index(book_index)
+        if book_solution == self._current_possible_solution or not self.check_possible_solution(book_solution):
+            return None
+        return book_solution
+
+    def _get_generator(self, start_position=0):
+        """ (Solver1) Returns new generator of possible solutions scanning patterns from given position """
+
+        if self._settings.solver1_processes > 1:
+            return self._parallel_solution_generator(start_position)
+        elif self._settings.solver1_prune_patterns and self._digits_matrix is not None:
+            return self._pruned_solution_generator(start_position)
+        else:
+            return self._solution_generator(start_position)
+
     def _get_next(self, progress_title):
         """ (Solver1) Gets the next possible solution and handles exception from generator """
 
         self._progress_title = progress_title
 
+        self._update_guesses_order()
+        if self._settings.response_table is None:
+            # resort guesses by rejections counted so far
+            self._guesses_order.sort(key=lambda guess_number: -self._rejections_list[guess_number])
+
         try:
-            return next(self._generator)
+            possible_solution = next(self._generator)
         except StopIteration:
             return None
 
-    def _solution_generator(self):
-        """ (Solver1) Yields next possible solution based on all previous guesses """
+        # generator checks patterns against all guesses given so far
+        self._validated_dict[possible_solution.index] = len(self._guesses_list)
+        return possible_solution
+
+    def _solution_generator(self, start_position=0):
+        """ (Solver1) Yields next possible solution based on all previous guesses (scanning from `start_position`) """
+
+        # patterns generator is already launched from `start_position` (see `rewind`), the list is sliced lazily
+        all_patterns = self._all_patterns
+        if start_position and self._settings.pre_build_patterns:
+            all_patterns = itertools.islice(all_patterns, start_position, None)
 
         with Progress(
             items_number=self._settings.patterns_number,
@@ -154,69 +566,378 @@ class MastermindSolver1:
             auto_start_stop=False,
         ) as progress:
 
-            index = 0
+            index = start_position
+            progress.set_index(index)
             progress.start(
                 title=self._progress_title,
             )
 
-            for index, pattern in enumerate(self._all_patterns, 1):
+            for block in progress.blocks(all_patterns):  # progress is checked once for every block
+
+                for pattern_index in block:
+
+                    index += 1
+                    if self._check_index_for_guesses(pattern_index):
+
+                        pattern = self._settings.Pattern.decode_index(pattern_index)  # decode only found pattern
+                        self._scan_position = index
+
+                        progress.set_index(index)
+                        progress.stop(
+                            finish=False,
+                            summary=self._found_summary(pattern, index),
+                        )
+                        yield pattern
+                        progress.start(
+                            title=self._progress_title,
+                        )
+
+            # ensure `index` reached number of all patterns
+            assert index == self._settings.patterns_number, (
+                f"{self._settings.style.error_on}"
+                f"[Solver1] Incorrect pattern index value!"
+                f"{self._settings.style.error_off}"
+            )
+
+            # after yield the last pattern
+            self._scan_position = index
+            progress.stop(
+                finish=True,
+                summary=self._finished_summary(index),
+            )
+
+            # no possible solution
+
+    def _get_guesses_digits(self):
+        """ (Solver1) Returns previous guesses (sorted by rejection rate) as tuples of digits (-1 = blank peg),
+        colors counts and response """
+
+        guesses = []
+        for guess_number in self._guesses_order:  # sorted by rejection rate
+            guess = self._guesses_list[guess_number]
+            guess_digits = tuple(peg - 1 for peg in guess.pattern)
+            guesses.append((
+                guess_digits,
+                tuple(guess_digits.count(digit) for digit in range(self._settings.peg_colors)),
+                guess.response.black_pegs,
+                guess.response.black_white_pegs,
+            ))
+        return guesses
+
+    def _pruned_solution_generator(self, start_position=0):
+        """ (Solver1) Yields next possible solution based on all previous guesses turning the odometer
+        and skipping whole subtrees of patterns, which prefixes cannot satisfy some guess (scanning from
+        `start_position`) """
+
+        peg_colors = self._settings.peg_colors
+        pegs_in_pattern = self._settings.pegs_in_pattern
+        allow_duplicates = self._settings.allow_duplicates
+        digits_matrix = self._digits_matrix
+
+        # number of patterns skipped at once if the prefix ending at given peg is infeasible
+        # (it is also the weight of every next color of this peg in pattern index)
+        subtrees_sizes = self._settings.patterns_enumerator.weights
+
+        # colors which can be at every peg position (changed in place after every guess, indexed by digit + 1)
+        states_matrix = self._colors_domain.states_matrix
+
+        with Progress(
+            items_number=self._settings.patterns_number,
+            style=self._settings.style,
+            timing=self._settings.progress_timing,
+            update_time_func=self.update_solving_time,
+            auto_start_stop=False,
+        ) as progress:
+
+            # odometer values (positions in digits lists) of the pegs, prefix is made of pegs before `peg_index`
+            odometer = [0] * pegs_in_pattern
+            peg_index = 0
+            prefix_indexes = [0] * (pegs_in_pattern + 1)  # pattern index of the prefix ending before every peg
+            prefix_counts = [0] * peg_colors  # colors counts of current prefix
+
+            # numbers of black pegs and common colors of the prefix ending before every peg (for every guess)
+            guesses = []
+            blacks_matrix = [[]] * (pegs_in_pattern + 1)
+            commons_matrix = [[]] * (pegs_in_pattern + 1)
+
+            position = start_position  # number of already scanned (checked or skipped) patterns
+
+            if start_position >= self._settings.patterns_number:
+                odometer[0] = peg_colors  # all patterns are scanned already
+            elif start_position:
+                # turn the odometer to the pattern at `start_position` and continue from its last peg
+                start_digits = self._settings.patterns_enumerator.unrank(start_position, digits_matrix)
+                for prefix_peg_index, digit in enumerate(start_digits):
+                    odometer[prefix_peg_index] = digits_matrix[prefix_peg_index].index(digit)
+                peg_index = pegs_in_pattern - 1
+                for prefix_peg_index, digit in enumerate(start_digits[:peg_index]):
+                    prefix_indexes[prefix_peg_index + 1] = prefix_indexes[prefix_peg_index] + subtrees_sizes[
+                        prefix_peg_index
+                    ] * (digit if allow_duplicates else digit - sum(prefix_counts[:digit]))
+                    prefix_counts[digit] += 1
+                guesses = self._get_guesses_digits()
+                blacks_matrix[:pegs_in_pattern], commons_matrix[:pegs_in_pattern] = self._get_prefixes_states(
+                    guesses,
+                    start_digits[:peg_index],
+                )
 
-                if progress.item(  # wrapped to check the progress
-                        self._check_possible_solution_for_guesses(pattern)
+            progress.set_index(position)
+            progress.start(
+                title=self._progress_title,
+            )
+
+            while True:
+
+                odo_value = odometer[peg_index]
+
+                if odo_value == peg_colors:  # all colors of current peg are checked -> need to carry one peg on the left
+                    if not peg_index:
+                        break  # all patterns are scanned
+                    progress.set_index(position)  # once for every finished subtree (not for every pattern)
+                    odometer[peg_index] = 0
+                    peg_index -= 1
+                    prefix_counts[digits_matrix[peg_index][odometer[peg_index]]] -= 1
+                    odometer[peg_index] += 1
+                    continue
+
+                digit = digits_matrix[peg_index][odo_value]
+
+                if prefix_counts[digit] and not allow_duplicates:
+                    odometer[peg_index] += 1  # color is already used in the prefix - there is no such subtree
+                    continue
+
+                if not states_matrix[peg_index][digit + 1]:
+                    position += subtrees_sizes[peg_index]  # color can't be at this position - skip the whole subtree
+                    odometer[peg_index] += 1
+                    continue
+
+                remaining_pegs = pegs_in_pattern - 1 - peg_index
+                blacks_list = [
+                    black_pegs + (guess[0][peg_index] == digit)
+                    for black_pegs, guess in zip(blacks_matrix[peg_index], guesses)
+                ]
+                commons_list = [
+                    common_colors + (prefix_counts[digit] < guess[1][digit])
+                    for common_colors, guess in zip(commons_matrix[peg_index], guesses)
+                ]
+
+                # the response of every guess must still be reachable by the remaining pegs
+                if not all(
+                    black_pegs <= guess[2] <= black_pegs + remaining_pegs
+                    and
+                    common_colors <= guess[3] <= common_colors + remaining_pegs
+                    for black_pegs, common_colors, guess in zip(blacks_list, commons_list, guesses)
                 ):
+                    position += subtrees_sizes[peg_index]  # skip the whole subtree at once
+                    odometer[peg_index] += 1
+                    continue
+
+                # without duplicates only colors not used in the prefix are counted in pattern index
+                prefix_indexes[peg_index + 1] = prefix_indexes[peg_index] + subtrees_sizes[peg_index] * (
+                    digit if allow_duplicates else digit - sum(prefix_counts[:digit])
+                )
+
+                if remaining_pegs:  # go to the next peg
+                    blacks_matrix[peg_index + 1] = blacks_list
+                    commons_matrix[peg_index + 1] = commons_list
+                    prefix_counts[digit] += 1
+                    peg_index += 1
+                    continue
+
+                # full pattern satisfying all guesses is found
+                position += 1
+                odometer[peg_index] += 1
+                self._scan_position = position
+
+                progress.set_index(position)
+
+                pattern = self._settings.Pattern.decode_index(prefix_indexes[-1])  # decode only found pattern
+
+                progress.stop(
+                    finish=False,
+                    summary=self._found_summary(pattern, position),
+                )
+                yield pattern
+                progress.start(
+                    title=self._progress_title,
+                )
+
+                # guesses could be added - recalculate states of the current prefix
+                guesses = self._get_guesses_digits()
+                blacks_matrix[:peg_index + 1], commons_matrix[:peg_index + 1] = self._get_prefixes_states(
+                    guesses,
+                    [digits_list[odo_value] for digits_list, odo_value in zip(digits_matrix, odometer[:peg_index])],
+                )
+
+            # after yield the last pattern
+            self._scan_position = self._settings.patterns_number
+            progress.stop(
+                finish=True,
+                summary=self._finished_summary(self._settings.patterns_number),
+            )
+
+            # no possible solution
+
+    def _get_prefixes_states(self, guesses, prefix_digits):
+        """ (Solver1) Returns numbers of black pegs and common colors (for every guess) of every prefix of given
+        digits (starting from the empty prefix) """
+
+        blacks_matrix = [[0] * len(guesses)]
+        commons_matrix = [[0] * len(guesses)]
+        counts = [0] * self._settings.peg_colors
+
+        for peg_index, digit in enumerate(prefix_digits):
+            blacks_matrix.append([
+                black_pegs + (guess[0][peg_index] == digit)
+                for black_pegs, guess in zip(blacks_matrix[-1], guesses)
+            ])
+            commons_matrix.append([
+                common_colors + (counts[digit] < guess[1][digit])
+                for common_colors, guess in zip(commons_matrix[-1], guesses)
+            ])
+            counts[digit] += 1
+
+        return blacks_matrix, commons_matrix
+
+    def _parallel_solution_generator(self, start_position=0):
+        """ (Solver1) Yields next possible solution based on all previous guesses (scanning in worker processes
+        from `start_position`) """
+
+        peg_colors = self._settings.peg_colors
+        pegs_in_pattern = self._settings.pegs_in_pattern
+        patterns_number = self._settings.patterns_number
+
+        # number of patterns with the same prefix of given length (permutations if colors can't be duplicated)
+        subtrees_sizes = [patterns_number] + self._settings.patterns_enumerator.weights
+
+        # one chunk covers all values of the least significant pegs (but not too many patterns)
+        chunk_pegs = 1
+        while chunk_pegs < pegs_in_pattern and subtrees_sizes[pegs_in_pattern - chunk_pegs - 1] <= 2 ** 16:
+            chunk_pegs += 1
+        chunk_size = subtrees_sizes[pegs_in_pattern - chunk_pegs]
+        chunks_number = -(-patterns_number // chunk_size)  # ceil division
+        batch_size = 2 * self._settings.solver1_processes  # number of chunks scanned at once
+
+        with Progress(
+            items_number=chunks_number,
+            style=self._settings.style,
+            timing=self._settings.progress_timing,
+            update_time_func=self.update_solving_time,
+            auto_start_stop=False,
+        ) as progress, Pool(
+            processes=self._settings.solver1_processes,
+            initializer=_init_worker,
+            initargs=(
+                peg_colors,
+                pegs_in_pattern,
+                self._settings.allow_duplicates,
+                chunk_pegs,
+                self._digits_matrix,
+                # workers rebuild patterns from chunk numbers, the list is needed only if it was shuffled after build
+                None if self._digits_matrix is not None else array(
+                    self._settings.Pattern.index_typecode,
+                    self._all_patterns.tobytes(),  # copy (also memory-mapped cache) to be sent to workers
+                ),
+            ),
+        ) as pool:
+
+            position = start_position  # scan position of the next pattern to be checked
+            scanned_chunks = min(position // chunk_size, chunks_number)  # number of fully scanned chunks
+            progress.set_index(scanned_chunks)
+            progress.start(
+                title=self._progress_title,
+            )
+
+            while position < patterns_number:
+
+                # guesses can change between yields, so they are sent with every task (as digits and colors counts)
+                guesses = self._get_guesses_digits()
+
+                chunk_number, start_offset = divmod(position, chunk_size)
+                tasks = [(chunk_number, start_offset, guesses)] + [
+                    (next_chunk_number, 0, guesses)
+                    for next_chunk_number in range(chunk_number + 1, min(chunk_number + batch_size, chunks_number))
+                ]
+
+                # results are ordered by chunks, so the first found is the lowest possible solution
+                found = next(
+                    (result for result in pool.map(_scan_chunk, tasks) if result is not None),
+                    None,
+                )
+
+                if found is None:
+                    position = (chunk_number + len(tasks)) * chunk_size
+                else:
+                    position = found[0] + 1
+                self._scan_position = min(position, patterns_number)
+
+                for _ in range(scanned_chunks, min(position // chunk_size, chunks_number)):
+                    progress.item()  # count every fully scanned chunk
+                scanned_chunks = max(scanned_chunks, position // chunk_size)
+
+                if found is not None:
+
+                    pattern = self._settings.Pattern.decode_index(found[1])  # decode only found pattern
 
                     progress.stop(
                         finish=False,
-                        summary=f"{self._settings.style.progress_summary_on}"
-                                f"Found!"
-                                f"{self._settings.style.progress_summary_off}"
-                                f" It is {pattern}.\n"
-                                f"[Solver1] It's index is "
-                                f"{self._settings.style.number_on}"
-                                f"{index:,}"
-                                f"{self._settings.style.number_off}"
-                                f" of "
-                                f"{self._settings.style.number_on}"
-                                f"{self._settings.patterns_number:,}"
-                                f"{self._settings.style.number_off}"
-                                f" overall ("
-                                f"{self._settings.style.number_on}"
-                                f"{100 * index / self._settings.patterns_number:.2f}%"
-                                f"{self._settings.style.number_off}"
-                                f")."
+                        summary=self._found_summary(pattern, position),
                     )
                     yield pattern
                     progress.start(
                         title=self._progress_title,
                     )
 
-            # ensure `index` reached number of all patterns
-            assert index == self._settings.patterns_number, (
-                f"{self._settings.style.error_on}"
-                f"[Solver1] Incorrect pattern index value!"
-                f"{self._settings.style.error_off}"
-            )
-
             # after yield the last pattern
             progress.stop(
                 finish=True,
-                summary=f"{self._settings.style.progress_summary_on}"
-                        f"Finished."
-                        f"{self._settings.style.progress_summary_off}"
-                        f"\n"
-                        f"[Solver1] Reached index "
-                        f"{self._settings.style.number_on}"
-                        f"{index:,}"
-                        f"{self._settings.style.number_off}"
-                        f" of "
-                        f"{self._settings.style.number_on}"
-                        f"{self._settings.patterns_number:,}"
-                        f"{self._settings.style.number_off}"
-                        f" overall ("
-                        f"{self._settings.style.number_on}"
-                        f"{100 * index / self._settings.patterns_number:.2f}%"
-                        f"{self._settings.style.number_off}"
-                        f")."
+                summary=self._finished_summary(patterns_number),
             )
 
             # no possible solution
+
+    def _found_summary(self, pattern, index):
+        """ (Solver1) Returns Progress summary after finding possible solution at given scan `index` """
+
+        return (
+            f"{self._settings.style.progress_summary_on}"
+            f"Found!"
+            f"{self._settings.style.progress_summary_off}"
+            f" It is {pattern}.\n"
+            f"[Solver1] It's index is "
+            f"{self._settings.style.number_on}"
+            f"{index:,}"
+            f"{self._settings.style.number_off}"
+            f" of "
+            f"{self._settings.style.number_on}"
+            f"{self._settings.patterns_number:,}"
+            f"{self._settings.style.number_off}"
+            f" overall ("
+            f"{self._settings.style.number_on}"
+            f"{100 * index / self._settings.patterns_number:.2f}%"
+            f"{self._settings.style.number_off}"
+            f")."
+        )
+
+    def _finished_summary(self, index):
+        """ (Solver1) Returns Progress summary after scanning all patterns """
+
+        return (
+            f"{self._settings.style.progress_summary_on}"
+            f"Finished."
+            f"{self._settings.style.progress_summary_off}"
+            f"\n"
+            f"[Solver1] Reached index "
+            f"{self._settings.style.number_on}"
+            f"{index:,}"
+            f"{self._settings.style.number_off}"
+            f" of "
+            f"{self._settings.style.number_on}"
+            f"{self._settings.patterns_number:,}"
+            f"{self._settings.style.number_off}"
+            f" overall ("
+            f"{self._settings.style.number_on}"
+            f"{100 * index / self._settings.patterns_number:.2f}%"
+            f"{self._settings.style.number_off}"
+            f")."
+        )
@@ -5,7 +5,10 @@
 #           Piotr Loos (c) 2019-2021, 2023 #
 ############################################
 
+from class_colors_domain import ColorsDomain
 from class_progress import Progress
+from class_solutions_history import SolutionsHistory
+from array import array
 from random import randrange
 
 
@@ -15,20 +18,41 @@ class MastermindSolver2:
     def __init__(
             self,
             settings,
-            *_,
+            guesses_list,
     ):
         """ (Solver2) Initializes `MastermindSolver2` class object """
 
         self._settings = settings
+        self._guesses_list = guesses_list
 
         self._solving_time = 0
 
-        # prepare `possible_solutions_list` to be filtered
-        if self._settings.pre_build_patterns:
-            # get copy of the already built patterns list for filtering inplace
-            self._possible_solutions_list = self._settings.all_patterns_list.copy()
+        # colors which can (or can't) be at every peg position - cheap prefilter before calculating responses
+        self._colors_domain = ColorsDomain(
+            settings.peg_colors,
+            settings.pegs_in_pattern,
+            settings.allow_duplicates,
+        )
+
+        # patterns removed by every guess (only deltas are kept) - to undo turns without building the list again
+        self._history = SolutionsHistory(settings.Pattern.index_typecode)
+
+        self._prepare_possible_solutions()
+
+        self._get_solution()
+        self._get_book_solution()
+
+    def _prepare_possible_solutions(self):
+        """ (Solver2) Prepares `possible_solutions_list` to be filtered """
+
+        # `possible_solutions_list` is a compact array of patterns indexes
+        patterns_universe = self._settings.patterns_universe
+        if patterns_universe is not None:
+            # take the reference of patterns array shared by all games (or memory-mapped cache) - it is never changed,
+            # the first filtering makes a new array for this game (copy-on-write)
+            self._possible_solutions_list = patterns_universe
         else:
-            # build new list from generator (for every new game)
+            # build new array from generator (for every new game - colors are shuffled in every game)
             with Progress(
                 items_number=self._settings.patterns_number,
                 style=self._settings.style,
@@ -36,12 +60,11 @@ class MastermindSolver2:
                 timing=self._settings.progress_timing,
             ) as progress:
 
-                self._possible_solutions_list = [
-                    progress.item(pattern)  # wrapped to check the progress
-                    for pattern in self._settings.all_patterns_gen()  # launch new generator (for every new game)
-                ]
-
-        self._get_solution()
+                self._possible_solutions_list = array(self._settings.Pattern.index_typecode)
+                for block in progress.blocks(
+                        self._settings.all_patterns_gen(),  # launch new generator (for every new game)
+                ):
+                    self._possible_solutions_list.extend(block)  # progress is checked once for every block
 
     def _get_solution(self):
         """ (Solver2) Gets and saves one possible solution from the list """
@@ -53,10 +76,29 @@ class MastermindSolver2:
                 index = randrange(self._possible_solutions_number)
             else:
                 index = 0
-            self._current_possible_solution = self._possible_solutions_list[index]
+            self._current_possible_solution = self._get_pattern(index)
         else:
             self._current_possible_solution = None
 
+    def _get_book_solution(self):
+        """ (Solver2) Replaces current possible solution with the opening book guess if it is possible solution too """
+
+        if self._settings.opening_book is None or self._current_possible_solution is None:
+            return
+
+        book_index = self._settings.opening_book.guess_index(self._guesses_list)
+        if book_index is None:
+            return
+
+        book_solution = self._settings.Pattern.decode_index(book_index)
+        if self.check_possible_solution(book_solution):
+            self._current_possible_solution = book_solution
+
+    def _get_pattern(self, position):
+        """ (Solver2) Returns Pattern object decoded from given `position` of the possible solutions list """
+
+        return self._settings.Pattern.decode_index(self._possible_solutions_list[position])
+
     @property
     def possible_solutions_number(self):
         """ (Solver2) Returns number of possible solutions """
@@ -83,34 +125,22 @@ class MastermindSolver2:
     def check_possible_solution(self, possible_solution):
         """ (Solver2) Checks if given possible solution can be a solution based on all previous guesses """
 
-        return possible_solution in self._possible_solutions_list
+        return possible_solution.index in self._possible_solutions_list
 
     def calculate_possible_solution(self, guess, *_):
         """ (Solver2) Calculates the next possible solution after current guess """
 
         patterns_old_number = self._possible_solutions_number
 
-        with Progress(
-            items_number=patterns_old_number,
-            style=self._settings.style,
-            title="[Solver2] Filtering patterns list...",
-            timing=self._settings.progress_timing,
-            update_time_func=self.update_solving_time,
-        ) as progress:
-
-            # filter the patterns list
-            # TODO: try to speed up these calculations
-            self._possible_solutions_list = [
-                possible_solution
-                for possible_solution in self._possible_solutions_list
-                if progress.item(  # wrapped to check the progress
-                    guess.pattern.calculate_black_pegs(possible_solution) == guess.response.black_pegs
-                    and
-                    guess.pattern.calculate_black_white_pegs(possible_solution) == guess.response.black_white_pegs
-                )
-            ]
+        self._colors_domain.add_guess(
+            guess.pattern,
+            guess.response.black_pegs,
+            guess.response.black_white_pegs,
+        )
+        self._filter_possible_solutions(guess)
 
         self._get_solution()
+        self._get_book_solution()
 
         print(
             f"[Solver2] Number of possible solutions is now "
@@ -141,8 +171,79 @@ class MastermindSolver2:
                     f"{self._settings.style.number_off}"
                     f" possible solutions here is a list of them:"
                 )
-                for pattern in self._possible_solutions_list:
-                    print(pattern)
+                for position in range(self._possible_solutions_number):
+                    print(self._get_pattern(position))
 
         print()
         return self._current_possible_solution
+
+    def _filter_possible_solutions(self, guess):
+        """ (Solver2) Filters the possible solutions list leaving only patterns giving the same response """
+
+        with Progress(
+            items_number=self._possible_solutions_number,
+            style=self._settings.style,
+            title="[Solver2] Filtering patterns list...",
+            timing=self._settings.progress_timing,
+            update_time_func=self.update_solving_time,
+        ) as progress:
+
+            if self._settings.response_table is not None:
+
+                row = self._settings.response_table.row(guess.pattern.index)
+                code = guess.response.code
+
+                # filter the patterns array (just lookup in response table row) block by block
+                possible_solutions_list = array(self._settings.Pattern.index_typecode)
+                self._history.start_delta()
+                for block in progress.blocks(self._possible_solutions_list):
+                    self._history.filter_block(
+                        block,
+                        [row[index] == code for index in block],
+                        possible_solutions_list,
+                    )
+                self._possible_solutions_list = possible_solutions_list
+
+            else:
+
+                decode_index = self._settings.Pattern.decode_index
+                check_pattern = self._colors_domain.check_pattern
+
+                # filter the patterns array (patterns are decoded only for the comparison) block by block - patterns
+                # with a color which can't be at its position are rejected before calculating the response
+                # TODO: try to speed up these calculations
+                possible_solutions_list = array(self._settings.Pattern.index_typecode)
+                self._history.start_delta()
+                for block in progress.blocks(self._possible_solutions_list):
+                    self._history.filter_block(
+                        block,
+                        [
+                            check_pattern(pattern) and guess.pattern.calculate_response(pattern) == guess.response
+                            for pattern in map(decode_index, block)
+                        ],
+                        possible_solutions_list,
+                    )
+                self._possible_solutions_list = possible_solutions_list
+
+    def rewind(self, guesses_number):
+        """ (Solver2) Undoes turns after given number of guesses (they are already removed from the guesses list) """
+
+        # restore removed patterns turn by turn (there are no deltas of guesses which were not filtered)
+        while len(self._history) > guesses_number:
+            self._restore_possible_solutions()
+
+        self._colors_domain.reset(self._guesses_list)
+
+        self._get_solution()
+        self._get_book_solution()
+
+    def _restore_possible_solutions(self):
+        """ (Solver2) Restores the possible solutions list from before the last filtering guess """
+
+        self._possible_solutions_list = self._history.restore(self._possible_solutions_list)
+
+    def release(self):
+        """ (Solver2) Releases memory of the ended game (patterns shared by all games are kept in Settings) """
+
+        self._possible_solutions_list = None
+        self._history = None
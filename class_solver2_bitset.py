@@ -0,0 +1,171 @@
+############################################
+# My version of the famous Mastermind game #
+# class_solver2_bitset.py                  #
+# Mastermind Solver2 (bitset backend)      #
+#           Piotr Loos (c) 2019-2021, 2023 #
+############################################
+
+from class_progress import Progress
+from class_solver2 import MastermindSolver2
+from array import array
+from operator import itemgetter
+from random import randrange
+
+
+class MastermindSolver2Bitset(MastermindSolver2):
+    """ Contains Mastermind Solver2 (patterns list filtering Solver) with possible solutions kept as a bitset """
+
+    # (dict) response class masks cached for (peg_colors, pegs_in_pattern, allow_duplicates, guess index,
+    # response code)
+    # only for patterns in natural order (the same masks in every game)
+    _masks_dict = {}
+    _masks_limit = 64  # (int) maximum number of cached masks, the oldest are removed first
+
+    def _prepare_possible_solutions(self):
+        """ (Solver2) Prepares bitset of possible solutions (bit number is the position in the patterns list) """
+
+        super()._prepare_possible_solutions()
+
+        # patterns list is kept only to translate bits positions into patterns indexes (not filtered anymore)
+        self._patterns_list = self._possible_solutions_list
+        self._possible_solutions_list = None
+
+        patterns_number = self._settings.patterns_number
+
+        # in natural order (not shuffled) bit position is just pattern index
+        self._natural_order = self._settings.Pattern.digits_matrix == [
+            list(range(self._settings.peg_colors))
+        ] * self._settings.pegs_in_pattern
+
+        if self._natural_order:
+            self._positions_list = None
+        else:
+            # inverted patterns list (pattern index -> position) for membership checks
+            self._positions_list = array(self._settings.Pattern.index_typecode, [0]) * len(self._patterns_list)
+            for position, index in enumerate(self._patterns_list):
+                self._positions_list[index] = position
+
+        self._bits = (1 << patterns_number) - 1  # (int) all patterns are possible solutions at the beginning
+        self._bits_bytes = None  # (bytes) little-endian copy of the bitset for O(1) membership (made on demand)
+        self._bits_string = None  # (str) bits as chars from the bit 0 for finding set bits (made on demand)
+
+    def _get_solution(self):
+        """ (Solver2) Gets and saves one possible solution from the bitset """
+
+        self._possible_solutions_number = bin(self._bits).count("1")  # popcount (`int.bit_count` needs Python 3.10)
+
+        if self._possible_solutions_number:
+            if self._settings.solver2_take_random_pattern:
+                index = randrange(self._possible_solutions_number)
+            else:
+                index = 0
+            self._current_possible_solution = self._get_pattern(index)
+        else:
+            self._current_possible_solution = None
+
+    def _get_bits_string(self):
+        """ (Solver2) Returns bitset as a string of '0' and '1' chars starting from the bit 0 """
+
+        if self._bits_string is None:
+            self._bits_string = format(self._bits, f"0{self._settings.patterns_number}b")[::-1]
+        return self._bits_string
+
+    def _get_pattern(self, position):
+        """ (Solver2) Returns Pattern object decoded from given `position` of the possible solutions
+        (`position`-th set bit of the bitset) """
+
+        bits_string = self._get_bits_string()
+
+        # skip whole blocks of bits counting set bits in them (without finding them one by one)
+        block_start = 0
+        block_count = bits_string.count('1', 0, 4096)
+        while block_count <= position:
+            position -= block_count
+            block_start += 4096
+            block_count = bits_string.count('1', block_start, block_start + 4096)
+
+        bit_position = bits_string.index('1', block_start)
+        for _ in range(position):
+            bit_position = bits_string.index('1', bit_position + 1)
+
+        return self._settings.Pattern.decode_index(self._patterns_list[bit_position])
+
+    def check_possible_solution(self, possible_solution):
+        """ (Solver2) Checks if given possible solution can be a solution based on all previous guesses """
+
+        if self._bits_bytes is None:
+            self._bits_bytes = self._bits.to_bytes(-(-self._settings.patterns_number // 8), 'little')
+
+        if self._natural_order:
+            position = possible_solution.index
+        else:
+            position = self._positions_list[possible_solution.index]
+
+        return bool(self._bits_bytes[position >> 3] >> (position & 7) & 1)  # O(1) bit test
+
+    def _get_mask(self, guess):
+        """ (Solver2) Returns response class mask (bitset of patterns giving the same response as the guess) """
+
+        key = (
+            self._settings.peg_colors,
+            self._settings.pegs_in_pattern,
+            self._settings.allow_duplicates,
+            guess.pattern.index,
+            guess.response.code,
+        )
+
+        if self._natural_order and key in self._masks_dict:
+            return self._masks_dict[key]
+
+        row = self._settings.response_table.row(guess.pattern.index)
+        if not self._natural_order:
+            row = itemgetter(*self._patterns_list)(row)  # reorder row to patterns list positions
+
+        # translate every response code into '1' (the same response) or '0' and read it as binary number
+        translation = bytes(48 + (code == guess.response.code) for code in range(256))
+        mask = int(bytes(row).translate(translation)[::-1], 2)
+
+        if self._natural_order:
+            if len(self._masks_dict) >= self._masks_limit:
+                del self._masks_dict[next(iter(self._masks_dict))]  # remove the oldest cached mask
+            self._masks_dict[key] = mask
+
+        return mask
+
+    def _filter_possible_solutions(self, guess):
+        """ (Solver2) Filters the possible solutions bitset leaving only patterns giving the same response """
+
+        previous_bits = self._bits
+
+        # response table is always prepared for the bitset backend (see Settings)
+        with Progress(
+            items_number=2,
+            style=self._settings.style,
+            title="[Solver2] Filtering patterns bitset...",
+            timing=self._settings.progress_timing,
+            update_time_func=self.update_solving_time,
+        ) as progress:
+
+            mask = progress.item(self._get_mask(guess))
+            self._bits = progress.item(self._bits & mask)  # bitwise AND with the response class mask
+
+        self._history.add_delta(previous_bits & ~self._bits)  # bitset diff - bits of removed patterns
+        self._bits_bytes = None
+        self._bits_string = None
+
+    def _restore_possible_solutions(self):
+        """ (Solver2) Restores the possible solutions bitset from before the last filtering guess """
+
+        self._bits |= self._history.pop_delta()
+        self._bits_bytes = None
+        self._bits_string = None
+
+    def release(self):
+        """ (Solver2) Releases memory of the ended game (patterns shared by all games are kept in Settings) """
+
+        super().release()
+        self._patterns_list = None
+        self._positions_list = None
+        self._bits = 0
+        self._bits_bytes = None
+        self._bits_string = None
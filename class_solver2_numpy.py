@@ -0,0 +1,165 @@
+############################################
+# My version of the famous Mastermind game #
+# class_solver2_numpy.py                   #
+# Mastermind Solver2 (NumPy backend)       #
+#           Piotr Loos (c) 2019-2021, 2023 #
+############################################
+
+from class_progress import Progress
+from class_solver2 import MastermindSolver2
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional - only this Solver2 backend needs it
+    numpy = None
+
+
+class MastermindSolver2Numpy(MastermindSolver2):
+    """ Contains Mastermind Solver2 (patterns list filtering Solver) with vectorized NumPy backend """
+
+    def __init__(
+            self,
+            settings,
+            guesses_list,
+    ):
+        """ (Solver2) Initializes `MastermindSolver2Numpy` class object """
+
+        if numpy is None:
+            raise RuntimeError(
+                f"{settings.style.error_on}"
+                f"[Solver2] NumPy module is not installed! Disable `solver2_use_numpy` setting."
+                f"{settings.style.error_off}"
+            )
+
+        super().__init__(settings, guesses_list)
+
+    def _prepare_possible_solutions(self):
+        """ (Solver2) Prepares `possible_solutions_list` and matrices of pegs and colors counts to be filtered """
+
+        peg_colors = self._settings.peg_colors
+        pegs_in_pattern = self._settings.pegs_in_pattern
+
+        with Progress(
+            items_number=pegs_in_pattern + peg_colors + 1,
+            style=self._settings.style,
+            title="[Solver2] Building NumPy matrices of all patterns...",
+            timing=self._settings.progress_timing,
+        ) as progress:
+
+            # `possible_solutions_list` is a NumPy array of patterns indexes
+            patterns_universe = self._settings.patterns_universe
+            if patterns_universe is not None:
+                # get copy of patterns array shared by all games (wider integers for vectorized calculations)
+                self._possible_solutions_list = numpy.array(patterns_universe, dtype=numpy.int64)
+            else:
+                # build new array from generator (for every new game)
+                self._possible_solutions_list = numpy.fromiter(
+                    self._settings.all_patterns_gen(),  # launch new generator (for every new game)
+                    dtype=numpy.int64,
+                    count=self._settings.patterns_number,
+                )
+            progress.item()
+
+            # (N, pegs_in_pattern) matrix of peg color digits (peg color - 1) decoded from patterns indexes
+            self._pegs_matrix = numpy.empty(
+                (len(self._possible_solutions_list), pegs_in_pattern),
+                dtype=numpy.uint8,
+            )
+            if self._settings.allow_duplicates:
+                for peg_index in range(pegs_in_pattern):
+                    weight = peg_colors ** (pegs_in_pattern - 1 - peg_index)
+                    self._pegs_matrix[:, peg_index] = progress.item(self._possible_solutions_list // weight % peg_colors)
+            else:
+                # indexes of patterns without duplicated colors are not positional numbers - decode them one by one
+                unrank = self._settings.patterns_enumerator.unrank
+                self._pegs_matrix[:] = [unrank(index) for index in self._possible_solutions_list.tolist()]
+                progress.advance(pegs_in_pattern)
+
+            # (N, peg_colors) matrix of colors counts in every pattern
+            self._counts_matrix = numpy.empty(
+                (len(self._possible_solutions_list), peg_colors),
+                dtype=numpy.uint8,
+            )
+            for digit in range(peg_colors):
+                self._counts_matrix[:, digit] = progress.item((self._pegs_matrix == digit).sum(axis=1))
+
+    def _get_pattern(self, position):
+        """ (Solver2) Returns Pattern object decoded from given `position` of the possible solutions list """
+
+        return self._settings.Pattern.decode_index(int(self._possible_solutions_list[position]))
+
+    def check_possible_solution(self, possible_solution):
+        """ (Solver2) Checks if given possible solution can be a solution based on all previous guesses """
+
+        return bool((self._possible_solutions_list == possible_solution.index).any())
+
+    def _filter_possible_solutions(self, guess):
+        """ (Solver2) Filters the possible solutions matrices leaving only patterns giving the same response """
+
+        with Progress(
+            items_number=self._settings.pegs_in_pattern + self._settings.peg_colors,
+            style=self._settings.style,
+            title="[Solver2] Filtering patterns matrices (using NumPy)...",
+            timing=self._settings.progress_timing,
+            update_time_func=self.update_solving_time,
+        ) as progress:
+
+            possible_solutions_number = len(self._possible_solutions_list)
+            digits = [peg - 1 for peg in guess.pattern]  # blank peg gives digit -1 (never matches)
+
+            # count black pegs for all patterns at once - column by column
+            black_pegs = numpy.zeros(possible_solutions_number, dtype=numpy.uint8)
+            for peg_index, digit in enumerate(digits):
+                if digit >= 0:
+                    black_pegs += self._pegs_matrix[:, peg_index] == digit
+                progress.item()
+
+            # count common colors (minimum of colors counts) for all patterns at once - color by color
+            black_white_pegs = numpy.zeros(possible_solutions_number, dtype=numpy.uint8)
+            for digit in range(self._settings.peg_colors):
+                count = digits.count(digit)
+                if count:
+                    black_white_pegs += numpy.minimum(self._counts_matrix[:, digit], count)
+                progress.item()
+
+            # filter all matrices with one boolean mask (removed rows are kept with their positions to undo turns)
+            mask = (black_pegs == guess.response.black_pegs) & (black_white_pegs == guess.response.black_white_pegs)
+            removed_mask = ~mask
+            self._history.add_delta((
+                numpy.flatnonzero(removed_mask),
+                self._possible_solutions_list[removed_mask],
+                self._pegs_matrix[removed_mask],
+                self._counts_matrix[removed_mask],
+            ))
+            self._possible_solutions_list = self._possible_solutions_list[mask]
+            self._pegs_matrix = self._pegs_matrix[mask]
+            self._counts_matrix = self._counts_matrix[mask]
+
+    def _restore_possible_solutions(self):
+        """ (Solver2) Restores the possible solutions matrices from before the last filtering guess """
+
+        removed_positions, removed_list, removed_pegs_matrix, removed_counts_matrix = self._history.pop_delta()
+
+        # rows kept by the guess fill all positions except removed ones
+        kept_mask = numpy.ones(len(self._possible_solutions_list) + len(removed_list), dtype=bool)
+        kept_mask[removed_positions] = False
+
+        matrices = []
+        for kept_matrix, removed_matrix in (
+                (self._possible_solutions_list, removed_list),
+                (self._pegs_matrix, removed_pegs_matrix),
+                (self._counts_matrix, removed_counts_matrix),
+        ):
+            matrix = numpy.empty((len(kept_mask),) + kept_matrix.shape[1:], dtype=kept_matrix.dtype)
+            matrix[kept_mask] = kept_matrix
+            matrix[removed_positions] = removed_matrix
+            matrices.append(matrix)
+
+        self._possible_solutions_list, self._pegs_matrix, self._counts_matrix = matrices
+
+    def release(self):
+        """ (Solver2) Releases memory of the ended game (patterns shared by all games are kept in Settings) """
+
+        super().release()
+        self._pegs_matrix = None
+        self._counts_matrix = None
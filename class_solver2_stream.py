@@ -0,0 +1,139 @@
+############################################
+# My version of the famous Mastermind game #
+# class_solver2_stream.py                  #
+# Mastermind Solver2 (streaming backend)   #
+#           Piotr Loos (c) 2019-2021, 2023 #
+############################################
+
+from class_progress import Progress
+from class_solver2 import MastermindSolver2
+from array import array
+from random import randrange
+
+
+class MastermindSolver2Stream(MastermindSolver2):
+    """ Contains Mastermind Solver2 (patterns list filtering Solver) which filters patterns generator on the fly
+    and builds the possible solutions list only when it fits in the memory limit """
+
+    def _prepare_possible_solutions(self):
+        """ (Solver2) Prepares the first guess without building the list of all patterns """
+
+        self._possible_solutions_list = None  # (array) built only when possible solutions fit in the memory limit
+        self._stream_guesses_list = []  # (list) guesses applied during patterns generation
+        self._possible_solutions_number = self._settings.patterns_number
+
+        # maximum number of patterns indexes in the list
+        self._items_limit = self._settings.solver2_stream_memory_limit * 2 ** 20 // array(
+            self._settings.Pattern.index_typecode
+        ).itemsize
+
+        if self._settings.solver2_take_random_pattern:
+            # every pattern is possible solution yet
+            self._stream_solution = self._settings.Pattern.decode_index(randrange(self._settings.patterns_number))
+        else:
+            # the first generated pattern (the same as the first one on the list)
+            self._stream_solution = self._settings.Pattern.decode_index(next(self._settings.all_patterns_gen()))
+
+    def _get_solution(self):
+        """ (Solver2) Gets and saves one possible solution from the list (or found during generation) """
+
+        if self._possible_solutions_list is not None:
+            super()._get_solution()
+        else:
+            self._current_possible_solution = self._stream_solution
+
+    def check_possible_solution(self, possible_solution):
+        """ (Solver2) Checks if given possible solution can be a solution based on all previous guesses """
+
+        if self._possible_solutions_list is not None:
+            return super().check_possible_solution(possible_solution)
+
+        return self._colors_domain.check_pattern(possible_solution) and all(
+            guess.pattern.calculate_response(possible_solution) == guess.response
+            for guess in self._stream_guesses_list
+        )
+
+    def _filter_possible_solutions(self, guess):
+        """ (Solver2) Filters the possible solutions list or patterns generator (with all previous guesses) """
+
+        if self._possible_solutions_list is not None:
+            super()._filter_possible_solutions(guess)
+            return
+
+        self._stream_guesses_list.append(guess)
+        self._history.add_delta((self._possible_solutions_number, self._stream_solution))  # state of the stream
+
+        if self._settings.response_table is not None:
+            rows_list = [
+                (self._settings.response_table.row(stream_guess.pattern.index), stream_guess.response.code)
+                for stream_guess in reversed(self._stream_guesses_list)  # the last guess rejects the most
+            ]
+        else:
+            decode_index = self._settings.Pattern.decode_index
+            check_pattern = self._colors_domain.check_pattern  # colors domain of all guesses rejects the most
+
+        possible_solutions_list = array(self._settings.Pattern.index_typecode)
+        possible_solutions_number = 0
+        solution_index = None
+
+        with Progress(
+            items_number=self._settings.patterns_number,
+            style=self._settings.style,
+            title="[Solver2] Filtering patterns generator...",
+            timing=self._settings.progress_timing,
+            update_time_func=self.update_solving_time,
+        ) as progress:
+
+            # launch new generator (progress is checked once for every block)
+            for block in progress.blocks(self._settings.all_patterns_gen()):
+
+                for index in block:
+
+                    if self._settings.response_table is not None:
+                        # just lookup in response table rows
+                        is_possible = all(row[index] == code for row, code in rows_list)
+                    else:
+                        pattern = decode_index(index)
+                        is_possible = check_pattern(pattern) and all(
+                            stream_guess.pattern.calculate_response(pattern) == stream_guess.response
+                            for stream_guess in reversed(self._stream_guesses_list)
+                        )
+
+                    if is_possible:
+
+                        possible_solutions_number += 1
+
+                        if possible_solutions_list is not None:
+                            possible_solutions_list.append(index)
+                            if len(possible_solutions_list) > self._items_limit:
+                                possible_solutions_list = None  # doesn't fit in the memory limit - keep only counting
+
+                        # take the first possible solution or a random one (every next one replaces it with 1/n chance)
+                        if solution_index is None or (
+                                self._settings.solver2_take_random_pattern and not randrange(possible_solutions_number)
+                        ):
+                            solution_index = index
+
+        self._possible_solutions_list = possible_solutions_list  # from now on filter the list (if it fits)
+        self._possible_solutions_number = possible_solutions_number
+        self._stream_solution = None if solution_index is None else self._settings.Pattern.decode_index(
+            solution_index
+        )
+
+    def _restore_possible_solutions(self):
+        """ (Solver2) Restores the possible solutions list or the state of patterns generator from before the last
+        filtering guess """
+
+        if len(self._history) > len(self._stream_guesses_list):
+            super()._restore_possible_solutions()  # the list was filtered
+            return
+
+        self._stream_guesses_list.pop()
+        self._possible_solutions_list = None  # filter patterns generator again
+        self._possible_solutions_number, self._stream_solution = self._history.pop_delta()
+
+    def release(self):
+        """ (Solver2) Releases memory of the ended game (patterns shared by all games are kept in Settings) """
+
+        super().release()
+        self._stream_guesses_list = []
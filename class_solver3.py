@@ -0,0 +1,308 @@
+############################################
+# My version of the famous Mastermind game #
+# class_solver3.py                         #
+# Mastermind Solver3                       #
+#           Piotr Loos (c) 2019-2021, 2023 #
+############################################
+
+from class_progress import Progress
+from class_solutions_history import SolutionsHistory
+from class_symmetry import GuessesSymmetry
+from array import array
+from collections import Counter
+from itertools import chain
+from operator import itemgetter
+
+
+class MastermindSolver3:
+    """ Contains Mastermind Solver3 (Knuth's minimax Solver) """
+
+    _name = "Solver3"  # (str) Solver name used in prints
+
+    # (dict) opening guess and its partition table cached for every (peg_colors, pegs_in_pattern, allow_duplicates)
+    # configuration
+    _openings_dict = {}
+    _cache_opening_partition = True  # (bool) flag whether partition table of the opening guess should be cached
+
+    # (int) minimum number of possible solutions for every permutation checked by the symmetry key, below it
+    # evaluating all guesses is faster than finding symmetric ones
+    _symmetry_solutions_factor = 256
+
+    def __init__(
+            self,
+            settings,
+            guesses_list,
+    ):
+        """ (Solver3) Initializes `MastermindSolver3` class object """
+
+        self._settings = settings
+        self._guesses_list = guesses_list
+
+        self._solving_time = 0
+
+        # every pattern (also impossible one) can be a guess, responses are taken from response table
+        self._response_table = self._settings.response_table
+
+        # `possible_solutions_list` is a compact array of patterns indexes (all patterns at the beginning are just
+        # a range - nothing is built for a new game, the first filtering makes the array)
+        self._possible_solutions_list = range(self._settings.patterns_number)
+        self._possible_solutions_number = self._settings.patterns_number
+
+        self._opening_key = (
+            self._settings.peg_colors,
+            self._settings.pegs_in_pattern,
+            self._settings.allow_duplicates,
+        )
+        self._turn_index = 0
+        self._guesses_digits_list = []  # (list) digits of all previous guesses (for symmetry reduction)
+
+        # patterns removed by every guess (only deltas are kept) and guesses proposed before it - to undo turns
+        self._history = SolutionsHistory(self._settings.Pattern.index_typecode)
+        self._proposed_list = []
+
+        if self._opening_key not in self._openings_dict:
+            # find the best opening guess (the most expensive move) only once for current configuration
+            opening_index = self._get_book_guess()
+            if opening_index is None:
+                opening_index = self._find_best_guess(
+                    f"[{self._name}] Choosing the opening guess (only once for these settings)..."
+                )
+            self._openings_dict[self._opening_key] = (
+                opening_index,
+                # partition table of the opening guess (code -> patterns indexes)
+                self._partition(opening_index) if self._cache_opening_partition else None,
+            )
+
+        self._current_possible_solution = self._settings.Pattern.decode_index(
+            self._openings_dict[self._opening_key][0]
+        )
+
+    @property
+    def possible_solutions_number(self):
+        """ (Solver3) Returns number of possible solutions """
+
+        return self._possible_solutions_number
+
+    @property
+    def current_possible_solution(self):
+        """ (Solver3) Returns current guess (in this turn) - it doesn't have to be a possible solution """
+
+        return self._current_possible_solution
+
+    @property
+    def solving_time(self):
+        """ (Solver3) Returns total solving time """
+
+        return self._solving_time
+
+    def update_solving_time(self, exec_time):
+        """ (Solver3) Updates execution time by the Progress instance """
+
+        self._solving_time += exec_time  # Solver3 accumulates solving time from several Progress instances per game
+
+    def check_possible_solution(self, possible_solution):
+        """ (Solver3) Checks if given possible solution can be a solution based on all previous guesses """
+
+        return possible_solution.index in self._possible_solutions_list
+
+    def _get_book_guess(self):
+        """ (Solver3) Returns index of the opening book guess after previous guesses (None if out of the book) """
+
+        if self._settings.opening_book is None:
+            return None
+        return self._settings.opening_book.guess_index(self._guesses_list)
+
+    def _partition(self, guess_index):
+        """ (Solver3) Returns partition table (response code -> array of patterns indexes) for given guess """
+
+        row = self._response_table.row(guess_index)
+
+        partition_dict = {}
+        for index in self._possible_solutions_list:
+            partition_dict.setdefault(row[index], []).append(index)
+
+        return {
+            code: array(self._settings.Pattern.index_typecode, indexes)
+            for code, indexes in partition_dict.items()
+        }
+
+    def _get_filter_flags(self, guess):
+        """ (Solver3) Returns flags of possible solutions giving the same response as the guess """
+
+        row = self._response_table.row(guess.pattern.index)
+        code = guess.response.code
+        return [row[index] == code for index in self._possible_solutions_list]
+
+    def _worst_case(self, guess_index, getter):
+        """ (Solver3) Returns the size of the biggest part of possible solutions after given guess """
+
+        return max(Counter(getter(self._response_table.row(guess_index))).values())
+
+    def _find_best_guess(self, progress_title):
+        """ (Solver3) Returns index of the guess minimizing the worst case number of remaining possible solutions """
+
+        # the only (or one of two) possible solutions is always the best guess
+        if self._possible_solutions_number <= 2:
+            return self._possible_solutions_list[0]
+
+        getter = itemgetter(*self._possible_solutions_list)  # gets responses of all possible solutions at once
+        possible_solutions_set = set(self._possible_solutions_list)
+        guesses_list = self._reduce_guesses(range(self._settings.patterns_number))
+
+        best_key = None
+        best_index = None
+
+        with Progress(
+            items_number=len(guesses_list),
+            style=self._settings.style,
+            title=progress_title,
+            timing=self._settings.progress_timing,
+            update_time_func=self.update_solving_time,
+        ) as progress:
+
+            for guess_index in guesses_list:
+                # minimize the worst case, then prefer possible solutions, then the lowest index
+                key = (
+                    progress.item(self._worst_case(guess_index, getter)),
+                    guess_index not in possible_solutions_set,
+                )
+                if best_key is None or key < best_key:
+                    best_key = key
+                    best_index = guess_index
+
+        return best_index
+
+    def _reduce_guesses(self, guesses_list):
+        """ (Solver3) Returns given guesses indexes leaving only the first guess of every class of guesses symmetric
+        under colors and pegs permutations preserving all previous guesses (if enabled) """
+
+        if not self._settings.solver3_symmetry_reduction:
+            return guesses_list
+
+        symmetry = GuessesSymmetry(
+            self._settings.peg_colors,
+            self._settings.pegs_in_pattern,
+            self._guesses_digits_list,
+        )
+        if (
+                symmetry.is_trivial
+                or self._possible_solutions_number < self._symmetry_solutions_factor * symmetry.elements_number
+        ):
+            return guesses_list
+
+        # symmetric guesses have the same score and all of them are possible solutions or none of them,
+        # so the first one (the lowest index) is chosen just like without reduction
+        decode_index = self._settings.Pattern.decode_index
+        classes_dict = {}
+        for guess_index in guesses_list:
+            classes_dict.setdefault(
+                symmetry.key(tuple(peg - 1 for peg in decode_index(guess_index))),
+                guess_index,
+            )
+        reduced_guesses_list = list(classes_dict.values())
+
+        print(
+            f"[{self._name}] Symmetry reduction leaves "
+            f"{self._settings.style.number_on}"
+            f"{len(reduced_guesses_list):,}"
+            f"{self._settings.style.number_off}"
+            f" of "
+            f"{self._settings.style.number_on}"
+            f"{len(guesses_list):,}"
+            f"{self._settings.style.number_off}"
+            f" guesses to evaluate."
+        )
+        return reduced_guesses_list
+
+    def calculate_possible_solution(self, guess, *_):
+        """ (Solver3) Calculates the next guess after current guess """
+
+        patterns_old_number = self._possible_solutions_number
+        opening_index, opening_partition = self._openings_dict[self._opening_key]
+
+        self._proposed_list.append(self._current_possible_solution)
+
+        if self._turn_index == 0 and guess.pattern.index == opening_index and opening_partition is not None:
+            # take cached part of the opening partition table
+            self._possible_solutions_list = opening_partition.get(
+                guess.response.code,
+                array(self._settings.Pattern.index_typecode),
+            )
+            # all other parts are removed - before the first guess position of every pattern is its index
+            removed_list = array(
+                self._settings.Pattern.index_typecode,
+                sorted(chain.from_iterable(
+                    part
+                    for code, part in opening_partition.items()
+                    if code != guess.response.code
+                )),
+            )
+            self._history.add_delta((removed_list, removed_list))
+        else:
+            possible_solutions_list = array(self._settings.Pattern.index_typecode)
+            self._history.start_delta()
+            self._history.filter_block(
+                self._possible_solutions_list,
+                self._get_filter_flags(guess),
+                possible_solutions_list,
+            )
+            self._possible_solutions_list = possible_solutions_list
+
+        self._turn_index += 1
+        self._guesses_digits_list.append(tuple(peg - 1 for peg in guess.pattern))
+        self._possible_solutions_number = len(self._possible_solutions_list)
+
+        print(
+            f"[{self._name}] Number of possible solutions is now "
+            f"{self._settings.style.number_on}"
+            f"{self._possible_solutions_number:,}"
+            f"{self._settings.style.number_off}"
+            f" of "
+            f"{self._settings.style.number_on}"
+            f"{patterns_old_number:,}"
+            f"{self._settings.style.number_off}"
+            f"."
+        )
+
+        if not self._possible_solutions_number:
+            self._current_possible_solution = None
+            print()
+            return None
+
+        if self._possible_solutions_number == 1:
+            print(
+                f"[{self._name}] Now I know pattern "
+                f"{self._settings.Pattern.decode_index(self._possible_solutions_list[0])} "
+                f"is the only possible solution!"
+            )
+
+        guess_index = self._get_book_guess()
+        if guess_index is None:
+            guess_index = self._find_best_guess(
+                f"[{self._name}] Choosing the next guess..."
+            )
+        else:
+            print(f"[{self._name}] Took the next guess from the opening book.")
+        self._current_possible_solution = self._settings.Pattern.decode_index(guess_index)
+
+        print()
+        return self._current_possible_solution
+
+    def rewind(self, guesses_number):
+        """ (Solver3) Undoes turns after given number of guesses (they are already removed from the guesses list) """
+
+        # restore removed patterns turn by turn (there are no deltas of guesses which were not filtered)
+        while self._turn_index > guesses_number:
+            self._possible_solutions_list = self._history.restore(self._possible_solutions_list)
+            self._current_possible_solution = self._proposed_list.pop()  # the guess doesn't have to be calculated
+            self._guesses_digits_list.pop()
+            self._turn_index -= 1
+
+        self._possible_solutions_number = len(self._possible_solutions_list)
+
+    def release(self):
+        """ (Solver3) Releases memory of the ended game (opening guesses and response table are kept for next games) """
+
+        self._possible_solutions_list = None
+        self._history = None
+        self._proposed_list = []
@@ -0,0 +1,169 @@
+############################################
+# My version of the famous Mastermind game #
+# class_solver4.py                         #
+# Mastermind Solver4                       #
+#           Piotr Loos (c) 2019-2021, 2023 #
+############################################
+
+from class_progress import Progress
+from class_solver3 import MastermindSolver3
+from collections import Counter
+from math import log
+from operator import eq, itemgetter
+from random import sample
+from time import time
+
+
+class MastermindSolver4(MastermindSolver3):
+    """ Contains Mastermind Solver4 (sampling expected size / entropy Solver) """
+
+    _name = "Solver4"  # (str) Solver name used in prints
+
+    # (dict) opening guess cached for every configuration (separately from Solver3)
+    _openings_dict = {}
+    _cache_opening_partition = False  # partition of all patterns can be too big for large games
+
+    def _score(self, codes):
+        """ (Solver4) Returns score of the guess (lower is better) for given responses codes of sampled solutions """
+
+        parts_sizes = Counter(codes).values()
+
+        if self._settings.solver4_strategy == 1:
+            # expected size of remaining part (multiplied by the number of sampled solutions)
+            return sum(part_size * part_size for part_size in parts_sizes)
+        else:
+            # entropy of responses (maximized as minimized sum of `n*log(n)`, the same number of sampled solutions)
+            return sum(part_size * log(part_size) for part_size in parts_sizes)
+
+    def _get_book_guess(self):
+        """ (Solver4) Returns None - the opening book keeps minimax guesses of Solver3, not ones chosen by the scoring
+        of Solver4 """
+
+        return None
+
+    def _get_patterns_digits(self, indexes):
+        """ (Solver4) Returns digits tuple (peg color - 1) and colors counts of every pattern with given index """
+
+        decode_index = self._settings.Pattern.decode_index
+        colors_range = range(self._settings.peg_colors)
+
+        patterns_digits = []
+        for index in indexes:
+            digits = tuple(peg - 1 for peg in decode_index(index))
+            patterns_digits.append((digits, tuple(map(digits.count, colors_range))))
+        return patterns_digits
+
+    def _calculate_codes(self, guess_index, patterns_digits):
+        """ (Solver4) Returns responses codes (see `Response.code`) of the guess for given patterns digits and colors
+        counts - only for given patterns, without calculating whole response table row """
+
+        (guess_digits, guess_counts), = self._get_patterns_digits((guess_index,))
+        black_white_codes = [  # code of response without black pegs for every number of common colors
+            black_white_pegs * (black_white_pegs + 1) // 2
+            for black_white_pegs in range(self._settings.pegs_in_pattern + 1)
+        ]
+
+        return [
+            black_white_codes[sum(map(min, guess_counts, counts))] + sum(map(eq, guess_digits, digits))
+            for digits, counts in patterns_digits
+        ]
+
+    def _get_filter_flags(self, guess):
+        """ (Solver4) Returns flags of possible solutions giving the same response as the guess """
+
+        if self._response_table.precomputed or self._possible_solutions_number == self._settings.patterns_number:
+            # whole row is the cheapest way to get responses of (almost) all patterns
+            return super()._get_filter_flags(guess)
+
+        # calculating whole rows is too expensive - calculate responses only for possible solutions
+        code = guess.response.code
+        return [
+            solution_code == code
+            for solution_code in self._calculate_codes(
+                guess.pattern.index,
+                self._get_patterns_digits(self._possible_solutions_list),
+            )
+        ]
+
+    def _get_guesses_sample(self):
+        """ (Solver4) Returns stratified sample of guesses indexes and set of those being possible solutions """
+
+        guesses_number = self._settings.solver4_guesses_sample
+
+        if not guesses_number or guesses_number >= self._settings.patterns_number:
+            # evaluate all patterns (like Solver3), possible solutions are preferred in case of a tie
+            return range(self._settings.patterns_number), set(self._possible_solutions_list)
+
+        # half of the sample is taken from possible solutions...
+        solutions_guesses = sample(
+            self._possible_solutions_list,
+            min(self._possible_solutions_number, guesses_number // 2),
+        )
+        # ...and the rest from all patterns (also impossible ones)
+        other_guesses = sample(
+            range(self._settings.patterns_number),
+            guesses_number - len(solutions_guesses),
+        )
+
+        return list(dict.fromkeys(solutions_guesses + other_guesses)), set(solutions_guesses)
+
+    def _find_best_guess(self, progress_title):
+        """ (Solver4) Returns index of the guess with the best score evaluated on sampled guesses and solutions """
+
+        # the only (or one of two) possible solutions is always the best guess
+        if self._possible_solutions_number <= 2:
+            return self._possible_solutions_list[0]
+
+        # sample possible solutions to score guesses against
+        solutions_number = self._settings.solver4_solutions_sample
+        if not solutions_number or solutions_number >= self._possible_solutions_number:
+            solutions_sample = self._possible_solutions_list
+        else:
+            # at least 2 sampled solutions (to get responses as a tuple)
+            solutions_sample = sample(self._possible_solutions_list, max(2, solutions_number))
+
+        guesses_sample, solutions_guesses_set = self._get_guesses_sample()
+        guesses_sample = self._reduce_guesses(guesses_sample)
+
+        if self._response_table.precomputed:
+            # responses of all sampled solutions are taken from the table row at once
+            getter = itemgetter(*solutions_sample)
+        else:
+            # calculating whole rows is too expensive - compare sampled patterns directly (decoded only once)
+            getter = None
+            solutions_digits = self._get_patterns_digits(solutions_sample)
+
+        time_budget = self._settings.solver4_time_budget / 1000  # in seconds (0 = unlimited)
+        start_time = time()
+
+        best_key = None
+        best_index = None
+
+        with Progress(
+            items_number=len(guesses_sample),
+            style=self._settings.style,
+            title=progress_title,
+            timing=self._settings.progress_timing,
+            update_time_func=self.update_solving_time,
+        ) as progress:
+
+            for guess_index in guesses_sample:
+
+                if getter is not None:
+                    codes = getter(self._response_table.row(guess_index))
+                else:
+                    codes = self._calculate_codes(guess_index, solutions_digits)
+
+                # minimize the score, then prefer possible solutions, then the first evaluated
+                key = (
+                    progress.item(self._score(codes)),
+                    guess_index not in solutions_guesses_set,
+                )
+                if best_key is None or key < best_key:
+                    best_key = key
+                    best_index = guess_index
+
+                if time_budget and time() - start_time > time_budget:
+                    break  # out of time budget - take the best guess so far
+
+        return best_index
@@ -0,0 +1,148 @@
+############################################
+# My version of the famous Mastermind game #
+# class_solver5.py                         #
+# Mastermind Solver5                       #
+#           Piotr Loos (c) 2019-2021, 2023 #
+############################################
+
+from class_decision_tree import DecisionTree
+import os
+from time import time
+
+
+class MastermindSolver5:
+    """ Contains Mastermind Solver5 (decision tree playback Solver) """
+
+    # (dict) decision trees loaded once for every file path (reused in next games)
+    _trees_dict = {}
+
+    def __init__(
+            self,
+            settings,
+            guesses_list,
+    ):
+        """ (Solver5) Initializes `MastermindSolver5` class object """
+
+        self._settings = settings
+        self._guesses_list = guesses_list
+
+        self._solving_time = 0
+
+        start_time = time()
+        self._tree = self._load_tree()
+        self._solving_time += time() - start_time
+
+        self._node = 0  # current node of the tree (root before the first guess)
+        self._nodes_list = []  # (list) node before every guess (to undo turns)
+        self._current_possible_solution = self._settings.Pattern.decode_index(self._tree.guess_index(self._node))
+
+    def _load_tree(self):
+        """ (Solver5) Returns decision tree of chosen Solver for current configuration (loaded only once) """
+
+        tree_key = (
+            self._settings.peg_colors,
+            self._settings.pegs_in_pattern,
+            self._settings.solver5_tree_solver,
+            self._settings.allow_duplicates,
+            DecisionTree.strategy_key(self._settings, self._settings.solver5_tree_solver),
+        )
+        path = DecisionTree.file_path(*tree_key)
+
+        if path not in self._trees_dict:
+
+            if not os.path.isfile(path):
+                raise RuntimeError(
+                    f"{self._settings.style.error_on}"
+                    f"[Solver5] There is no decision tree of Solver #{self._settings.solver5_tree_solver} "
+                    f"for these settings! Build it first running `main.py mode=export "
+                    f"chosen_solver={self._settings.solver5_tree_solver}` with the same settings."
+                    f"{self._settings.style.error_off}"
+                )
+
+            print(
+                f"[Solver5] Loading decision tree of Solver #{self._settings.solver5_tree_solver} "
+                f"(only once for these settings)..."
+            )
+            self._trees_dict[path] = DecisionTree.load(path, *tree_key)
+
+        return self._trees_dict[path]
+
+    @property
+    def possible_solutions_number(self):
+        """ (Solver5) Returns number of possible solutions (reaching current node of the tree) """
+
+        if self._node is None:
+            return 0
+        return self._tree.solutions_number(self._node)
+
+    @property
+    def current_possible_solution(self):
+        """ (Solver5) Returns current guess (in this turn) """
+
+        return self._current_possible_solution
+
+    @property
+    def solving_time(self):
+        """ (Solver5) Returns total solving time """
+
+        return self._solving_time
+
+    def check_possible_solution(self, possible_solution):
+        """ (Solver5) Checks if given possible solution can be a solution based on all previous guesses """
+
+        # the tree doesn't keep possible solutions - check all previous guesses directly
+        return all(
+            possible_solution.calculate_response(guess.pattern) == guess.response
+            for guess in self._guesses_list
+        )
+
+    def calculate_possible_solution(self, guess, *_):
+        """ (Solver5) Gets the next guess from the decision tree (just a dictionary lookup) """
+
+        start_time = time()
+        self._nodes_list.append(self._node)
+
+        if self._node is not None and guess.pattern.index != self._tree.guess_index(self._node):
+            print(
+                f"[Solver5] Pattern {guess.pattern} is not the guess from decision tree! "
+                f"I can't follow the tree anymore."
+            )
+            self._node = None
+        elif self._node is not None:
+            self._node = self._tree.child(self._node, guess.response.code)
+
+        if self._node is None:
+            self._current_possible_solution = None
+        else:
+            self._current_possible_solution = self._settings.Pattern.decode_index(self._tree.guess_index(self._node))
+
+        self._solving_time += time() - start_time
+
+        if self._node is not None:
+            print(
+                f"[Solver5] Number of possible solutions is now "
+                f"{self._settings.style.number_on}"
+                f"{self._tree.solutions_number(self._node):,}"
+                f"{self._settings.style.number_off}"
+                f"."
+            )
+
+        print()
+        return self._current_possible_solution
+
+    def rewind(self, guesses_number):
+        """ (Solver5) Undoes turns after given number of guesses (just goes back to the node of the tree) """
+
+        if len(self._nodes_list) > guesses_number:
+            self._node = self._nodes_list[guesses_number]
+            del self._nodes_list[guesses_number:]
+
+        if self._node is None:
+            self._current_possible_solution = None
+        else:
+            self._current_possible_solution = self._settings.Pattern.decode_index(self._tree.guess_index(self._node))
+
+    def release(self):
+        """ (Solver5) Releases memory of the ended game (decision tree is kept for next games) """
+
+        self._nodes_list = []
@@ -0,0 +1,131 @@
+############################################
+# My version of the famous Mastermind game #
+# class_symmetry.py                        #
+# Symmetries of Mastermind guesses         #
+#           Piotr Loos (c) 2019-2021, 2023 #
+############################################
+
+
+class GuessesSymmetry:
+    """ Group of colors and pegs permutations preserving every previous guess - guesses in one class (orbit)
+    of the group split possible solutions in the same way, so only one guess of every class has to be evaluated """
+
+    # (int) maximum number of kept permutations of pegs classes (with more of them some symmetric guesses
+    # get different keys - they are just evaluated separately)
+    _elements_limit = 120
+
+    def __init__(
+            self,
+            peg_colors,
+            pegs_in_pattern,
+            guesses_digits_list,
+    ):
+        """ Initializes `GuessesSymmetry` class object for previous guesses given as tuples of digits
+        (peg color - 1, blank peg is -1) """
+
+        # pegs with the same colors in every previous guess (identical columns) can be freely permuted
+        columns_dict = {}
+        for peg_index in range(pegs_in_pattern):
+            column = tuple(guess_digits[peg_index] for guess_digits in guesses_digits_list)
+            columns_dict.setdefault(column, []).append(peg_index)
+
+        self._columns_list = list(columns_dict)  # (list) column of previous guesses digits for every pegs class
+        self._pegs_classes = list(columns_dict.values())  # (list) pegs indexes of every class
+
+        # colors not used in any previous guess can be freely permuted
+        used_colors = {digit for guess_digits in guesses_digits_list for digit in guess_digits if digit >= 0}
+        self._used_colors = sorted(used_colors)
+        self._free_colors = [digit for digit in range(peg_colors) if digit not in used_colors]
+
+        # permutations of whole pegs classes with colors permutations (of used colors) mapping their columns
+        self._elements_list = []  # (list) tuples of classes mapping and colors mapping dict
+        self._add_elements([], {}, {})
+
+        self.elements_number = len(self._elements_list)  # (int) cost of one key (in permutations to check)
+
+        # there is nothing to reduce if every guess is the only one in its class
+        self.is_trivial = (
+            len(self._elements_list) == 1
+            and len(self._pegs_classes) == pegs_in_pattern
+            and len(self._free_colors) <= 1
+        )
+
+    def _add_elements(self, classes_map, colors_dict, inverted_colors_dict):
+        """ Adds group elements extending given partial mapping of pegs classes and colors (backtracking) """
+
+        if len(self._elements_list) >= self._elements_limit:
+            return
+
+        class_index = len(classes_map)
+        if class_index == len(self._pegs_classes):
+            self._elements_list.append((tuple(classes_map), dict(colors_dict)))
+            return
+
+        for target_index, target_column in enumerate(self._columns_list):
+
+            if (
+                    target_index in classes_map
+                    or len(self._pegs_classes[target_index]) != len(self._pegs_classes[class_index])
+            ):
+                continue
+
+            # every color of the column must be mapped to the color of target column (blank peg to blank peg)
+            added_colors = []
+            for digit, target_digit in zip(self._columns_list[class_index], target_column):
+                if (digit < 0) != (target_digit < 0):
+                    break
+                if colors_dict.get(digit, target_digit) != target_digit:
+                    break
+                if inverted_colors_dict.get(target_digit, digit) != digit:
+                    break
+                if digit not in colors_dict:
+                    colors_dict[digit] = target_digit
+                    inverted_colors_dict[target_digit] = digit
+                    added_colors.append(digit)
+            else:
+                classes_map.append(target_index)
+                self._add_elements(classes_map, colors_dict, inverted_colors_dict)
+                classes_map.pop()
+
+            for digit in added_colors:
+                del inverted_colors_dict[colors_dict.pop(digit)]
+
+    def key(self, digits):
+        """ Returns key of the class of the guess given as `digits` tuple (the same for all symmetric guesses) """
+
+        # order of pegs inside one pegs class doesn't matter - only numbers of colors in every class are kept
+        classes_counts = []
+        for pegs_class in self._pegs_classes:
+            counts = {}
+            for peg_index in pegs_class:
+                counts[digits[peg_index]] = counts.get(digits[peg_index], 0) + 1
+            classes_counts.append(counts)
+
+        keys = []
+        for classes_map, colors_dict in self._elements_list:
+
+            mapped_counts = [None] * len(classes_counts)
+            for class_index, counts in enumerate(classes_counts):
+                mapped_counts[classes_map[class_index]] = {
+                    colors_dict.get(digit, digit): count
+                    for digit, count in counts.items()
+                }
+
+            keys.append((
+                # used colors keep their numbers in every class
+                tuple(
+                    tuple(counts.get(digit, 0) for counts in mapped_counts)
+                    for digit in self._used_colors
+                ),
+                # free colors can be renamed - only the sorted numbers in every class are kept
+                tuple(sorted(
+                    numbers
+                    for numbers in (
+                        tuple(counts.get(digit, 0) for counts in mapped_counts)
+                        for digit in self._free_colors
+                    )
+                    if any(numbers)
+                )),
+            ))
+
+        return min(keys)
@@ -10,10 +10,12 @@ from class_settings import Settings
 from mode_game import MastermindGame
 from mode_helper import MastermindHelper
 from mode_solver import MastermindSolver
+from mode_simulate import MastermindSimulator
+from mode_export import MastermindTreeExporter
 
 
 def main():
-    """ Runs Mastermind game in given mode (Game, Helper, Solver) """
+    """ Runs Mastermind game in given mode (Game, Helper, Solver, Simulate, Export) """
 
     kwargs = {}  # collected settings dict
 
@@ -42,9 +44,13 @@ def main():
     else:
         del kwargs["mode"]  # if success delete from dict (not to be displayed furthermore)
 
+    # number of games and worker processes in Simulate mode (not settings - removed from dict like `mode`)
+    games = kwargs.pop("games", None)
+    processes = kwargs.pop("processes", None)
+
     # TODO: try to use dict for Mastermind modes
-    modes_to_check = {"1", "game", "2", "solver", "3", "helper"}
-    modes_to_print = "1:Game, 2:Solver, 3:Helper"
+    modes_to_check = {"1", "game", "2", "solver", "3", "helper", "4", "simulate", "5", "export"}
+    modes_to_print = "1:Game, 2:Solver, 3:Helper, 4:Simulate, 5:Export"
     given_as_parameter = True  # flag to decide if the mode is given as a parameter or entered by the user
     mode_str = ""  # declare empty input value to ignore errors, although it will not be used before assignment
 
@@ -71,11 +77,25 @@ def main():
             mode = "solver"
         elif mode_str in {"3", "helper"}:
             mode = "helper"
+        elif mode_str in {"4", "simulate"}:
+            mode = "simulate"
+        elif mode_str in {"5", "export"}:
+            mode = "export"
         else:
             mode = None
 
     settings = Settings(**kwargs)  # initialize Settings object and determine (set or ask for) missing settings
 
+    if mode in {"4", "simulate"}:
+        # play all games of computer vs computer at once (without asking to play again)
+        MastermindSimulator(settings=settings, games=games, processes=processes)
+        return
+
+    if mode in {"5", "export"}:
+        # build decision tree of chosen Solver once (to be played back by Solver5)
+        MastermindTreeExporter(settings=settings)
+        return
+
     # define sets of negative and positive user answers to play again question
     neg_answers_set = {"0", "false", "f", "no", "n", "x", "-", "exit"}
     pos_answers_set = {"1", "true", "t", "yes", "y", "v", "+", ""}
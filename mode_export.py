@@ -0,0 +1,105 @@
+############################################
+# My version of the famous Mastermind game #
+# mode_export.py                           #
+# Mastermind Export mode                   #
+#           Piotr Loos (c) 2019-2021, 2023 #
+############################################
+
+from class_decision_tree import DecisionTree
+from class_progress import Progress
+from mode_simulate import MastermindSimulation
+from contextlib import redirect_stdout
+import os
+
+
+class MastermindTreeExporter:
+    """ Contains Mastermind Export mode - builds decision tree of chosen Solver playing every possible solution
+    and saves it to binary file (to be played back by Solver5) """
+
+    def __init__(
+            self,
+            settings,
+    ):
+        """ Initializes `MastermindTreeExporter` class object, builds and saves the decision tree """
+
+        self._settings = settings
+
+        if self._settings.chosen_solver == 5:
+            raise RuntimeError(
+                f"{self._settings.style.error_on}"
+                f"[Exporter] Choose Solver #1-#4 to build its decision tree!"
+                f"{self._settings.style.error_off}"
+            )
+
+        random_setting = self._get_random_setting()
+        if random_setting is not None:
+            raise RuntimeError(
+                f"{self._settings.style.error_on}"
+                f"[Exporter] Solver #{self._settings.chosen_solver} plays randomly with `{random_setting}` setting "
+                f"- disable it to build the decision tree!"
+                f"{self._settings.style.error_off}"
+            )
+
+        self._tree = DecisionTree(
+            self._settings.peg_colors,
+            self._settings.pegs_in_pattern,
+            self._settings.chosen_solver,
+            self._settings.allow_duplicates,
+            DecisionTree.strategy_key(self._settings, self._settings.chosen_solver),
+        )
+
+        self._settings.print_settings()  # print settings list if enabled (inside function checks)
+        self._build()
+
+        path = self._tree.save()
+        print(
+            f"[Exporter] Decision tree with "
+            f"{self._settings.style.number_on}"
+            f"{self._tree.nodes_number:,}"
+            f"{self._settings.style.number_off}"
+            f" guesses saved to `{path}`."
+        )
+
+    def _get_random_setting(self):
+        """ Returns name of the setting making chosen Solver play randomly (None if the Solver is deterministic) """
+
+        if self._settings.chosen_solver in {1, 2}:
+            # the first possible solution depends on patterns order
+            for setting_name in (
+                    "shuffle_colors_before_build",
+                    "shuffle_colors_during_build",
+                    "shuffle_patterns_after_build",
+            ):
+                if getattr(self._settings, setting_name):
+                    return setting_name
+
+        if self._settings.chosen_solver == 2 and self._settings.solver2_take_random_pattern:
+            return "solver2_take_random_pattern"
+
+        if self._settings.chosen_solver == 4:
+            # all patterns are possible solutions before the first guess, so any smaller sample is random
+            for setting_name in ("solver4_guesses_sample", "solver4_solutions_sample"):
+                if 0 < getattr(self._settings, setting_name) < self._settings.patterns_number:
+                    return setting_name
+            if self._settings.solver4_time_budget:
+                return "solver4_time_budget"
+
+        return None
+
+    def _build(self):
+        """ Plays every possible solution and adds the path of every game to the tree """
+
+        with Progress(
+            items_number=self._settings.patterns_number,
+            style=self._settings.style,
+            title=f"[Exporter] Building decision tree of Solver #{self._settings.chosen_solver}...",
+            timing=self._settings.progress_timing,
+        ) as progress, open(os.devnull, "w") as devnull:
+
+            for index in range(self._settings.patterns_number):
+                with redirect_stdout(devnull):  # only Progress of the Exporter is printed
+                    game = MastermindSimulation(
+                        settings=self._settings,
+                        solution=self._settings.Pattern.decode_index(index),
+                    )
+                self._tree.add_game(progress.item(game.guesses_list))
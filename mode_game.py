@@ -43,7 +43,7 @@ class MastermindGame(Mastermind):
                 self._solution = self._settings.Pattern.get_random_pattern()
             else:
                 try:
-                    self._solution = self._settings.Pattern.decode_pattern(solution)
+                    self._solution = self._settings.Pattern.decode_pattern(solution, is_solution=True)
                 except ValueError:
                     raise RuntimeError(
                         f"{self._settings.style.error_on}"
@@ -54,6 +54,7 @@ class MastermindGame(Mastermind):
         self._intro()
         self._loop()
         self._outro()
+        self._release()
 
     def _take_turn(self, user_input, computer_pattern=None):
         """ Takes a turn as the CodeMaker (with `user_pattern_string` or `computer_pattern` from CodeBreaker) """
@@ -85,7 +86,7 @@ class MastermindGame(Mastermind):
                 raise ValueError(
                     f"{self._settings.style.error_on}"
                     f"[Game] You gave me incorrect `pattern`! Try something like `" +
-                    self._settings.Peg.all_pegs_list[1].char * self._settings.pegs_in_pattern +
+                    "".join(peg.char for peg in self._settings.Pattern.decode_index(0)) +  # the first correct pattern
                     f"`. Enter again."
                     f"{self._settings.style.error_off}"
                 )
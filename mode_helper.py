@@ -37,6 +37,7 @@ class MastermindHelper(Mastermind):
         self._intro()
         self._loop()
         self._outro()
+        self._release()
 
     # TODO: refactor with Solver's `_take_turn`
     def _take_turn(self, user_input, computer_pattern=None, computer_response=None):
@@ -75,7 +76,7 @@ class MastermindHelper(Mastermind):
                 raise ValueError(
                     f"{self._settings.style.error_on}"
                     f"[Helper] You gave me incorrect `pattern=response`! Try something like `" +
-                    self._settings.Peg.all_pegs_list[1].char * self._settings.pegs_in_pattern +
+                    "".join(peg.char for peg in self._settings.Pattern.decode_index(0)) +  # the first correct pattern
                     f"=1,0` or just `=1,0`. Enter again."
                     f"{self._settings.style.error_off}"
                 )
@@ -85,7 +86,8 @@ class MastermindHelper(Mastermind):
 
         print()
 
-        if self._solver.check_possible_solution(pattern):
+        # guess with blank pegs can't be the solution (and it's not in patterns list of the Solver)
+        if not pattern.has_blank_pegs and self._solver.check_possible_solution(pattern):
             print(
                 "[Helper] Nice try. Given pattern could be the solution."
             )
@@ -104,7 +106,7 @@ class MastermindHelper(Mastermind):
 
         # check if all response pegs are black
         if response.black_pegs == self._settings.pegs_in_pattern and response.white_pegs == 0:
-            if self._solver.check_possible_solution(pattern):
+            if not pattern.has_blank_pegs and self._solver.check_possible_solution(pattern):
                 self._solution = pattern  # save current pattern as proper solution
                 self._game_status = 1  # solution is found
             else:
@@ -0,0 +1,287 @@
+############################################
+# My version of the famous Mastermind game #
+# mode_simulate.py                         #
+# Mastermind Simulation mode               #
+#           Piotr Loos (c) 2019-2021, 2023 #
+############################################
+
+from class_mastermind import Mastermind
+from class_settings import Settings
+from mode_solver import MastermindSolver
+from collections import Counter
+from contextlib import redirect_stdout
+from multiprocessing import Pool
+import os
+from random import randrange
+import sys
+from time import perf_counter
+
+
+# Settings object of the worker process (created once by `_init_worker` and reused for all its games)
+_worker_settings = None
+
+
+def _init_worker(settings_dict):
+    """ (Simulator worker) Creates Settings object (and builds patterns if enabled) once in the worker process """
+
+    global _worker_settings
+
+    sys.stdout = open(os.devnull, "w")  # worker never prints
+    _worker_settings = Settings(**settings_dict)
+
+
+def _worker_play_games(indexes):
+    """ (Simulator worker) Plays games for given solutions indexes with the worker Settings object """
+
+    return _play_games(_worker_settings, indexes)
+
+
+def _play_games(settings, indexes):
+    """ Plays games for given solutions indexes and returns statistics: game statuses, guesses numbers,
+    Solver preparation times and turns times """
+
+    statuses_counter = Counter()
+    guesses_counter = Counter()
+    setup_times_list = []
+    turns_times_list = []
+
+    for index in indexes:
+        game = MastermindSimulation(settings=settings, solution=settings.Pattern.decode_index(index))
+        statuses_counter[game.game_status] += 1
+        if game.game_status == 1:
+            guesses_counter[game.guesses_number] += 1
+        setup_time, game_turns_times_list = game.solving_times
+        setup_times_list.append(setup_time)
+        turns_times_list.extend(game_turns_times_list)
+
+    return statuses_counter, guesses_counter, setup_times_list, turns_times_list
+
+
+class MastermindSimulation(MastermindSolver):
+    """ Contains one headless game of computer vs computer (Solver mode with known solution), inherits from
+    MastermindSolver class """
+
+    def __init__(
+            self,
+            *args,
+            solution=None,
+            **kwargs,
+    ):
+        """ Initializes `MastermindSimulation` class object and plays the whole game without asking the user """
+
+        start_time = perf_counter()
+        Mastermind.__init__(self, *args, **kwargs)  # initialize Mastermind class object (without intro and loop)
+        self._setup_time = perf_counter() - start_time  # (float) Solver preparation time (first guess included)
+
+        self._mode = "simulate"
+        self._secret = solution  # (Pattern) solution known only by the computer CodeMaker
+        self._turns_times_list = []  # (list) Solver time of every turn (in seconds)
+
+        self._loop()
+        self._release()
+
+    def _loop(self):
+        """ Contains Mastermind loop with responses calculated by the computer """
+
+        while not self._game_status:  # game_status == 0 means game is active
+            start_time = perf_counter()
+            self._take_turn(
+                user_input=None,
+                computer_response=self._solver.current_possible_solution.calculate_response(self._secret),
+            )
+            self._turns_times_list.append(perf_counter() - start_time)
+
+    @property
+    def game_status(self):
+        """ Returns game status (1:solution is found, 2:reached guesses limit, 3:no possible solution) """
+
+        return self._game_status
+
+    @property
+    def guesses_number(self):
+        """ Returns number of guesses made in this game """
+
+        return self._guesses_list.guess_index
+
+    @property
+    def guesses_list(self):
+        """ Returns list of all guesses (with responses) made in this game """
+
+        return self._guesses_list
+
+    @property
+    def solving_times(self):
+        """ Returns Solver preparation time and list of turns times (in seconds) """
+
+        return self._setup_time, self._turns_times_list
+
+
+class MastermindSimulator:
+    """ Contains Mastermind Simulation mode - plays many headless games and reports statistics """
+
+    def __init__(
+            self,
+            settings,
+            games=None,
+            processes=None,
+    ):
+        """ Initializes `MastermindSimulator` class object, plays all games and prints the report
+
+        `games` is the number of games with random solutions, `None` or "all" means every pattern as a solution,
+        `processes` is the number of worker processes playing games in parallel (`None`, 0 or 1 = serial) """
+
+        self._settings = settings
+
+        if games is None or str(games).lower() == "all":
+            # exhaustive simulation - every pattern is a solution once
+            self._indexes = range(self._settings.patterns_number)
+        else:
+            try:
+                games_number = int(games)
+                if games_number < 1:
+                    raise ValueError
+            except ValueError:
+                raise RuntimeError(
+                    f"{self._settings.style.error_on}"
+                    f"[Simulator] Given `games` value ({games}) is incorrect!"
+                    f"{self._settings.style.error_off}"
+                )
+            self._indexes = [randrange(self._settings.patterns_number) for _ in range(games_number)]
+
+        try:
+            self._processes = int(processes or 0)
+            if self._processes < 0:
+                raise ValueError
+        except ValueError:
+            raise RuntimeError(
+                f"{self._settings.style.error_on}"
+                f"[Simulator] Given `processes` value ({processes}) is incorrect!"
+                f"{self._settings.style.error_off}"
+            )
+
+        self._statuses_counter = Counter()  # (Counter) number of games for every game status
+        self._guesses_counter = Counter()  # (Counter) number of games for every number of guesses (solved games)
+        self._setup_times_list = []  # (list) Solver preparation time for every game
+        self._turns_times_list = []  # (list) Solver time for every turn of all games
+
+        self._settings.print_settings()  # print settings list if enabled (inside function checks)
+        if self._processes > 1:
+            self._simulate_parallel()
+        else:
+            self._simulate()
+        self._report()
+
+    def _simulate(self):
+        """ Plays all games without prints """
+
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            self._add_results(_play_games(self._settings, self._indexes))
+
+    def _simulate_parallel(self):
+        """ Plays all games in worker processes, every worker creates its own Settings object only once """
+
+        # several chunks of games for every worker to balance different games lengths
+        chunk_size = max(1, len(self._indexes) // (8 * self._processes))
+        chunks_list = [
+            self._indexes[chunk_start:chunk_start + chunk_size]
+            for chunk_start in range(0, len(self._indexes), chunk_size)
+        ]
+
+        # opening book is calculated (if missing) in the main process, so workers just load it from the file
+        self._settings.prepare_opening_book()
+
+        with Pool(
+            processes=self._processes,
+            initializer=_init_worker,
+            # workers are daemonic processes and can't start their own ones - Solver1 scans patterns serially there
+            initargs=(dict(self._settings.settings_dict, solver1_processes=0),),
+        ) as pool:
+            for results in pool.imap_unordered(_worker_play_games, chunks_list):
+                self._add_results(results)  # statistics don't depend on the order of games
+
+    def _add_results(self, results):
+        """ Adds statistics of played games """
+
+        statuses_counter, guesses_counter, setup_times_list, turns_times_list = results
+        self._statuses_counter.update(statuses_counter)
+        self._guesses_counter.update(guesses_counter)
+        self._setup_times_list.extend(setup_times_list)
+        self._turns_times_list.extend(turns_times_list)
+
+    def _report(self):
+        """ Prints statistics of all played games """
+
+        solved_number = self._statuses_counter[1]
+
+        print(
+            f"[Simulator] Played "
+            f"{self._settings.style.number_on}"
+            f"{len(self._indexes):,}"
+            f"{self._settings.style.number_off}"
+            f" games with Solver #{self._settings.chosen_solver}, solved "
+            f"{self._settings.style.number_on}"
+            f"{solved_number:,}"
+            f"{self._settings.style.number_off}"
+            f" of them."
+        )
+
+        if self._statuses_counter[2] or self._statuses_counter[3]:
+            print(
+                f"[Simulator] Reached guesses limit: "
+                f"{self._settings.style.number_on}"
+                f"{self._statuses_counter[2]:,}"
+                f"{self._settings.style.number_off}"
+                f", no possible solution: "
+                f"{self._settings.style.number_on}"
+                f"{self._statuses_counter[3]:,}"
+                f"{self._settings.style.number_off}"
+                f"."
+            )
+
+        if solved_number:
+            print(
+                "[Simulator] Guesses distribution:"
+            )
+            for guesses_number in sorted(self._guesses_counter):
+                print(
+                    f"{self._settings.style.number_on}"
+                    f"{guesses_number:>3d}"
+                    f"{self._settings.style.number_off}"
+                    f" guess{'es' if guesses_number != 1 else '  '}: "
+                    f"{self._settings.style.number_on}"
+                    f"{self._guesses_counter[guesses_number]:>9,}"
+                    f"{self._settings.style.number_off}"
+                    f" ({100 * self._guesses_counter[guesses_number] / solved_number:6.2f}%)"
+                )
+            print(
+                f"[Simulator] Mean guesses: "
+                f"{self._settings.style.number_on}"
+                f"{sum(n * count for n, count in self._guesses_counter.items()) / solved_number:.4f}"
+                f"{self._settings.style.number_off}"
+                f", max guesses: "
+                f"{self._settings.style.number_on}"
+                f"{max(self._guesses_counter)}"
+                f"{self._settings.style.number_off}"
+                f"."
+            )
+
+        total_time = sum(self._setup_times_list) + sum(self._turns_times_list)
+        print(
+            f"[Simulator] Total solving time: "
+            f"{self._settings.style.time_on}"
+            f"{total_time:.3f}s"
+            f"{self._settings.style.time_off}"
+            f" (preparation per game: "
+            f"{self._settings.style.time_on}"
+            f"{sum(self._setup_times_list) / len(self._setup_times_list):.6f}s"
+            f"{self._settings.style.time_off}"
+            f", mean per turn: "
+            f"{self._settings.style.time_on}"
+            f"{sum(self._turns_times_list) / max(1, len(self._turns_times_list)):.6f}s"
+            f"{self._settings.style.time_off}"
+            f", max per turn: "
+            f"{self._settings.style.time_on}"
+            f"{max(self._turns_times_list, default=0):.6f}s"
+            f"{self._settings.style.time_off}"
+            f")."
+        )
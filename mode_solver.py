@@ -37,6 +37,7 @@ class MastermindSolver(Mastermind):
         self._intro()
         self._loop()
         self._outro()
+        self._release()
 
     # TODO: refactor with Helper's `_take_turn`
     def _take_turn(self, user_input, computer_response=None):